@@ -0,0 +1,153 @@
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+def get_cache_size():
+    return getattr(settings, 'JWT_AUTH_CACHE_SIZE', 0)
+
+
+def get_cache_ttl():
+    return getattr(settings, 'JWT_AUTH_CACHE_TTL', 60)
+
+
+class TokenCacheEntry:
+    def __init__(self, token, user, expires_at):
+        self.token = token
+        self.user_id = user.pk
+        self.expires_at = expires_at
+        self.field_names = [
+            field.attname for field in user._meta.concrete_fields
+        ]
+        self.values = [getattr(user, name) for name in self.field_names]
+        self.user_model = type(user)
+        self.db = user._state.db
+
+    def get_user(self):
+        # Uma instância nova por request: a view pode alterar o usuário
+        return self.user_model.from_db(
+            self.db, self.field_names, self.values
+        )
+
+
+class TokenCache:
+    """
+    LRU com TTL, por processo: token → claims validadas e uma cópia dos
+    campos do usuário. As entradas vencem em JWT_AUTH_CACHE_TTL segundos
+    ou no exp do token, o que vier antes, e saem quando o usuário é salvo
+    ou apagado (signals em authors/signals.py).
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+        self.stats = Counter()
+
+    def get_key(self, raw_token):
+        return hashlib.sha256(raw_token).digest()
+
+    def get(self, raw_token):
+        key = self.get_key(raw_token)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry
+
+    def set(self, raw_token, token, user):
+        max_size = get_cache_size()
+        if max_size <= 0:
+            return
+
+        now = time.monotonic()
+        expires_at = min(
+            now + get_cache_ttl(),
+            now + token['exp'] - time.time(),
+        )
+        key = self.get_key(raw_token)
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = TokenCacheEntry(token, user, expires_at)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+
+            while len(self._entries) > max_size:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        keys = self._keys_by_user.get(entry.user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry.user_id]
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+            self.stats.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication sem a consulta do usuário a cada request: o mesmo
+    token, dentro do TTL, reaproveita a validação e o usuário do
+    token_cache. A chave é o token inteiro (sha256), não só o jti, para
+    que um token forjado com um jti conhecido não pule a verificação da
+    assinatura.
+
+    O cache é por processo: em outro worker, um usuário desativado ou com
+    a senha trocada ainda passa por até JWT_AUTH_CACHE_TTL segundos.
+    JWT_AUTH_CACHE_SIZE = 0 desliga o cache.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        if get_cache_size() <= 0:
+            validated_token = self.get_validated_token(raw_token)
+            return self.get_user(validated_token), validated_token
+
+        entry = token_cache.get(raw_token)
+        if entry is not None:
+            return entry.get_user(), entry.token
+
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_user(validated_token)
+        token_cache.set(raw_token, validated_token, user)
+
+        return user, validated_token
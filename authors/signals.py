@@ -1,7 +1,11 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from recipes.cache import (bump_page_cache_scopes, get_recipe_page_scopes,
+                           invalidate_recipe_cards)
+from recipes.models import Recipe
 
+from authors.authentication import token_cache
 from authors.models import Profile
 
 User = get_user_model()
@@ -12,3 +16,43 @@ def create_profile(sender, instance, created, *args, **kwargs):
     if created:
         profile = Profile.objects.create(author=instance)
         profile.save()
+
+
+def invalidate_author_recipe_cards(author_id):
+    # Cards e páginas em cache que mostram o autor
+    recipe_ids = list(
+        Recipe.objects.filter(
+            author_id=author_id
+        ).values_list('pk', flat=True)
+    )
+
+    if recipe_ids:
+        invalidate_recipe_cards(recipe_ids)
+        bump_page_cache_scopes(get_recipe_page_scopes(recipe_ids))
+
+
+@receiver(post_save, sender=User)
+def user_card_cache_invalidate(sender, instance, created,
+                               update_fields=None, *args, **kwargs):
+    # O login só atualiza last_login, que não aparece nos cards
+    if created or update_fields == frozenset(['last_login']):
+        return
+
+    invalidate_author_recipe_cards(instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def user_delete_card_cache_invalidate(sender, instance, *args, **kwargs):
+    invalidate_author_recipe_cards(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def profile_card_cache_invalidate(sender, instance, *args, **kwargs):
+    invalidate_author_recipe_cards(instance.author_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_token_cache_invalidate(sender, instance, *args, **kwargs):
+    # Senha, is_active e demais campos podem ter mudado
+    token_cache.invalidate_user(instance.pk)
@@ -0,0 +1,108 @@
+from authors.authentication import token_cache
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+@override_settings(JWT_AUTH_CACHE_SIZE=10, JWT_AUTH_CACHE_TTL=60)
+class AuthorJWTCacheTest(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = User.objects.create_user(
+            username='my_user', password='my_pass')
+        return super().setUp()
+
+    def get_me(self, user=None):
+        token = RefreshToken.for_user(user or self.user).access_token
+        return self.client.get(
+            reverse('authors:author-api-me'),
+            HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+    def get_me_with(self, token):
+        return self.client.get(
+            reverse('authors:author-api-me'),
+            HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+
+    def test_second_request_skips_the_user_query(self):
+        token = RefreshToken.for_user(self.user).access_token
+
+        with self.assertNumQueries(2):
+            self.get_me_with(token)
+
+        with self.assertNumQueries(1):
+            response = self.get_me_with(token)
+
+        self.assertEqual(response.data['username'], 'my_user')
+        self.assertEqual(token_cache.stats['hits'], 1)
+
+    def test_saving_the_user_invalidates_its_tokens(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.get_me_with(token)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.get_me_with(token).status_code, 401)
+
+    def test_password_change_invalidates_its_tokens(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.get_me_with(token)
+
+        self.user.set_password('new_pass')
+        self.user.save()
+
+        self.assertEqual(len(token_cache), 0)
+
+    def test_deleted_user_is_rejected(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.get_me_with(token)
+
+        self.user.delete()
+
+        self.assertEqual(self.get_me_with(token).status_code, 401)
+
+    @override_settings(JWT_AUTH_CACHE_SIZE=1)
+    def test_least_recently_used_token_is_evicted(self):
+        other = User.objects.create_user(username='other', password='x')
+        first = RefreshToken.for_user(self.user).access_token
+        self.get_me_with(first)
+        self.get_me(other)
+
+        self.assertEqual(len(token_cache), 1)
+        with self.assertNumQueries(2):
+            self.get_me_with(first)
+
+    @override_settings(JWT_AUTH_CACHE_TTL=0)
+    def test_expired_entries_are_not_used(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.get_me_with(token)
+
+        with self.assertNumQueries(2):
+            self.get_me_with(token)
+
+    @override_settings(JWT_AUTH_CACHE_SIZE=0)
+    def test_cache_can_be_turned_off(self):
+        self.get_me()
+
+        self.assertEqual(len(token_cache), 0)
+
+    def test_cached_user_is_a_fresh_instance_per_request(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.get_me_with(token)
+
+        entry = token_cache.get(get_raw_token(token))
+        first, second = entry.get_user(), entry.get_user()
+        first.username = 'changed'
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.username, 'my_user')
+        self.assertFalse(second._state.adding)
+
+
+def get_raw_token(token):
+    return str(token).encode('ascii')
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
 from authors.forms import RegisterForm
+from django.core.cache import cache
 from django.test import TestCase as DjangoTestCase
 from django.urls import reverse
 from parameterized import parameterized
@@ -71,6 +72,8 @@ class AuthorRegisterFormIntegrationTest(DjangoTestCase):
             'password': 'Str0ngP@ssword1',
             'password2': 'Str0ngP@ssword1'
         }
+        # Os buckets do AuthThrottleMiddleware ficam no cache
+        cache.clear()
         return super().setUp(*args, **kwargs)
 
     @parameterized.expand([
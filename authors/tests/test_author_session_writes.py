@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from utils.query_budget import QueryRecorder
+
+
+class AuthorSessionWritesTest(TestCase):
+    def setUp(self):
+        self.form_data = {
+            'username': 'user',
+            'first_name': 'first',
+            'last_name': 'last',
+            'email': 'email@anyemail.com',
+            'password': 'Str0ngP@ssword1',
+            'password2': 'Str0ngP@ssword1'
+        }
+        cache.clear()
+        return super().setUp()
+
+    def post_register(self):
+        with QueryRecorder() as recorder:
+            response = self.client.post(
+                reverse('authors:register_create'),
+                data=self.form_data, follow=True
+            )
+
+        session_queries = [
+            query['sql'] for query in recorder.queries
+            if 'django_session' in query['sql']
+        ]
+        return response, session_queries
+
+    def test_invalid_register_attempts_do_not_touch_the_session_table(self):
+        self.form_data['username'] = 'joa'
+
+        for _ in range(3):
+            response, session_queries = self.post_register()
+
+            self.assertEqual(session_queries, [])
+            self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+            self.assertIn(
+                'Username must have at least 4 characters.',
+                response.content.decode('utf-8')
+            )
+
+    def test_invalid_register_keeps_the_form_data_but_not_the_password(self):
+        self.form_data['username'] = 'joa'
+
+        response, _ = self.post_register()
+        content = response.content.decode('utf-8')
+
+        self.assertIn('email@anyemail.com', content)
+        self.assertNotIn('Str0ngP@ssword1', content)
+
+    def test_valid_register_does_not_touch_the_session_table(self):
+        response, session_queries = self.post_register()
+
+        self.assertEqual(session_queries, [])
+        self.assertIn(
+            'Your user is created, please log in.',
+            response.content.decode('utf-8')
+        )
+        self.assertTrue(User.objects.filter(username='user').exists())
@@ -9,24 +9,22 @@ from recipes.models import Recipe
 
 
 # Create your views here.
-def register_view(request):
-    register_form_data = request.session.get('register_form_data', None)
-
-    form = RegisterForm(register_form_data)
-
+def render_register_form(request, form):
     return render(request, 'authors/pages/register_view.html', {
         'form': form,
         'form_action': reverse('authors:register_create')
     })
 
 
+def register_view(request):
+    return render_register_form(request, RegisterForm())
+
+
 def register_create(request):
     if not request.POST:
         raise Http404
 
-    POST = request.POST
-    request.session['register_form_data'] = POST
-    form = RegisterForm(POST)
+    form = RegisterForm(request.POST)
 
     if form.is_valid():
         user = form.save(commit=False)
@@ -34,10 +32,11 @@ def register_create(request):
         user.save()
         messages.success(request, 'Your user is created, please log in.')
 
-        del(request.session['register_form_data'])
         return redirect(reverse('authors:login'))
 
-    return redirect('authors:register')
+    # O formulário com os erros volta na própria resposta: nada do que foi
+    # digitado (nem a senha) passa pela sessão
+    return render_register_form(request, form)
 
 
 def login_view(request):
@@ -53,8 +52,6 @@ def login_create(request):
         raise Http404()
 
     form = LoginForm(request.POST)
-    login_url = reverse('authors:login')
-    print(login_url)
 
     if form.is_valid():
         authenticated_user = authenticate(
@@ -93,7 +90,7 @@ def dashboard(request):
     recipes = Recipe.objects.filter(
         is_published=False,
         author=request.user
-    )
+    ).only('id', 'title')
     return render(request,
                   'authors/pages/dashboard.html',
                   {
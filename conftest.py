@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def query_budget_raise(settings):
+    """Nos testes um estouro de QUERY_BUDGETS falha em vez de virar log"""
+    settings.QUERY_BUDGET_MODE = 'raise'
@@ -4,11 +4,16 @@ from .installed_apps import *  # isort: skip
 from .middleswares import *  # isort: skip
 
 from .assets import *
+from .auth_throttle import *
+from .caches import *
 from .cors_headers import *
 from .databases import *
 from .i18n import *
 from .messages import *
+from .query_budget import *
+from .search import *
 from .security import *
+from .sessions import *
 from .templates import *
 
 from .debug_toolbar import *  # isort: skip
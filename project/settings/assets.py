@@ -1,3 +1,5 @@
+import os
+
 from .environment import BASE_DIR
 
 STATIC_URL = 'static/'
@@ -6,5 +8,24 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'static'
 
+# collectstatic grava nomes com hash e variantes .br/.gz, servidos pelo
+# utils.staticfiles.StaticFilesMiddleware quando não há nginx na frente
+STATICFILES_STORAGE = 'utils.staticfiles.CompressedManifestStaticFilesStorage'
+# Arquivos até este tamanho (bytes) ficam em memória no middleware
+STATIC_MEMORY_MAX_SIZE = int(
+    os.environ.get('STATIC_MEMORY_MAX_SIZE', 512 * 1024)
+)
+# max-age (segundos) dos nomes sem hash; os com hash são imutáveis
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', 60))
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Como utils.media.serve_media entrega os arquivos: django (streaming com
+# Range e ETag), x-accel-redirect (nginx, location interna abaixo do
+# prefixo, ver deploy/nginx-*.txt) ou x-sendfile (Apache/lighttpd)
+MEDIA_SERVE_MODE = os.environ.get('MEDIA_SERVE_MODE', 'django')
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get(
+    'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/'
+)
+MEDIA_MAX_AGE = int(os.environ.get('MEDIA_MAX_AGE', 60 * 60 * 24))
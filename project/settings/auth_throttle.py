@@ -0,0 +1,35 @@
+import os
+
+# Token buckets por IP e por username na frente das views que rodam o
+# hasher de senhas (utils.throttle.AuthThrottleMiddleware). Os buckets
+# ficam no cache: use um CACHE_BACKEND compartilhado entre os workers
+AUTH_THROTTLE_ENABLED = os.environ.get('AUTH_THROTTLE_ENABLED', '1') == '1'
+AUTH_THROTTLE_CACHE_ALIAS = 'default'
+
+AUTH_THROTTLE_VIEWS = (
+    'authors:login_create',
+    'authors:register_create',
+    'recipes:token_obtain_pair',
+)
+
+# (capacidade, tokens repostos por minuto). Cada token reposto por IP é um
+# hash que um atacante consegue forçar: com 10/min o p95 dos logins
+# legítimos dobrava sob ataque (manage.py bench_login_throttle)
+AUTH_THROTTLE_BUCKETS = {
+    'ip': (
+        int(os.environ.get('AUTH_THROTTLE_IP_BURST', 10)),
+        int(os.environ.get('AUTH_THROTTLE_IP_PER_MINUTE', 2)),
+    ),
+    'username': (
+        int(os.environ.get('AUTH_THROTTLE_USERNAME_BURST', 10)),
+        int(os.environ.get('AUTH_THROTTLE_USERNAME_PER_MINUTE', 5)),
+    ),
+}
+
+# Proxies na frente do gunicorn para achar o IP do cliente no
+# X-Forwarded-For. O padrão é o deploy/ (nginx num socket unix, onde o
+# REMOTE_ADDR vem vazio). Sem o cabeçalho vale o REMOTE_ADDR; use 0 só
+# com o gunicorn exposto direto, senão o cliente escolhe o próprio IP
+AUTH_THROTTLE_NUM_PROXIES = int(
+    os.environ.get('AUTH_THROTTLE_NUM_PROXIES', 1)
+)
@@ -0,0 +1,21 @@
+import os
+
+# Use um backend compartilhado (Redis, Memcached, arquivo...) em produção
+# para que todos os workers do gunicorn reaproveitem o mesmo cache.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+
+# Tempo (segundos) dos fragmentos de recipes/partials/recipe.html
+RECIPE_CARD_CACHE_TIMEOUT = int(
+    os.environ.get('RECIPE_CARD_CACHE_TIMEOUT', 60 * 60 * 24)
+)
+
+# Tempo (segundos) das páginas inteiras servidas para visitantes anônimos
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 60 * 10))
@@ -1,5 +1,13 @@
 import os
 
+from utils.environment import get_env_variable, parse_comma_sep_str_to_list
+
+# Conexões persistentes (uma por thread de cada worker). 0 fecha a conexão
+# no fim de cada request (padrão do Django); vazio = sem limite. Ao passar
+# do limite a conexão é reciclada no começo/fim da próxima request.
+_conn_max_age = os.environ.get('DATABASE_CONN_MAX_AGE', '0')
+_conn_max_age = int(_conn_max_age) if _conn_max_age else None
+
 DATABASES = {
     'default': {
         'ENGINE': os.environ.get('DATABASE_ENGINE'),
@@ -8,5 +16,47 @@ DATABASES = {
         'PASSWORD': os.environ.get('DATABASE_PASSWORD'),
         'HOST': os.environ.get('DATABASE_HOST'),
         'PORT': os.environ.get('DATABASE_PORT'),
+        'CONN_MAX_AGE': _conn_max_age,
     }
 }
+
+# Réplicas de leitura: mesmas configurações do default, mudando só o NAME
+# (arquivo SQLite ou nome do banco) ou o HOST de cada réplica.
+DATABASE_REPLICAS: list[str] = []
+
+_replica_names = parse_comma_sep_str_to_list(
+    get_env_variable('DATABASE_REPLICA_NAMES'))
+_replica_hosts = parse_comma_sep_str_to_list(
+    get_env_variable('DATABASE_REPLICA_HOSTS'))
+
+for _index in range(max(len(_replica_names), len(_replica_hosts))):
+    _alias = f'replica_{_index + 1}'
+    DATABASES[_alias] = {
+        **DATABASES['default'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+    if _index < len(_replica_names):
+        DATABASES[_alias]['NAME'] = _replica_names[_index]
+    if _index < len(_replica_hosts):
+        DATABASES[_alias]['HOST'] = _replica_hosts[_index]
+
+    DATABASE_REPLICAS.append(_alias)
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ['utils.replicas.PrimaryReplicaRouter']
+
+# Por quantos segundos quem escreveu continua lendo do primário
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+
+# Usados pelo utils.db_pool.PersistentConnectionMiddleware: testa a conexão
+# reaproveitada antes da request (pre-ping) e fecha as que ficaram paradas
+# mais que DATABASE_CONN_IDLE_TIMEOUT segundos (0 = nunca).
+DATABASE_CONN_HEALTH_CHECKS = os.environ.get(
+    'DATABASE_CONN_HEALTH_CHECKS', '1') == '1'
+DATABASE_CONN_IDLE_TIMEOUT = int(
+    os.environ.get('DATABASE_CONN_IDLE_TIMEOUT', 300))
+# De quanto em quanto tempo (segundos) cada worker publica as estatísticas
+# no cache para o comando db_pool_stats
+DATABASE_POOL_STATS_INTERVAL = int(
+    os.environ.get('DATABASE_POOL_STATS_INTERVAL', 10))
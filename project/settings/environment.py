@@ -13,5 +13,11 @@ CSRF_TRUSTED_ORIGINS: list[str] = parse_comma_sep_str_to_list(
 
 ROOT_URLCONF = 'project.urls'
 WSGI_APPLICATION = 'project.wsgi.application'
+ASGI_APPLICATION = 'project.asgi.application'
+
+# Usa as views assíncronas de recipes/views/asynchronous.py nas rotas de
+# listagem, detalhe, busca e API v1. Desligado por padrão, também no
+# project.asgi: ligue com RECIPES_ASYNC_VIEWS=1.
+RECIPES_ASYNC_VIEWS = os.environ.get('RECIPES_ASYNC_VIEWS') == '1'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
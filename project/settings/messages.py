@@ -7,3 +7,8 @@ MESSAGE_TAGS = {
     constants.SUCCESS: 'message-success',
     constants.WARNING: 'message-warning',
 }
+
+# Mensagens só no cookie: o FallbackStorage padrão passa para a sessão
+# quando o cookie fica grande, o que cria uma sessão para visitantes
+# anônimos
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
@@ -1,9 +1,14 @@
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'utils.staticfiles.StaticFilesMiddleware',
+    'utils.db_pool.PersistentConnectionMiddleware',
+    'utils.query_budget.QueryBudgetMiddleware',
+    'utils.replicas.PrimaryStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
+    'utils.throttle.AuthThrottleMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -0,0 +1,24 @@
+import os
+
+# off, log (warning no logger utils.query_budget) ou raise (nos testes,
+# ver conftest.py)
+QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'log')
+
+# Máximo de consultas por request, indexado pelo nome da URL (vale para
+# GET/HEAD) ou por (nome da URL, método) para escritas. Conta tudo
+# o que a request faz com os caches de página e de cards frios, inclusive
+# a sessão e o usuário logado (2 consultas). Ver test_recipe_query_budget.
+QUERY_BUDGETS = {
+    'recipes:home': 6,
+    'recipes:category': 6,
+    'recipes:tag': 7,
+    'recipes:recipe': 5,
+    'recipes:search': 6,
+    'recipes:recipes_api_v1': 3,
+    'recipes:recipe-api-list': 5,
+    'recipes:recipe-api-detail': 4,
+    'authors:profile': 3,
+    'authors:dashboard': 3,
+    'authors:dashboard_recipe_edit': 3,
+    'authors:dashboard_recipe_new': 2,
+}
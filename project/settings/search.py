@@ -0,0 +1,5 @@
+import os
+
+# Caminho do backend de busca de receitas. Vazio = escolhe pelo banco
+# (SQLite FTS5 ou Postgres tsvector).
+RECIPES_SEARCH_BACKEND = os.environ.get('RECIPES_SEARCH_BACKEND', '')
@@ -0,0 +1,14 @@
+import os
+
+# cached_db lê a sessão do cache (CACHES['default']) e só vai ao banco
+# quando ela não está lá; cada alteração ainda grava no banco. Com
+# django.contrib.sessions.backends.signed_cookies a sessão inteira fica no
+# cookie assinado e a tabela django_session deixa de ser usada (mas não dá
+# para derrubar uma sessão pelo servidor)
+SESSION_ENGINE = os.environ.get(
+    'SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db'
+)
+
+# Só grava a sessão quando ela muda (o padrão do Django, explícito aqui
+# porque True faria cada request de usuário logado virar um UPDATE)
+SESSION_SAVE_EVERY_REQUEST = False
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Recipe
+from .models import Category, CoverJob, Recipe
 
 
 # Register your models here.
@@ -33,3 +33,12 @@ class RecipeAdmin(admin.ModelAdmin):
     }
 
     autocomplete_fields = ('tags',)
+
+
+@admin.register(CoverJob)
+class CoverJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'recipe', 'cover_name', 'status', 'attempts',
+                    'updated_at']
+    list_filter = ['status']
+    list_per_page = 10
+    ordering = ['-id']
@@ -0,0 +1,270 @@
+import asyncio
+from functools import partial, wraps
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from tag.models import Tag
+
+from recipes.models import Recipe
+
+RECIPE_CARD_TEMPLATE = 'recipes/partials/recipe.html'
+RECIPE_CARD_MODES = ('list', 'detail')
+
+
+def get_recipe_card_timeout():
+    return getattr(settings, 'RECIPE_CARD_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def make_recipe_card_key(recipe_id, mode):
+    """
+    >>> make_recipe_card_key(10, 'detail')
+    'recipe_card:10:detail'
+    """
+    return f'recipe_card:{recipe_id}:{mode}'
+
+
+def render_recipe_card(recipe, mode, render):
+    """
+    Devolve o HTML do card da receita, renderizando só quando não existe
+    uma versão em cache para o mesmo updated_at e idioma.
+
+    Cada chave guarda {'updated_at': ..., 'html': {idioma: html}}, assim
+    a invalidação apaga uma chave por modo, seja qual for o idioma.
+    """
+    key = make_recipe_card_key(recipe.pk, mode)
+    language = translation.get_language()
+    stamp = recipe.updated_at.isoformat() if recipe.updated_at else ''
+
+    entry = cache.get(key)
+
+    if not entry or entry.get('updated_at') != stamp:
+        entry = {'updated_at': stamp, 'html': {}}
+
+    html = entry['html'].get(language)
+
+    if html is None:
+        html = render()
+        entry['html'][language] = html
+        cache.set(key, entry, get_recipe_card_timeout())
+
+    return html
+
+
+def invalidate_recipe_cards(recipe_ids):
+    cache.delete_many([
+        make_recipe_card_key(recipe_id, mode)
+        for recipe_id in recipe_ids
+        for mode in RECIPE_CARD_MODES
+    ])
+
+
+PAGE_CACHE_SCOPE_PREFIX = 'page_cache:scope:'
+PAGE_CACHE_GLOBAL_SCOPE = 'all'
+PAGE_CACHE_LIST_SCOPE = 'list'
+PAGE_CACHE_VARY_ON_PARAMS = ('page', 'cursor')
+PAGE_CACHE_KEPT_HEADERS = ('ETag', 'Last-Modified')
+
+
+def get_page_cache_timeout():
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', 60 * 10)
+
+
+def make_page_cache_scope_key(scope):
+    """
+    >>> make_page_cache_scope_key('recipe:10')
+    'page_cache:scope:recipe:10'
+    """
+    return f'{PAGE_CACHE_SCOPE_PREFIX}{scope}'
+
+
+def new_page_cache_generation():
+    return uuid4().hex[:12]
+
+
+def get_page_cache_generations(scopes):
+    """
+    Geração atual de cada escopo, numa ida ao cache. Escopo sem geração
+    ganha uma agora (cache.add: se outro processo criou antes, vale a
+    dele).
+    """
+    keys = [make_page_cache_scope_key(scope) for scope in scopes]
+    generations = cache.get_many(keys)
+
+    for key in keys:
+        if key not in generations:
+            cache.add(key, new_page_cache_generation(), None)
+            generations[key] = cache.get(key)
+
+    return [generations[key] for key in keys]
+
+
+def bump_page_cache_scopes(scopes):
+    """
+    Invalida as páginas dos escopos dados: as chaves antigas deixam de
+    ser lidas e expiram sozinhas, sem varrer o cache.
+    """
+    scopes = set(scopes)
+
+    if scopes:
+        cache.set_many({
+            make_page_cache_scope_key(scope): new_page_cache_generation()
+            for scope in scopes
+        }, None)
+
+
+def bump_page_cache_generation():
+    """Invalida todas as páginas em cache (importações e cargas em lote)"""
+    bump_page_cache_scopes([PAGE_CACHE_GLOBAL_SCOPE])
+
+
+def get_recipe_page_scopes(recipe_ids):
+    """
+    Escopos das páginas em que as receitas publicadas aparecem: a home,
+    o detalhe, a página da categoria e a de cada tag. Receitas em
+    rascunho não aparecem em nenhuma página em cache.
+    """
+    recipes = list(Recipe.objects.filter(
+        pk__in=recipe_ids, is_published=True
+    ).values_list('pk', 'category_id'))
+
+    if not recipes:
+        return set()
+
+    scopes = {PAGE_CACHE_LIST_SCOPE}
+
+    for recipe_id, category_id in recipes:
+        scopes.add(f'recipe:{recipe_id}')
+        scopes.add(f'category:{category_id}')
+
+    scopes.update(
+        f'tag:{slug}' for slug in Tag.objects.filter(
+            recipe__in=[recipe_id for recipe_id, _ in recipes]
+        ).values_list('slug', flat=True).distinct()
+    )
+
+    return scopes
+
+
+def make_page_cache_key(request, scope=PAGE_CACHE_LIST_SCOPE):
+    params = '&'.join(
+        f'{name}={request.GET.get(name)}'
+        for name in PAGE_CACHE_VARY_ON_PARAMS
+        if name in request.GET
+    )
+    language = getattr(request, 'LANGUAGE_CODE', translation.get_language())
+    generation = '.'.join(
+        get_page_cache_generations([PAGE_CACHE_GLOBAL_SCOPE, scope])
+    )
+    return f'page_cache:{generation}:{language}:{request.path}?{params}'
+
+
+def has_flash_messages(request):
+    storage = getattr(request, '_messages', None)
+    return storage is not None and len(storage) > 0
+
+
+def can_use_page_cache(request):
+    return (
+        request.method in ('GET', 'HEAD') and
+        not request.user.is_authenticated and
+        not has_flash_messages(request)
+    )
+
+
+def get_cached_page(request, key):
+    cached = cache.get(key)
+
+    if cached is None:
+        return None
+
+    content, content_type, headers = cached
+    not_modified = get_conditional_response(
+        request,
+        etag=headers.get('ETag'),
+        last_modified=parse_http_date_safe(headers.get('Last-Modified'))
+    )
+
+    if not_modified is not None:
+        return not_modified
+
+    response = HttpResponse(content, content_type=content_type)
+    for header, value in headers.items():
+        response.headers[header] = value
+    return response
+
+
+def store_page(key, response):
+    if hasattr(response, 'render') and callable(response.render):
+        response.render()
+
+    if response.status_code == 200 and not response.cookies:
+        headers = {
+            header: response.headers[header]
+            for header in PAGE_CACHE_KEPT_HEADERS
+            if header in response.headers
+        }
+        cache.set(
+            key,
+            (response.content, response['Content-Type'], headers),
+            get_page_cache_timeout()
+        )
+
+    return response
+
+
+def cache_anonymous_page(view_func=None, scope=PAGE_CACHE_LIST_SCOPE):
+    """
+    Cache de página inteira para visitantes anônimos. A chave leva a
+    geração do escopo da página (ver bump_page_cache_scopes), o idioma
+    ativo e os parâmetros de paginação.
+
+    `scope` é formatado com os kwargs da view, ex.:
+    @cache_anonymous_page(scope='recipe:{pk}'). Sem ele a página é uma
+    listagem geral ('list').
+
+    Também aceita views assíncronas: sessão, usuário e cache são
+    consultados via sync_to_async.
+    """
+    if view_func is None:
+        return partial(cache_anonymous_page, scope=scope)
+
+    if asyncio.iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_async_view(request, *args, **kwargs):
+            if not await sync_to_async(can_use_page_cache)(request):
+                return await view_func(request, *args, **kwargs)
+
+            key = await sync_to_async(make_page_cache_key)(
+                request, scope.format(**kwargs))
+            response = await sync_to_async(get_cached_page)(request, key)
+
+            if response is not None:
+                return response
+
+            response = await view_func(request, *args, **kwargs)
+            return await sync_to_async(store_page)(key, response)
+
+        return _wrapped_async_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not can_use_page_cache(request):
+            return view_func(request, *args, **kwargs)
+
+        key = make_page_cache_key(request, scope.format(**kwargs))
+        response = get_cached_page(request, key)
+
+        if response is not None:
+            return response
+
+        response = view_func(request, *args, **kwargs)
+        return store_page(key, response)
+
+    return _wrapped_view
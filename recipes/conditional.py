@@ -0,0 +1,121 @@
+from hashlib import md5
+
+from django.core.exceptions import ValidationError
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """
+    >>> make_etag(1, 'pt-br') == make_etag(1, 'pt-br')
+    True
+    >>> make_etag(1, 'pt-br') == make_etag(1, 'en')
+    False
+    """
+    digest = md5(
+        '|'.join(str(part) for part in parts).encode('utf-8')
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def get_detail_validators(queryset, pk, *etag_parts):
+    """ETag e Last-Modified de uma receita a partir do seu updated_at."""
+    try:
+        updated_at = queryset.order_by().filter(
+            pk=pk
+        ).values_list('updated_at', flat=True).first()
+    except (TypeError, ValueError, ValidationError):
+        return None, None
+
+    if updated_at is None:
+        return None, None
+
+    return make_etag(pk, updated_at.isoformat(), *etag_parts), updated_at
+
+
+def get_list_validators(queryset, total, *etag_parts):
+    """
+    ETag e Last-Modified de uma listagem a partir de MAX(updated_at) e do
+    total de receitas (`total`, lido de um resumo como SiteSummary):
+    edições mudam o MAX, publicações e remoções mudam o total.
+
+    O MAX sozinho sai da ponta de um índice em updated_at
+    (recipe_updated_pub_idx), então um 304 custa uma busca no índice,
+    não uma passada por todas as receitas.
+    """
+    last_modified = queryset.order_by().aggregate(
+        last_modified=Max('updated_at')
+    )['last_modified']
+    stamp = last_modified.isoformat() if last_modified else ''
+
+    return make_etag(total, stamp, *etag_parts), last_modified
+
+
+def get_page_validators(queryset, *etag_parts):
+    """
+    ETag e Last-Modified de uma página já fatiada (paginação por cursor):
+    ids e updated_at só das linhas da página, sem COUNT nem MAX sobre a
+    listagem inteira. Publicações, remoções e edições que tocam a página
+    mudam os ids ou os updated_at.
+    """
+    rows = list(
+        queryset.select_related(None).prefetch_related(None).values_list(
+            'id', 'updated_at'
+        )
+    )
+    last_modified = max((row[1] for row in rows), default=None)
+    stamp = ','.join(
+        f'{pk}:{updated_at.isoformat()}' for pk, updated_at in rows
+    )
+
+    return make_etag(stamp, *etag_parts), last_modified
+
+
+def get_not_modified(request, etag, last_modified):
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None
+    )
+
+
+def set_validators(response, etag, last_modified):
+    if response.status_code == 200:
+        if etag:
+            response.headers.setdefault('ETag', etag)
+        if last_modified:
+            response.headers.setdefault(
+                'Last-Modified', http_date(int(last_modified.timestamp()))
+            )
+
+    return response
+
+
+def conditional_get(request, etag, last_modified, get_response):
+    """
+    Responde 304 sem executar get_response() quando os validadores do
+    cliente ainda batem; senão devolve a resposta com ETag/Last-Modified.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return get_response()
+
+    response = get_not_modified(request, etag, last_modified)
+
+    if response is not None:
+        return response
+
+    return set_validators(get_response(), etag, last_modified)
+
+
+async def aconditional_get(request, etag, last_modified, get_response):
+    """conditional_get para views assíncronas: get_response é awaitable"""
+    if request.method not in ('GET', 'HEAD'):
+        return await get_response()
+
+    response = get_not_modified(request, etag, last_modified)
+
+    if response is not None:
+        return response
+
+    return set_validators(await get_response(), etag, last_modified)
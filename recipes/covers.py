@@ -0,0 +1,226 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from pathlib import PurePosixPath
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image
+
+from recipes.models import CoverJob, Recipe
+
+# nome: (largura máxima, formato)
+COVER_RENDITIONS = {
+    'list': (400, 'JPEG'),
+    'detail': (840, 'JPEG'),
+    'list_webp': (400, 'WEBP'),
+    'detail_webp': (840, 'WEBP'),
+}
+EXTENSIONS = {
+    'JPEG': 'jpg',
+    'WEBP': 'webp',
+}
+ORIGINAL_MAX_WIDTH = 840
+MAX_ATTEMPTS = 3
+# Jobs em processing há mais que isso são de um worker que morreu
+CLAIM_TIMEOUT = 60 * 15
+
+
+def make_rendition_name(cover_name, rendition):
+    """
+    >>> make_rendition_name('recipes/covers/2022/10/01/bolo.png', 'list_webp')
+    'recipes/covers/2022/10/01/renditions/bolo.list_webp.webp'
+    """
+    _, image_format = COVER_RENDITIONS[rendition]
+    path = PurePosixPath(cover_name)
+    file_name = f'{path.stem}.{rendition}.{EXTENSIONS[image_format]}'
+    return str(path.parent / 'renditions' / file_name)
+
+
+def build_renditions(cover_name, media_root):
+    """
+    Gera todas as versões da capa. Roda dentro do pool de processos, por
+    isso só mexe em arquivos: quem grava no banco é o processo principal.
+    """
+    original_path = os.path.join(media_root, cover_name)
+    images = {}
+
+    with Image.open(original_path) as original:
+        original_width = original.size[0]
+        rgb_original = original.convert('RGB')
+
+    for rendition, (max_width, image_format) in COVER_RENDITIONS.items():
+        image = rgb_original
+        width, height = image.size
+
+        if width > max_width:
+            new_height = round((max_width * height) / width)
+            image = image.resize((max_width, new_height), Image.LANCZOS)
+
+        name = make_rendition_name(cover_name, rendition)
+        full_path = os.path.join(media_root, name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        image.save(full_path, image_format, optimize=True, quality=70)
+
+        images[rendition] = {
+            'name': name,
+            'width': image.size[0],
+            'format': image_format,
+        }
+
+    # Mantém o comportamento antigo de Recipe.save para o original
+    if original_width > ORIGINAL_MAX_WIDTH:
+        Recipe.resize_image_file(original_path, ORIGINAL_MAX_WIDTH)
+
+    return {'source': cover_name, 'images': images}
+
+
+def delete_renditions(cover_renditions):
+    for image in cover_renditions.get('images', {}).values():
+        try:
+            os.remove(os.path.join(settings.MEDIA_ROOT, image['name']))
+        except FileNotFoundError:
+            ...
+
+
+def release_stale_cover_jobs(claim_timeout=CLAIM_TIMEOUT):
+    """
+    Devolve para a fila os jobs que ficaram em processing depois de
+    `claim_timeout` segundos (o worker morreu no meio). Conta como uma
+    tentativa, para uma capa que derruba o worker não voltar para sempre.
+    """
+    stale = CoverJob.objects.filter(
+        status=CoverJob.STATUS_PROCESSING,
+        claimed_at__lt=timezone.now() - timedelta(seconds=claim_timeout),
+    )
+    changes = {
+        'attempts': F('attempts') + 1,
+        'error': 'Claim expired',
+        'claim_token': '',
+        'updated_at': timezone.now(),
+    }
+
+    stale.filter(attempts__gte=MAX_ATTEMPTS - 1).update(
+        status=CoverJob.STATUS_FAILED, **changes)
+    return stale.update(status=CoverJob.STATUS_PENDING, **changes)
+
+
+def claim_cover_jobs(limit, claim_timeout=CLAIM_TIMEOUT):
+    """
+    Marca até `limit` jobs pendentes como processing com um token novo e
+    devolve só os que ficaram com esse token: dois workers nunca recebem
+    o mesmo job. No Postgres o SELECT ... FOR UPDATE SKIP LOCKED ainda
+    faz workers simultâneos pegarem jobs diferentes em vez de disputarem
+    os mesmos.
+    """
+    release_stale_cover_jobs(claim_timeout)
+
+    using = router.db_for_write(CoverJob)
+    token = uuid4().hex
+
+    with transaction.atomic(using=using):
+        pending = CoverJob.objects.using(using).filter(
+            status=CoverJob.STATUS_PENDING
+        ).order_by('id')
+
+        if connections[using].features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+
+        job_ids = list(pending.values_list('id', flat=True)[:limit])
+        CoverJob.objects.using(using).filter(
+            id__in=job_ids,
+            status=CoverJob.STATUS_PENDING
+        ).update(
+            status=CoverJob.STATUS_PROCESSING,
+            claim_token=token,
+            claimed_at=timezone.now(),
+        )
+
+    return list(
+        CoverJob.objects.using(using).filter(
+            claim_token=token,
+            status=CoverJob.STATUS_PROCESSING
+        ).select_related('recipe')
+    )
+
+
+def finish_cover_job(job, cover_renditions=None, error=''):
+    """
+    Grava o resultado do job. Se o claim expirou e outro worker pegou o
+    job, não grava nada: o resultado é do claim atual.
+    """
+    recipe = job.recipe
+    job.attempts += 1
+
+    if error:
+        job.error = error
+        job.status = CoverJob.STATUS_PENDING \
+            if job.attempts < MAX_ATTEMPTS else CoverJob.STATUS_FAILED
+    else:
+        job.status = CoverJob.STATUS_DONE
+        job.error = ''
+
+    claimed = CoverJob.objects.filter(
+        pk=job.pk,
+        claim_token=job.claim_token,
+        status=CoverJob.STATUS_PROCESSING,
+    ).update(
+        attempts=job.attempts,
+        error=job.error,
+        status=job.status,
+        claim_token='',
+        updated_at=timezone.now(),
+    )
+
+    if not claimed or error:
+        return
+
+    recipe.refresh_from_db(fields=['cover', 'cover_renditions'])
+
+    # A capa pode ter sido trocada enquanto o job rodava
+    if recipe.cover.name != cover_renditions['source']:
+        delete_renditions(cover_renditions)
+        return
+
+    recipe.cover_renditions = cover_renditions
+    recipe.save(update_fields=['cover_renditions', 'updated_at'])
+
+
+def process_cover_jobs(limit=50, workers=None, executor=None,
+                       claim_timeout=CLAIM_TIMEOUT):
+    """
+    Processa até `limit` jobs pendentes num ProcessPoolExecutor e
+    devolve quantos foram concluídos.
+    """
+    jobs = claim_cover_jobs(limit, claim_timeout)
+
+    if not jobs:
+        return 0
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    try:
+        futures = [
+            (job, executor.submit(
+                build_renditions, job.cover_name, str(settings.MEDIA_ROOT)
+            ))
+            for job in jobs
+        ]
+
+        done = 0
+        for job, future in futures:
+            try:
+                finish_cover_job(job, cover_renditions=future.result())
+                done += 1
+            except Exception as error:
+                finish_cover_job(job, error=repr(error))
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    return done
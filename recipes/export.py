@@ -0,0 +1,77 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from recipes.models import Recipe
+from recipes.serializers import RecipeReadSerializer
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def parse_since(value):
+    """
+    >>> parse_since('2022-10-01T10:00:00+00:00').isoformat()
+    '2022-10-01T10:00:00+00:00'
+    >>> parse_since('yesterday')
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid datetime, use ISO 8601.
+    """
+    try:
+        since = parse_datetime(value)
+    except ValueError:
+        since = None
+
+    if since is None:
+        raise ValueError('Invalid datetime, use ISO 8601.')
+
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+
+    return since
+
+
+def iter_published_recipes(since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Percorre as receitas publicadas em blocos de `chunk_size`, buscando
+    cada bloco por keyset (id > último id). A memória usada depende só do
+    tamanho do bloco, não do tamanho da tabela.
+    """
+    queryset = Recipe.objects.get_published().prefetch_related(None)
+
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+
+    last_id = 0
+
+    while True:
+        chunk = list(
+            queryset.filter(id__gt=last_id).order_by('id')[:chunk_size]
+        )
+
+        if not chunk:
+            return
+
+        prefetch_related_objects(chunk, 'tags')
+        yield chunk
+
+        last_id = chunk[-1].id
+
+
+def iter_ndjson_lines(since=None, chunk_size=EXPORT_CHUNK_SIZE,
+                      context=None):
+    for chunk in iter_published_recipes(since, chunk_size):
+        serializer = RecipeReadSerializer(
+            chunk, many=True, context=context
+        )
+
+        lines = []
+        for recipe, data in zip(chunk, serializer.data):
+            data['created_at'] = recipe.created_at
+            data['updated_at'] = recipe.updated_at
+            lines.append(json.dumps(data, cls=DjangoJSONEncoder) + '\n')
+
+        yield ''.join(lines)
@@ -0,0 +1,175 @@
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+from rest_framework import serializers
+
+from .models import Recipe
+
+DEFAULT_ORDERING = '-id'
+
+# Índices (parciais, is_published=True) que servem a listagem da API v2,
+# coluna por coluna. 'tag' é o recipe_tags_tag_recipe_idx da tabela de
+# tags, (tag_id, recipe_id): com ?tag= a página é ordenada pelo recipe_id
+# dessa tabela (ver get_id_expression). Ver Recipe.Meta.indexes
+RECIPE_API_INDEXES = (
+    ('id',),
+    ('category', 'id'),
+    ('author', 'id'),
+    ('tag', 'id'),
+    ('created_at', 'id'),
+    ('preparation_time', 'id'),
+    ('servings', 'id'),
+)
+
+# Parâmetro → (coluna do índice, lookup). Lookups de intervalo só valem
+# sobre a coluna da ordenação
+RECIPE_API_FILTERS = {
+    'tag': ('tag', 'tags__slug'),
+    'category_id': ('category', 'category_id'),
+    'author': ('author', 'author_id'),
+    'servings': ('servings', 'servings'),
+    'preparation_time_min': ('preparation_time', 'preparation_time__gte'),
+    'preparation_time_max': ('preparation_time', 'preparation_time__lte'),
+    'created_after': ('created_at', 'created_at__gte'),
+    'created_before': ('created_at', 'created_at__lt'),
+}
+RANGE_LOOKUPS = ('__gte', '__gt', '__lte', '__lt')
+
+RECIPE_API_ORDERINGS = ('id', 'created_at', 'preparation_time', 'servings')
+
+
+# O SQLite não troca recipes_recipe.id pelo recipe_id da ligação (iguais
+# pelo JOIN) na hora de ordenar: ordenando pelo da ligação, a página sai
+# do índice (tag_id, recipe_id) sem TEMP B-TREE
+TAG_LINK_RECIPE_ID = RawSQL('"{}"."{}"'.format(
+    Recipe.tags.through._meta.db_table,
+    Recipe.tags.through._meta.get_field('recipe').column,
+), [])
+
+
+def parse_ordering(ordering):
+    """
+    >>> parse_ordering('-created_at')
+    ('created_at', True)
+    >>> parse_ordering('servings')
+    ('servings', False)
+    """
+    return ordering.lstrip('-'), ordering.startswith('-')
+
+
+def find_index(equal_columns, range_columns, order_column):
+    """
+    Índice de RECIPE_API_INDEXES que começa pelas colunas filtradas por
+    igualdade e segue pela coluna da ordenação (que pode ter um
+    intervalo), ou None. Com ele o banco lê a página em ordem e para no
+    LIMIT, sem varrer nem ordenar o resto da tabela.
+
+    >>> find_index({'category'}, set(), 'id')
+    ('category', 'id')
+    >>> find_index(set(), {'preparation_time'}, 'preparation_time')
+    ('preparation_time', 'id')
+    >>> find_index({'category'}, set(), 'created_at') is None
+    True
+    >>> find_index({'tag', 'author'}, set(), 'id') is None
+    True
+    """
+    if not range_columns <= {order_column}:
+        return None
+
+    for columns in RECIPE_API_INDEXES:
+        prefix = columns[:len(equal_columns)]
+        rest = columns[len(equal_columns):]
+
+        if set(prefix) == equal_columns and rest and \
+                rest[0] == order_column:
+            return columns
+
+    return None
+
+
+def get_supported_combinations():
+    """
+    >>> get_supported_combinations()[:2]
+    ['ordering=id', 'category_id + ordering=id']
+    """
+    combinations = []
+
+    for columns in RECIPE_API_INDEXES:
+        for size in range(len(columns)):
+            params = [
+                param for param, (column, lookup) in
+                RECIPE_API_FILTERS.items()
+                if column in columns[:size] and
+                not lookup.endswith(RANGE_LOOKUPS)
+            ]
+            if columns[size] not in RECIPE_API_ORDERINGS or \
+                    len(params) != size:
+                continue
+
+            combinations.append(
+                ' + '.join([*params, f'ordering={columns[size]}'])
+            )
+
+    return list(dict.fromkeys(combinations))
+
+
+class RecipeAPIFilterSerializer(serializers.Serializer):
+    """
+    Valida os filtros e a ordenação da listagem da API v2 (query string).
+    Parâmetros fora da lista são ignorados; combinações sem um índice que
+    as sirva são recusadas em vez de virar uma varredura da tabela.
+    """
+
+    tag = serializers.SlugField(required=False)
+    category_id = serializers.IntegerField(required=False, min_value=1)
+    author = serializers.IntegerField(required=False, min_value=1)
+    servings = serializers.IntegerField(required=False, min_value=0)
+    preparation_time_min = serializers.IntegerField(
+        required=False, min_value=0)
+    preparation_time_max = serializers.IntegerField(
+        required=False, min_value=0)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    ordering = serializers.ChoiceField(
+        choices=[
+            prefix + ordering
+            for ordering in RECIPE_API_ORDERINGS for prefix in ('', '-')
+        ],
+        required=False,
+        default=DEFAULT_ORDERING,
+    )
+
+    def validate(self, attrs):
+        order_column, _ = parse_ordering(attrs['ordering'])
+        equal_columns = set()
+        range_columns = set()
+
+        for param, (column, lookup) in RECIPE_API_FILTERS.items():
+            if param not in attrs:
+                continue
+
+            if lookup.endswith(RANGE_LOOKUPS):
+                range_columns.add(column)
+            else:
+                equal_columns.add(column)
+
+        if find_index(equal_columns, range_columns, order_column) is None:
+            raise serializers.ValidationError(
+                'No index serves this combination of filters and '
+                'ordering. Supported (ranges only on the ordering '
+                'column): ' + ', '.join(get_supported_combinations())
+            )
+
+        return attrs
+
+    def get_id_expression(self):
+        """Coluna do id na ordenação e no cursor da página"""
+        if 'tag' in self.validated_data:
+            return TAG_LINK_RECIPE_ID
+        return F('id')
+
+    def filter_queryset(self, queryset):
+        return queryset.filter(**{
+            lookup: self.validated_data[param]
+            for param, (_, lookup) in RECIPE_API_FILTERS.items()
+            if param in self.validated_data
+        })
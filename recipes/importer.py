@@ -0,0 +1,286 @@
+import csv
+import json
+import string
+from random import SystemRandom
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from tag.models import Tag
+from utils.strings import normalize_text
+
+from recipes.cache import bump_page_cache_generation
+from recipes.models import Category, CoverJob, Recipe
+from recipes.search import get_search_backend
+from recipes.summaries import rebuild_summaries
+
+IMPORT_BATCH_SIZE = 1000
+TAGS_SEPARATOR = '|'
+RECIPE_FIELDS = (
+    'title', 'description', 'preparation_time', 'preparation_time_unit',
+    'servings', 'servings_unit', 'preparation_steps',
+    'preparation_steps_is_html', 'is_published', 'cover',
+)
+UPDATE_FIELDS = RECIPE_FIELDS + (
+    'title_normalized', 'category', 'author', 'cover_renditions',
+    'updated_at',
+)
+TRUE_VALUES = ('1', 'true', 't', 'yes', 'y', 'sim', 's')
+
+
+def random_slug(text):
+    rand_letters = ''.join(
+        SystemRandom().choices(string.ascii_letters + string.digits, k=5)
+    )
+    return slugify(f'{text}-{rand_letters}')
+
+
+def to_bool(value):
+    """
+    >>> [to_bool(v) for v in ('1', 'True', 'sim', '0', '', None, True)]
+    [True, True, True, False, False, False, True]
+    """
+    if isinstance(value, bool):
+        return value
+    return str(value or '').strip().lower() in TRUE_VALUES
+
+
+def to_tag_names(value):
+    """
+    >>> to_tag_names('Doce| Bolo |')
+    ['Doce', 'Bolo']
+    >>> to_tag_names(['Doce', 'Bolo'])
+    ['Doce', 'Bolo']
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(TAGS_SEPARATOR)
+    return [name.strip() for name in value if name and name.strip()]
+
+
+def read_csv_rows(file):
+    yield from csv.DictReader(file)
+
+
+def read_ndjson_rows(file):
+    for line in file:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class RecipeImporter:
+    """
+    Importa receitas em lote sem passar por Recipe.save: cada bloco vira
+    um bulk_create (novas), um bulk_update (slugs já existentes) e um
+    bulk_create na tabela de tags. Categorias, tags e autores são
+    resolvidos por dicionários em memória.
+
+    Como os signals não rodam, os jobs de capa são criados em lote a cada
+    bloco e o índice de busca (só das receitas importadas), os resumos de
+    categoria/tag e o cache de páginas são atualizados uma vez, no final
+    da importação.
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.categories = dict(Category.objects.values_list('name', 'id'))
+        self.tags = dict(Tag.objects.values_list('name', 'id'))
+        self.authors = {}
+        self.created = 0
+        self.updated = 0
+        self.imported_ids = []
+        self.unknown_authors = set()
+        self.duplicated_titles = 0
+
+    def resolve_categories(self, rows):
+        missing = {
+            row.get('category') for row in rows
+            if row.get('category') and
+            row.get('category') not in self.categories
+        }
+        if missing:
+            Category.objects.bulk_create([
+                Category(name=name) for name in missing
+            ])
+            self.categories.update(
+                Category.objects.filter(
+                    name__in=missing
+                ).values_list('name', 'id')
+            )
+
+    def resolve_tags(self, rows):
+        missing = {
+            name for row in rows for name in to_tag_names(row.get('tags'))
+            if name not in self.tags
+        }
+        if missing:
+            Tag.objects.bulk_create([
+                Tag(name=name, slug=random_slug(name)) for name in missing
+            ])
+            self.tags.update(
+                Tag.objects.filter(
+                    name__in=missing
+                ).values_list('name', 'id')
+            )
+
+    def resolve_authors(self, rows):
+        missing = {
+            row.get('author') for row in rows
+            if row.get('author') and row.get('author') not in self.authors
+        }
+        if missing:
+            found = dict(
+                User.objects.filter(
+                    username__in=missing
+                ).values_list('username', 'id')
+            )
+            self.unknown_authors.update(missing - set(found))
+            self.authors.update(found)
+            self.authors.update(
+                {username: None for username in missing - set(found)}
+            )
+
+    def build_recipe(self, row, now):
+        recipe = Recipe(
+            slug=row.get('slug') or random_slug(row.get('title', '')),
+            category_id=self.categories.get(row.get('category')),
+            author_id=self.authors.get(row.get('author')),
+            cover_renditions={},
+            updated_at=now,
+        )
+
+        for field_name in RECIPE_FIELDS:
+            value = row.get(field_name)
+            if field_name in ('preparation_steps_is_html', 'is_published'):
+                value = to_bool(value)
+            elif field_name in ('preparation_time', 'servings'):
+                value = int(value or 0)
+            else:
+                value = value or ''
+            setattr(recipe, field_name, value)
+
+        recipe.title_normalized = normalize_text(recipe.title)
+        return recipe
+
+    def drop_duplicated_titles(self, recipes):
+        """
+        Títulos que já pertencem a outra receita ficam sem
+        title_normalized, como no backfill, em vez de quebrar o bloco.
+        """
+        taken = dict(
+            Recipe.objects.filter(
+                title_normalized__in={
+                    recipe.title_normalized for recipe in recipes
+                }
+            ).values_list('title_normalized', 'slug')
+        )
+
+        for recipe in recipes:
+            owner = taken.setdefault(recipe.title_normalized, recipe.slug)
+
+            if owner != recipe.slug:
+                recipe.title_normalized = None
+                self.duplicated_titles += 1
+
+    def import_batch(self, rows):
+        now = timezone.now()
+        self.resolve_categories(rows)
+        self.resolve_tags(rows)
+        self.resolve_authors(rows)
+
+        recipes = {}
+        for row in rows:
+            recipe = self.build_recipe(row, now)
+            recipes[recipe.slug] = (recipe, to_tag_names(row.get('tags')))
+
+        self.drop_duplicated_titles(
+            [recipe for recipe, _ in recipes.values()]
+        )
+
+        existing = {
+            slug: (pk, cover, cover_renditions)
+            for slug, pk, cover, cover_renditions in Recipe.objects.filter(
+                slug__in=recipes.keys()
+            ).values_list('slug', 'id', 'cover', 'cover_renditions')
+        }
+        new_recipes = []
+        old_recipes = []
+        pending_covers = []
+
+        for slug, (recipe, _) in recipes.items():
+            if slug in existing:
+                recipe.id, old_cover, old_renditions = existing[slug]
+                old_recipes.append(recipe)
+
+                if recipe.cover.name == old_cover:
+                    recipe.cover_renditions = old_renditions
+            else:
+                new_recipes.append(recipe)
+
+            if recipe.cover and not recipe.has_cover_renditions():
+                pending_covers.append(recipe)
+
+        with transaction.atomic():
+            Recipe.objects.bulk_create(new_recipes)
+            Recipe.objects.bulk_update(old_recipes, UPDATE_FIELDS)
+
+            if not all(recipe.id for recipe in new_recipes):
+                ids = dict(
+                    Recipe.objects.filter(
+                        slug__in=[recipe.slug for recipe in new_recipes]
+                    ).values_list('slug', 'id')
+                )
+                for recipe in new_recipes:
+                    recipe.id = ids[recipe.slug]
+
+            Through = Recipe.tags.through
+            Through.objects.filter(
+                recipe_id__in=[recipe.id for recipe in old_recipes]
+            ).delete()
+            Through.objects.bulk_create([
+                Through(recipe_id=recipe.id, tag_id=self.tags[name])
+                for recipe, tag_names in recipes.values()
+                for name in set(tag_names)
+            ], ignore_conflicts=True)
+
+            # Capas ficam para o worker process_covers
+            CoverJob.objects.bulk_create([
+                CoverJob(recipe_id=recipe.id, cover_name=recipe.cover.name)
+                for recipe in pending_covers
+            ])
+
+        self.created += len(new_recipes)
+        self.updated += len(old_recipes)
+        self.imported_ids.extend(
+            recipe.id for recipe, _ in recipes.values()
+        )
+        return len(rows)
+
+    def run(self, rows, on_batch=None):
+        total = 0
+
+        for batch in iter_batches(rows, self.batch_size):
+            total += self.import_batch(batch)
+            if on_batch is not None:
+                on_batch(total)
+
+        if total:
+            get_search_backend().index_recipes(self.imported_ids)
+            rebuild_summaries()
+            bump_page_cache_generation()
+
+        return total
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from recipes.models import Recipe
+from recipes.titles import BACKFILL_BATCH_SIZE, backfill_title_normalized
+
+
+class Command(BaseCommand):
+    help = (
+        'Fills Recipe.title_normalized for recipes that do not have it '
+        'yet and lists recipes whose titles collide with another recipe.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BACKFILL_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        updated, duplicated_ids = backfill_title_normalized(
+            Recipe, batch_size=options['batch_size']
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{updated} recipes updated.'
+        ))
+
+        if duplicated_ids:
+            self.stdout.write(self.style.WARNING(
+                f'{len(duplicated_ids)} recipes have duplicated titles and '
+                'were left without title_normalized: '
+                f'{", ".join(str(pk) for pk in duplicated_ids)}'
+            ))
@@ -0,0 +1,393 @@
+import itertools
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import get_resolver, reverse
+from utils.bench import (compare_results, load_results, measure_call,
+                         save_results)
+
+from recipes.models import Recipe
+from recipes.seed import Seeder
+
+NAMESPACES = ('recipes', 'authors')
+BENCH_PASSWORD = 'Bench-Passw0rd'
+
+# Cada rota nomeada de recipes/urls.py e authors/urls.py. Chaves:
+# auth (None, 'session' ou 'jwt'), method, args/query/data (funções que
+# recebem o BenchData), setup (roda antes de cada request, fora da
+# medição) e status (esperado).
+ROUTES = {
+    'recipes:home': {},
+    'recipes:search': {
+        'query': lambda data: {'q': data.search_term},
+    },
+    'recipes:tag': {
+        'args': lambda data: (data.tag.slug,),
+    },
+    'recipes:category': {
+        'args': lambda data: (data.category.id,),
+    },
+    'recipes:recipe': {
+        'args': lambda data: (data.recipe.id,),
+    },
+    'recipes:recipes_api_v1': {},
+    'recipes:recipes_api_v1_detail': {
+        'args': lambda data: (data.recipe.id,),
+    },
+    'recipes:theory': {},
+    'recipes:recipes_api_v2_tag': {
+        'args': lambda data: (data.tag.id,),
+    },
+    'recipes:recipes_api_v2_export': {
+        'auth': 'jwt',
+    },
+    'recipes:token_obtain_pair': {
+        'method': 'post',
+        'data': lambda data: {
+            'username': data.author.username, 'password': BENCH_PASSWORD,
+        },
+    },
+    'recipes:token_refresh': {
+        'method': 'post',
+        'data': lambda data: {'refresh': data.tokens['refresh']},
+    },
+    'recipes:token_verify': {
+        'method': 'post',
+        'data': lambda data: {'token': data.tokens['access']},
+    },
+    'recipes:recipe-api-list': {
+        'auth': 'jwt',
+    },
+    'recipes:recipe-api-detail': {
+        'auth': 'jwt',
+        'args': lambda data: (data.recipe.id,),
+    },
+    'authors:register': {},
+    'authors:register_create': {
+        'method': 'post',
+        'data': lambda data: data.make_register_data(),
+        'status': 302,
+    },
+    'authors:login': {},
+    'authors:login_create': {
+        'method': 'post',
+        'data': lambda data: {
+            'username': data.author.username, 'password': BENCH_PASSWORD,
+        },
+        'status': 302,
+    },
+    'authors:logout': {
+        'auth': 'session',
+        'method': 'post',
+        'setup': lambda data, client: client.force_login(data.author),
+        'data': lambda data: {'username': data.author.username},
+        'status': 302,
+    },
+    'authors:dashboard': {
+        'auth': 'session',
+    },
+    'authors:dashboard_recipe_edit': {
+        'auth': 'session',
+        'args': lambda data: (data.draft.id,),
+    },
+    'authors:dashboard_recipe_new': {
+        'auth': 'session',
+    },
+    'authors:dashboard_recipe_delete': {
+        'auth': 'session',
+        'method': 'post',
+        'setup': lambda data, client: data.make_draft(),
+        'data': lambda data: {'id': data.last_draft.id},
+        'status': 302,
+    },
+    'authors:profile': {
+        'args': lambda data: (data.author.profile.id,),
+    },
+    'authors:author-api-list': {
+        'auth': 'jwt',
+    },
+    'authors:author-api-detail': {
+        'auth': 'jwt',
+        'args': lambda data: (data.author.id,),
+    },
+    'authors:author-api-me': {
+        'auth': 'jwt',
+    },
+}
+
+
+def get_route_names():
+    """Nomes ('namespace:nome') de todas as rotas de NAMESPACES"""
+    resolver = get_resolver()
+    names = set()
+
+    for namespace in NAMESPACES:
+        _, sub_resolver = resolver.namespace_dict[namespace]
+        names.update(
+            f'{namespace}:{name}'
+            for name in sub_resolver.reverse_dict
+            if isinstance(name, str)
+        )
+
+    return names
+
+
+class BenchData:
+    """Dados criados pelo seed e usados para montar as requests"""
+
+    def __init__(self, author, recipe, draft, category, tag, search_term):
+        self.author = author
+        self.recipe = recipe
+        self.draft = draft
+        self.category = category
+        self.tag = tag
+        self.search_term = search_term
+        self.tokens = {}
+        self.last_draft = None
+        self._numbers = itertools.count()
+
+    def make_register_data(self):
+        number = next(self._numbers)
+        return {
+            'username': f'bench-register-{number}',
+            'first_name': 'Bench',
+            'last_name': 'Register',
+            'email': f'bench-register-{number}@example.com',
+            'password': BENCH_PASSWORD,
+            'password2': BENCH_PASSWORD,
+        }
+
+    def make_draft(self):
+        number = next(self._numbers)
+        self.last_draft = Recipe.objects.create(
+            title=f'Bench draft {number}',
+            slug=f'bench-draft-{number}',
+            description='Bench draft',
+            preparation_time=10,
+            preparation_time_unit='Minutos',
+            servings=2,
+            servings_unit='Porções',
+            preparation_steps='Bench steps',
+            is_published=False,
+            author=self.author,
+            category=self.category,
+        )
+
+
+def seed(recipes, categories, tags, seed_value):
+    """
+    Cria o dataset com o Seeder (um autor para cada 20 receitas) e o autor
+    do benchmark, dono de um rascunho.
+    """
+    seeder = Seeder(seed=seed_value)
+    seeder.create_authors(max(recipes // 20, 1))
+    seeder.create_categories(categories)
+    seeder.create_tags(tags)
+    seeder.create_recipes(recipes)
+    seeder.finish()
+
+    recipe = Recipe.objects.filter(
+        is_published=True, tags__isnull=False
+    ).order_by('-id').select_related('category').first()
+    if recipe is None:
+        raise CommandError(
+            'The seed has no published recipe with tags, use more --recipes.'
+        )
+
+    author = User.objects.create_user(
+        username='bench-author', password=BENCH_PASSWORD,
+        first_name='Bench', last_name='Author',
+        email='bench-author@example.com',
+    )
+    data = BenchData(
+        author=author,
+        recipe=recipe,
+        draft=None,
+        category=recipe.category,
+        tag=recipe.tags.first(),
+        search_term=max(
+            (word for word in recipe.title.split() if not word.isdigit()),
+            key=len
+        ),
+    )
+    data.make_draft()
+    data.draft = data.last_draft
+    return data
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks every named route of recipes/urls.py and '
+        'authors/urls.py through the test client: p50/p95/p99 latency, '
+        'queries and allocated memory per request. Data is seeded inside '
+        'a transaction that is rolled back at the end. With --baseline, '
+        'fails when a route regressed more than --threshold.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=500)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--tags', type=int, default=30)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--route', action='append', dest='routes',
+            help='Only this route (e.g. recipes:home), can be repeated.')
+        parser.add_argument('--output', help='Write the results as JSON.')
+        parser.add_argument('--baseline', help='Results JSON to compare.')
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Allowed slowdown over the baseline (0.2 = 20%%).')
+        parser.add_argument(
+            '--page-cache', action='store_true',
+            help='Keep the anonymous page cache on (off by default, so '
+                 'the views themselves are measured).')
+
+    def get_routes(self, names):
+        missing = get_route_names() - set(ROUTES)
+        if missing:
+            raise CommandError(
+                'Routes without a benchmark in ROUTES: ' +
+                ', '.join(sorted(missing))
+            )
+
+        unknown = set(names or []) - set(ROUTES)
+        if unknown:
+            raise CommandError(
+                'Unknown routes: ' + ', '.join(sorted(unknown))
+            )
+
+        return names or sorted(ROUTES)
+
+    def make_client(self, auth, data):
+        if auth == 'jwt':
+            return Client(
+                HTTP_AUTHORIZATION=f'Bearer {data.tokens["access"]}'
+            )
+
+        client = Client()
+        if auth == 'session':
+            client.login(
+                username=data.author.username, password=BENCH_PASSWORD
+            )
+        return client
+
+    def make_call(self, name, spec, data):
+        client = self.make_client(spec.get('auth'), data)
+        args = spec['args'](data) if 'args' in spec else ()
+        path = reverse(name, args=args)
+        query = spec['query'](data) if 'query' in spec else {}
+        method = getattr(client, spec.get('method', 'get'))
+        setup = spec.get('setup')
+
+        def call():
+            if 'data' in spec:
+                response = method(path, spec['data'](data))
+            else:
+                response = method(path, query)
+
+            if response.streaming:
+                b''.join(response.streaming_content)
+            return response
+
+        if setup is None:
+            return path, call, None
+        return path, call, lambda: setup(data, client)
+
+    def bench_route(self, name, data, options):
+        spec = ROUTES[name]
+        path, call, setup = self.make_call(name, spec, data)
+        cache.clear()
+
+        response, metrics = measure_call(
+            call, options['iterations'], options['warmup'], setup
+        )
+
+        expected = spec.get('status', 200)
+        if response.status_code != expected:
+            raise CommandError(
+                f'{name} ({path}) answered {response.status_code}, '
+                f'expected {expected}'
+            )
+
+        return {
+            'path': path,
+            'method': spec.get('method', 'get').upper(),
+            'auth': spec.get('auth'),
+            **metrics,
+        }
+
+    def handle(self, *args, **options):
+        names = self.get_routes(options['routes'])
+        page_cache_settings = {} if options['page_cache'] \
+            else {'PAGE_CACHE_TIMEOUT': 0}
+
+        with transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=['testserver'],
+            DATABASE_ROUTERS=[],
+            QUERY_BUDGET_MODE='off',
+            AUTH_THROTTLE_ENABLED=False,
+            **page_cache_settings
+        ):
+            data = seed(
+                options['recipes'], options['categories'], options['tags'],
+                options['seed']
+            )
+            response = Client().post(reverse('recipes:token_obtain_pair'), {
+                'username': data.author.username, 'password': BENCH_PASSWORD,
+            })
+            data.tokens = response.json()
+
+            results = {
+                'options': {
+                    key: options[key] for key in (
+                        'recipes', 'categories', 'tags', 'seed',
+                        'iterations', 'warmup', 'page_cache',
+                    )
+                },
+                'routes': {},
+            }
+            self.stdout.write(
+                f'{"route":<36} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} '
+                f'{"queries":>7} {"mem KB":>8}'
+            )
+
+            for name in names:
+                metrics = self.bench_route(name, data, options)
+                results['routes'][name] = metrics
+                self.stdout.write(
+                    f'{name:<36} {metrics["p50_ms"]:>8.2f} '
+                    f'{metrics["p95_ms"]:>8.2f} {metrics["p99_ms"]:>8.2f} '
+                    f'{metrics["queries"]:>7} {metrics["memory_kb"]:>8.1f}'
+                )
+
+            transaction.set_rollback(True)
+
+        if options['output']:
+            save_results(options['output'], results)
+
+        if options['baseline']:
+            self.check_baseline(results, options)
+
+    def check_baseline(self, results, options):
+        regressions = compare_results(
+            results, load_results(options['baseline']), options['threshold']
+        )
+
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(
+                'No regressions against the baseline.'))
+            return
+
+        for name, metric, old, new in regressions:
+            self.stderr.write(f'{name}: {metric} {old} -> {new}')
+
+        raise CommandError(
+            f'{len(regressions)} regression(s) over the baseline '
+            f'(threshold {options["threshold"]:.0%}).'
+        )
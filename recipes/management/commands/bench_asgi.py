@@ -0,0 +1,239 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import quote, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from recipes.models import Recipe
+
+SERVERS = ('wsgi', 'asgi')
+HOST = 'localhost'
+
+
+def get_default_paths():
+    """Listagem, detalhe, busca e API v1 da receita publicada mais nova"""
+    recipe = Recipe.objects.filter(is_published=True).order_by('-id').first()
+    if recipe is None:
+        raise CommandError(
+            'No published recipes, run manage.py seed first.')
+
+    words = recipe.title.split()
+    term = quote(max(words, key=len)) if words else ''
+
+    return [
+        reverse('recipes:home'),
+        reverse('recipes:recipe', args=(recipe.id,)),
+        reverse('recipes:search') + f'?q={term}',
+        reverse('recipes:recipes_api_v1'),
+        reverse('recipes:recipes_api_v1_detail', args=(recipe.id,)),
+    ]
+
+
+def make_environ(path):
+    url = urlsplit(path)
+    return {
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': HOST,
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def call_wsgi(application, path):
+    status = []
+
+    def start_response(status_line, headers, exc_info=None):
+        status.append(int(status_line.split(' ', 1)[0]))
+
+    body = application(make_environ(path), start_response)
+    try:
+        for _ in body:
+            ...
+    finally:
+        # Dispara o request_finished, como o gunicorn faz
+        body.close()
+
+    return status[0]
+
+
+async def call_asgi(application, path):
+    url = urlsplit(path)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': url.path,
+        'raw_path': url.path.encode('ascii'),
+        'query_string': url.query.encode('ascii'),
+        'root_path': '',
+        'headers': [(b'host', HOST.encode('ascii'))],
+        'client': ('127.0.0.1', 0),
+        'server': (HOST, 80),
+    }
+    status = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+async def run_load(call, paths, concurrency, total):
+    """
+    `concurrency` clientes fazem requests em sequência até completar
+    `total`. A latência inclui o tempo na fila do servidor.
+    """
+    latencies = []
+    statuses = Counter()
+    numbers = iter(range(total))
+
+    async def client():
+        for number in numbers:
+            start = time.perf_counter()
+            status = await call(paths[number % len(paths)])
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'concurrency': concurrency,
+        'requests': total,
+        'throughput': total / elapsed,
+        'p50': statistics.median(latencies),
+        'p99': statistics.quantiles(latencies, n=100)[98],
+        'errors': sum(
+            count for status, count in statuses.items() if status >= 400
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares throughput and p99 latency of the WSGI stack (sync views, '
+        'N sync workers) against project.asgi (async views, one event '
+        'loop) at several concurrency levels. Both servers are driven '
+        'in-process, each in its own subprocess, against the current '
+        'database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, nargs='+', default=[50, 500])
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument(
+            '--workers', type=int, default=6,
+            help='WSGI worker threads (the deploy runs 6 gunicorn workers).')
+        parser.add_argument('--path', action='append', dest='paths')
+        parser.add_argument(
+            '--page-cache', action='store_true',
+            help='Keep the anonymous page cache on (off by default, so '
+                 'the views themselves are measured).')
+        parser.add_argument('--server', choices=SERVERS, help='(internal)')
+
+    def handle(self, *args, **options):
+        if options['server']:
+            return self.run_server(options)
+
+        paths = options['paths'] or get_default_paths()
+
+        self.stdout.write(
+            f'{"server":<6} {"conc":>5} {"req/s":>9} {"p50 ms":>9} '
+            f'{"p99 ms":>9} {"errors":>7}'
+        )
+
+        for server in SERVERS:
+            for result in self.spawn(server, paths, options):
+                self.stdout.write(
+                    f'{server:<6} {result["concurrency"]:>5} '
+                    f'{result["throughput"]:>9.1f} '
+                    f'{result["p50"] * 1000:>9.1f} '
+                    f'{result["p99"] * 1000:>9.1f} '
+                    f'{result["errors"]:>7}'
+                )
+
+    def spawn(self, server, paths, options):
+        command = [
+            sys.executable, '-m', 'django', 'bench_asgi',
+            '--server', server,
+            '--requests', str(options['requests']),
+            '--workers', str(options['workers']),
+            '--concurrency', *map(str, options['concurrency']),
+        ]
+        for path in paths:
+            command += ['--path', path]
+        if options['page_cache']:
+            command.append('--page-cache')
+
+        env = {
+            **os.environ,
+            'RECIPES_ASYNC_VIEWS': '1' if server == 'asgi' else '0',
+        }
+        output = subprocess.run(
+            command, env=env, check=True, capture_output=True, text=True
+        ).stdout
+
+        return [json.loads(line) for line in output.splitlines() if line]
+
+    def run_server(self, options):
+        paths = options['paths']
+        page_cache_settings = {} if options['page_cache'] \
+            else {'PAGE_CACHE_TIMEOUT': 0}
+
+        with override_settings(ALLOWED_HOSTS=[HOST], **page_cache_settings):
+            if options['server'] == 'asgi':
+                from project.asgi import application
+
+                async def call(path):
+                    return await call_asgi(application, path)
+
+                def run(concurrency):
+                    return asyncio.run(run_load(
+                        call, paths, concurrency, options['requests']))
+            else:
+                from project.wsgi import application
+
+                executor = ThreadPoolExecutor(max_workers=options['workers'])
+
+                async def call(path):
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        executor, call_wsgi, application, path)
+
+                def run(concurrency):
+                    return asyncio.run(run_load(
+                        call, paths, concurrency, options['requests']))
+
+            for concurrency in options['concurrency']:
+                self.stdout.write(json.dumps(run(concurrency)))
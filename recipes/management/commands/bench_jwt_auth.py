@@ -0,0 +1,73 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from utils.bench import measure_call
+
+from authors.authentication import token_cache
+from recipes.seed import Seeder
+
+PASSWORD = 'Bench-Passw0rd'
+ROUTES = ('recipes:recipe-api-list', 'authors:author-api-me')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares authenticated GET /recipes/api/v2/ and /authors/api/me/ '
+        'with the JWT authentication cache on and off. Test data is '
+        'created inside a transaction that is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=200)
+        parser.add_argument('--iterations', type=int, default=500)
+        parser.add_argument('--warmup', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=['testserver'],
+            DATABASE_ROUTERS=[],
+            QUERY_BUDGET_MODE='off',
+        ):
+            seeder = Seeder()
+            seeder.create_authors(10)
+            seeder.create_categories(5)
+            seeder.create_tags(20)
+            seeder.create_recipes(options['recipes'])
+            seeder.finish()
+
+            user = User.objects.create_user(
+                username='bench-jwt', password=PASSWORD)
+            access = Client().post(reverse('recipes:token_obtain_pair'), {
+                'username': user.username, 'password': PASSWORD,
+            }).json()['access']
+            client = Client(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+            self.stdout.write(
+                f'{"route":<28} {"cache":<5} {"p50 ms":>8} {"p95 ms":>8} '
+                f'{"p99 ms":>8} {"queries":>7}'
+            )
+
+            for name in ROUTES:
+                path = reverse(name)
+
+                for label, cache_size in (('off', 0), ('on', 10000)):
+                    token_cache.clear()
+
+                    with override_settings(JWT_AUTH_CACHE_SIZE=cache_size):
+                        _, metrics = measure_call(
+                            lambda: client.get(path),
+                            options['iterations'], options['warmup']
+                        )
+
+                    self.stdout.write(
+                        f'{name:<28} {label:<5} '
+                        f'{metrics["p50_ms"]:>8.2f} '
+                        f'{metrics["p95_ms"]:>8.2f} '
+                        f'{metrics["p99_ms"]:>8.2f} '
+                        f'{metrics["queries"]:>7}'
+                    )
+
+            transaction.set_rollback(True)
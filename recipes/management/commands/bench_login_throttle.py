@@ -0,0 +1,201 @@
+import itertools
+import multiprocessing
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from utils.bench import measure_call, run_in_django
+from utils.throttle import get_rejections
+
+from recipes.seed import SEED_PASSWORD, Seeder
+
+# (nome, ataque ligado, throttle ligado)
+SCENARIOS = (
+    ('idle', False, True),
+    ('attack, throttle off', True, False),
+    ('attack, throttle on', True, True),
+)
+
+
+def run_attacker(number, rate, throttling, stop_event, counters):
+    """
+    Um atacante: tenta senhas erradas em POST /authors/login/create/ de um
+    IP próprio, `rate` vezes por segundo, até `stop_event`.
+
+    Roda num processo à parte, como um cliente de verdade: numa thread
+    ele disputaria o GIL com o login medido e a latência subiria por
+    causa do benchmark, não do servidor. Os buckets do atacante ficam no
+    cache do processo dele. Sobe via utils.bench.run_in_django.
+    """
+    attempts, throttled, rejected, throttled_attackers = counters
+    client = Client(REMOTE_ADDR=f'10.66.0.{number}')
+    path = reverse('authors:login_create')
+    usernames = (f'victim{value}' for value in itertools.count())
+    was_throttled = False
+
+    with override_settings(
+        ALLOWED_HOSTS=['testserver'],
+        AUTH_THROTTLE_ENABLED=throttling,
+        DATABASE_ROUTERS=[],
+        QUERY_BUDGET_MODE='off',
+    ):
+        try:
+            while not stop_event.is_set():
+                response = client.post(path, {
+                    'username': next(usernames), 'password': 'wrong-pass',
+                })
+                with attempts.get_lock():
+                    attempts.value += 1
+                if response.status_code == 429:
+                    with throttled.get_lock():
+                        throttled.value += 1
+                    if not was_throttled:
+                        was_throttled = True
+                        with throttled_attackers.get_lock():
+                            throttled_attackers.value += 1
+                stop_event.wait(1 / rate)
+        finally:
+            with rejected.get_lock():
+                rejected.value += sum(get_rejections().values())
+            connection.close()
+
+
+class Attack:
+    """`attackers` processos de run_attacker, cada um de um IP"""
+
+    def __init__(self, attackers, rate, throttling):
+        self.attackers = attackers
+        self.rate = rate
+        self.throttling = throttling
+        self.context = multiprocessing.get_context('spawn')
+        self.stop_event = self.context.Event()
+        self.counters = tuple(self.context.Value('i', 0) for _ in range(4))
+        self.processes = []
+
+    @property
+    def attempts(self):
+        return self.counters[0].value
+
+    @property
+    def throttled(self):
+        return self.counters[1].value
+
+    @property
+    def rejected(self):
+        return self.counters[2].value
+
+    def wait_until_throttled(self, timeout):
+        """
+        Espera todos os atacantes gastarem a capacidade dos buckets: o
+        pico inicial é pago uma vez por IP, a medição é do regime
+        """
+        deadline = time.monotonic() + timeout
+        while self.counters[3].value < self.attackers and \
+                time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    def wait_until_attacking(self, timeout):
+        """Sem throttle, espera os processos subirem e começarem a atacar"""
+        deadline = time.monotonic() + timeout
+        while self.attempts < self.attackers * 2 and \
+                time.monotonic() < deadline:
+            time.sleep(0.1)
+
+    def __enter__(self):
+        for number in range(self.attackers):
+            process = self.context.Process(target=run_in_django, args=(
+                f'{__name__}.run_attacker', number + 1, self.rate,
+                self.throttling, self.stop_event, self.counters,
+            ))
+            process.start()
+            self.processes.append(process)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop_event.set()
+        for process in self.processes:
+            process.join()
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures legitimate POST /recipes/api/token/ latency while '
+        'attacker processes hammer the login with wrong passwords, with the '
+        'authentication throttle off and on. Test users are created inside '
+        'a transaction that is rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attackers', type=int, default=4)
+        parser.add_argument(
+            '--rate', type=float, default=20,
+            help='Login attempts per second of each attacker.')
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument(
+            '--timeout', type=float, default=60,
+            help='Seconds to wait for the attackers to be throttled '
+                 'before measuring.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=['testserver'],
+            DATABASE_ROUTERS=[],
+            QUERY_BUDGET_MODE='off',
+        ):
+            # Um usuário e um IP por login legítimo: só o ataque deve
+            # esgotar buckets
+            calls = options['warmup'] + options['iterations'] + 1
+            Seeder().create_authors(calls)
+            usernames = list(User.objects.order_by('-id').values_list(
+                'username', flat=True)[:calls])
+
+            self.stdout.write(
+                f'{"scenario":<22} {"p50 ms":>8} {"p95 ms":>8} '
+                f'{"p99 ms":>8} {"attacks":>8} {"429":>6} {"rejected":>8}'
+            )
+
+            for name, attacking, throttling in SCENARIOS:
+                cache.clear()
+                logins = iter(enumerate(itertools.cycle(usernames)))
+
+                def call():
+                    number, username = next(logins)
+                    response = Client(
+                        REMOTE_ADDR=f'10.0.{number // 250}.{number % 250}'
+                    ).post(reverse('recipes:token_obtain_pair'), {
+                        'username': username, 'password': SEED_PASSWORD,
+                    })
+                    if response.status_code != 200:
+                        raise CommandError(
+                            f'Legitimate login answered '
+                            f'{response.status_code} ({name})'
+                        )
+                    return response
+
+                attack = Attack(
+                    options['attackers'] if attacking else 0, options['rate'],
+                    throttling)
+
+                with override_settings(AUTH_THROTTLE_ENABLED=throttling), \
+                        attack:
+                    if attacking and throttling:
+                        attack.wait_until_throttled(options['timeout'])
+                    elif attacking:
+                        attack.wait_until_attacking(options['timeout'])
+                    _, metrics = measure_call(
+                        call, options['iterations'], options['warmup'])
+
+                self.stdout.write(
+                    f'{name:<22} {metrics["p50_ms"]:>8.2f} '
+                    f'{metrics["p95_ms"]:>8.2f} {metrics["p99_ms"]:>8.2f} '
+                    f'{attack.attempts:>8} {attack.throttled:>6} '
+                    f'{attack.rejected:>8}'
+                )
+
+            transaction.set_rollback(True)
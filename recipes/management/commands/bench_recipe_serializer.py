@@ -0,0 +1,94 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+from tag.models import Tag
+
+from recipes.models import Category, Recipe
+from recipes.serializers import RecipeReadSerializer, RecipeSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares RecipeSerializer and RecipeReadSerializer on pages of '
+        'recipes. Test data is created inside a transaction that is '
+        'rolled back at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[5, 50, 500]
+        )
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--tags-per-recipe', type=int, default=3)
+
+    def seed(self, total, tags_per_recipe):
+        author = User.objects.create(username='bench-serializer-author')
+        category = Category.objects.create(name='Bench')
+        tags = Tag.objects.bulk_create([
+            Tag(name=f'Bench tag {i}', slug=f'bench-serializer-tag-{i}')
+            for i in range(tags_per_recipe)
+        ])
+        recipes = Recipe.objects.bulk_create([
+            Recipe(
+                title=f'Bench recipe {i}',
+                description='Bench description',
+                slug=f'bench-serializer-recipe-{i}',
+                preparation_time=10,
+                preparation_time_unit='Minutos',
+                servings=2,
+                servings_unit='Porções',
+                preparation_steps='Bench steps ' * 20,
+                is_published=True,
+                category=category,
+                author=author,
+            )
+            for i in range(total)
+        ])
+        Recipe.tags.through.objects.bulk_create([
+            Recipe.tags.through(recipe_id=recipe.id, tag_id=tag.id)
+            for recipe in recipes
+            for tag in tags
+        ])
+        return [recipe.id for recipe in recipes]
+
+    def measure(self, serializer_class, recipes, context, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            serializer_class(recipes, many=True, context=context).data
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    def handle(self, *args, **options):
+        sizes = options['sizes']
+        request = APIRequestFactory().get('/recipes/api/v2/')
+        context = {'request': request}
+
+        with transaction.atomic(), \
+                override_settings(ALLOWED_HOSTS=['testserver']):
+            ids = self.seed(max(sizes), options['tags_per_recipe'])
+
+            for size in sizes:
+                recipes = list(
+                    Recipe.objects.get_published().filter(
+                        id__in=ids[:size]
+                    ).order_by('-id')
+                )
+                drf = self.measure(
+                    RecipeSerializer, recipes, context, options['repeat'])
+                fast = self.measure(
+                    RecipeReadSerializer, recipes, context, options['repeat'])
+
+                self.stdout.write(
+                    f'{size:>5} recipes: '
+                    f'RecipeSerializer {drf * 1000:8.2f} ms | '
+                    f'RecipeReadSerializer {fast * 1000:8.2f} ms | '
+                    f'{drf / fast:5.1f}x faster'
+                )
+
+            transaction.set_rollback(True)
@@ -0,0 +1,51 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from utils.db_pool import get_published_stats
+
+COLUMNS = (
+    'checkouts', 'reuses', 'connects', 'closed', 'idle_reaped',
+    'health_check_failures',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Shows the persistent database connection statistics published by '
+        'each worker (requires a shared CACHE_BACKEND). There is no waits '
+        'column: each thread owns its connection, so no request waits for '
+        'a free one; connects counts the reconnects.'
+    )
+
+    def handle(self, *args, **options):
+        published = get_published_stats()
+
+        if not published:
+            self.stdout.write(self.style.WARNING(
+                'No worker has published statistics yet.'
+            ))
+            return
+
+        self.stdout.write('pid\t' + '\t'.join(COLUMNS))
+        totals = Counter()
+
+        for pid, stats in sorted(published.items()):
+            totals.update(stats)
+            self.stdout.write(
+                f'{pid}\t' +
+                '\t'.join(str(stats.get(column, 0)) for column in COLUMNS)
+            )
+
+        self.stdout.write(
+            'total\t' +
+            '\t'.join(str(totals.get(column, 0)) for column in COLUMNS)
+        )
+
+        # Sem persistência cada request abre uma conexão (taxa perto de 1)
+        checkouts = totals.get('checkouts', 0)
+        if checkouts:
+            self.stdout.write(self.style.SUCCESS(
+                f'{totals.get("connects", 0) / checkouts:.2f} '
+                'new connections per request.'
+            ))
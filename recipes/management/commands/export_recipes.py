@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.export import (EXPORT_CHUNK_SIZE, iter_ndjson_lines,
+                            parse_since)
+
+
+class Command(BaseCommand):
+    help = 'Exports published recipes as newline-delimited JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Only recipes updated at or after this ISO 8601 datetime.'
+        )
+        parser.add_argument(
+            '--output', '-o',
+            help='Output file (default: stdout).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        since = None
+
+        if options['since']:
+            try:
+                since = parse_since(options['since'])
+            except ValueError as error:
+                raise CommandError(error)
+
+        chunks = iter_ndjson_lines(
+            since=since, chunk_size=options['chunk_size']
+        )
+
+        if not options['output']:
+            for lines in chunks:
+                self.stdout.write(lines, ending='')
+            return
+
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            for lines in chunks:
+                output.write(lines)
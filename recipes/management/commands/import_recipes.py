@@ -0,0 +1,77 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.importer import (IMPORT_BATCH_SIZE, RecipeImporter,
+                              read_csv_rows, read_ndjson_rows)
+
+READERS = {
+    'csv': read_csv_rows,
+    'ndjson': read_ndjson_rows,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports recipes from a CSV or NDJSON file, upserting by slug in '
+        'batches. Columns: slug, title, description, preparation_time, '
+        'preparation_time_unit, servings, servings_unit, '
+        'preparation_steps, preparation_steps_is_html, is_published, '
+        'cover, category (name), author (username) and tags (names '
+        'separated by "|" in CSV, a list in NDJSON).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format', choices=READERS.keys(),
+            help='File format (default: guessed from the extension).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=IMPORT_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+
+        if file_format in ('jsonl', 'json'):
+            file_format = 'ndjson'
+
+        if file_format not in READERS:
+            raise CommandError(
+                'Unknown format, use --format csv or --format ndjson.'
+            )
+
+        importer = RecipeImporter(batch_size=options['batch_size'])
+        start = time.perf_counter()
+
+        def report(total):
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'{total} rows ({total / elapsed:.0f} rows/s)'
+            )
+
+        with path.open(encoding='utf-8', newline='') as file:
+            total = importer.run(READERS[file_format](file), report)
+
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} rows imported in {elapsed:.1f}s ({rate:.0f} rows/s): '
+            f'{importer.created} created, {importer.updated} updated.'
+        ))
+
+        if importer.unknown_authors:
+            self.stdout.write(self.style.WARNING(
+                f'{len(importer.unknown_authors)} unknown authors were '
+                'imported without author.'
+            ))
+
+        if importer.duplicated_titles:
+            self.stdout.write(self.style.WARNING(
+                f'{importer.duplicated_titles} recipes have titles that '
+                'already exist; run backfill_title_normalized after '
+                'renaming them.'
+            ))
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from recipes.covers import CLAIM_TIMEOUT, process_cover_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        'Processes pending recipe cover jobs, generating the list, detail '
+        'and WebP renditions in a process pool.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Number of worker processes (default: CPU count).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=50,
+            help='Maximum number of jobs claimed at a time.'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=5,
+            help='Seconds to wait when the queue is empty.'
+        )
+        parser.add_argument(
+            '--claim-timeout', type=int, default=CLAIM_TIMEOUT,
+            help='Seconds after which a job left processing by a dead '
+                 'worker is put back in the queue.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Process the current queue and exit.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            done = process_cover_jobs(
+                limit=options['batch_size'],
+                workers=options['workers'],
+                claim_timeout=options['claim_timeout'],
+            )
+
+            if done:
+                self.stdout.write(f'{done} covers processed.')
+
+            if options['once'] and not done:
+                break
+
+            if not done:
+                time.sleep(options['sleep'])
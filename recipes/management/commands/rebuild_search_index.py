@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from recipes.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the recipe full-text search index from scratch.'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        total = backend.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{backend.__class__.__name__}: {total} recipes indexed.'
+        ))
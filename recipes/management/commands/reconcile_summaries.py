@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from recipes.summaries import get_summary_rows, rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the category, tag and site summary tables and reports how '
+        'many rows had drifted from the recipes table.'
+    )
+
+    def handle(self, *args, **options):
+        before = get_summary_rows()
+        rebuild_summaries()
+        after = get_summary_rows()
+
+        drifted = [
+            key for key in before.keys() | after.keys()
+            if before.get(key) != after.get(key)
+        ]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(after)} summaries rebuilt, {len(drifted)} were out of date.'
+        ))
+
+        for model_name, pk in sorted(drifted):
+            self.stdout.write(f'  {model_name} {pk}')
@@ -0,0 +1,120 @@
+import os
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from recipes.models import Recipe
+from recipes.seed import (SEED_BATCH_SIZE, SEED_PASSWORD, Seeder,
+                          get_next_number, iter_batch_ranges)
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a synthetic dataset with Faker: authors (with '
+        f'profiles, password "{SEED_PASSWORD}"), categories, tags and '
+        'recipes with skewed author/category/tag distributions. Output '
+        'is deterministic for a given --seed and empty database, '
+        'whatever the number of --workers.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipes', type=int, default=10000)
+        parser.add_argument(
+            '--authors', type=int,
+            help='Defaults to one author per 20 recipes.')
+        parser.add_argument('--categories', type=int, default=40)
+        parser.add_argument('--tags', type=int, default=400)
+        parser.add_argument('--publish-ratio', type=float, default=0.85)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--batch-size', type=int, default=SEED_BATCH_SIZE)
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Processes creating recipe batches. Use 1 on SQLite, '
+                 'which serializes writers anyway.')
+        parser.add_argument('--offset', type=int, help='(internal)')
+        parser.add_argument(
+            '--worker', type=int, nargs=2, metavar=('INDEX', 'TOTAL'),
+            help='(internal)')
+
+    def handle(self, *args, **options):
+        if not 0 <= options['publish_ratio'] <= 1:
+            raise CommandError('--publish-ratio must be between 0 and 1.')
+
+        if options['worker']:
+            return self.run_worker(options)
+
+        seeder = Seeder(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            publish_ratio=options['publish_ratio'],
+        )
+        authors = options['authors']
+        if authors is None:
+            authors = max(options['recipes'] // 20, 1)
+
+        start = time.perf_counter()
+        seeder.create_authors(authors)
+        seeder.create_categories(options['categories'])
+        seeder.create_tags(options['tags'])
+        self.stdout.write(
+            f'{authors} authors, {options["categories"]} categories and '
+            f'{options["tags"]} tags in {time.perf_counter() - start:.1f}s'
+        )
+
+        seeder.offset = get_next_number(Recipe)
+
+        if options['workers'] > 1:
+            self.spawn_workers(seeder, options)
+        else:
+            seeder.create_recipes(
+                options['recipes'], on_batch=self.write_progress)
+
+        seeder.finish()
+        self.stdout.write(self.style.SUCCESS(
+            f'{options["recipes"]} recipes in '
+            f'{time.perf_counter() - start:.1f}s'
+        ))
+
+    def write_progress(self, total):
+        self.stdout.write(f'{total} recipes')
+
+    def spawn_workers(self, seeder, options):
+        # Os processos abrem as próprias conexões
+        connections.close_all()
+
+        processes = []
+        for index in range(options['workers']):
+            processes.append(subprocess.Popen([
+                sys.executable, '-m', 'django', 'seed',
+                '--recipes', str(options['recipes']),
+                '--publish-ratio', str(options['publish_ratio']),
+                '--seed', str(options['seed']),
+                '--batch-size', str(options['batch_size']),
+                '--offset', str(seeder.offset),
+                '--worker', str(index), str(options['workers']),
+            ], env=os.environ.copy()))
+
+        failed = [
+            process.args for process in processes if process.wait() != 0
+        ]
+        if failed:
+            raise CommandError(f'{len(failed)} seed worker(s) failed.')
+
+    def run_worker(self, options):
+        index, workers = options['worker']
+        seeder = Seeder(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            publish_ratio=options['publish_ratio'],
+            offset=options['offset'],
+        )
+        batches = {
+            batch for batch, _ in iter_batch_ranges(
+                options['recipes'], options['batch_size'])
+            if batch % workers == index
+        }
+        seeder.create_recipes(options['recipes'], batches=batches)
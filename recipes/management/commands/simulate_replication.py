@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from utils.replicas import get_replicas, simulate_replication
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies the SQLite primary database to the configured replicas '
+        'every --lag seconds, simulating replication lag locally.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lag', type=float, default=2)
+        parser.add_argument(
+            '--iterations', type=int, default=None,
+            help='Stop after this many syncs (default: run forever).'
+        )
+
+    def handle(self, *args, **options):
+        if not get_replicas():
+            raise CommandError('No replicas configured.')
+
+        if connections['default'].vendor != 'sqlite':
+            raise CommandError('The lag simulator only supports SQLite.')
+
+        simulate_replication(
+            options['lag'],
+            iterations=options['iterations'],
+            stdout=self.stdout
+        )
@@ -0,0 +1,53 @@
+from django.db import migrations
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_recipe_fts USING fts5("
+    "title, description, tokenize = 'unicode61 remove_diacritics 2')",
+    "INSERT INTO recipes_recipe_fts (rowid, title, description) "
+    "SELECT id, title, description FROM recipes_recipe",
+]
+SQLITE_DROP = [
+    "DROP TABLE IF EXISTS recipes_recipe_fts",
+]
+
+POSTGRES_CREATE = [
+    "CREATE INDEX IF NOT EXISTS recipes_recipe_search_idx "
+    "ON recipes_recipe USING GIN (("
+    "setweight(to_tsvector('simple'::regconfig, "
+    "COALESCE(title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "COALESCE(description, '')), 'B')))",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS recipes_recipe_search_idx",
+]
+
+
+def run_for_vendor(statements_by_vendor):
+    def run(apps, schema_editor):
+        statements = statements_by_vendor.get(
+            schema_editor.connection.vendor, []
+        )
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor({
+                'sqlite': SQLITE_CREATE,
+                'postgresql': POSTGRES_CREATE,
+            }),
+            run_for_vendor({
+                'sqlite': SQLITE_DROP,
+                'postgresql': POSTGRES_DROP,
+            }),
+        ),
+    ]
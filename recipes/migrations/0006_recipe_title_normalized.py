@@ -0,0 +1,26 @@
+# Generated by Django 4.0.4 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from recipes.titles import backfill_title_normalized
+
+    Recipe = apps.get_model('recipes', 'Recipe')
+    backfill_title_normalized(Recipe)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_recipe_cover_renditions_coverjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='title_normalized',
+            field=models.CharField(editable=False, max_length=255, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
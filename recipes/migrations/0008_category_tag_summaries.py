@@ -0,0 +1,43 @@
+# Generated by Django 4.0.4 on 2026-10-18 20:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from recipes.summaries import (refresh_category_summaries,
+                                   refresh_tag_summaries)
+
+    refresh_category_summaries(apps=apps)
+    refresh_tag_summaries(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tag', '0002_remove_tag_content_type_remove_tag_object_id'),
+        ('recipes', '0007_recipe_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategorySummary',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='recipes.category')),
+                ('name', models.CharField(max_length=65)),
+                ('published_count', models.PositiveIntegerField(default=0)),
+                ('newest_recipe_id', models.BigIntegerField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TagSummary',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='tag.tag')),
+                ('name', models.CharField(max_length=255)),
+                ('slug', models.SlugField(unique=True)),
+                ('published_count', models.PositiveIntegerField(default=0)),
+                ('newest_recipe_id', models.BigIntegerField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
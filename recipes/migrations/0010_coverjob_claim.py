@@ -0,0 +1,23 @@
+# Generated by Django 4.0.4 on 2026-10-18 23:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_recipe_api_v2_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coverjob',
+            name='claim_token',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='coverjob',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
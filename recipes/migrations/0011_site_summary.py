@@ -0,0 +1,32 @@
+# Generated by Django 4.0.4 on 2026-10-18 22:04
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from recipes.summaries import refresh_site_summary
+
+    refresh_site_summary(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0010_coverjob_claim'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('published_count', models.PositiveIntegerField(default=0)),
+                ('newest_recipe_id', models.BigIntegerField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['updated_at'], name='recipe_updated_pub_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -5,13 +5,14 @@ from random import SystemRandom
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import IntegrityError, models, router, transaction
 from django.forms import ValidationError
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from PIL import Image
 from tag.models import Tag
+from utils.strings import normalize_text
 
 
 # Create your models here.
@@ -30,10 +31,22 @@ class RecipeManager(models.Manager):
             'tags'
         )
 
+    def title_is_taken(self, title, exclude_pk=None):
+        qs = self.filter(title_normalized=normalize_text(title))
+
+        if exclude_pk is not None:
+            qs = qs.exclude(pk=exclude_pk)
+
+        return qs.exists()
+
 
 class Recipe(models.Model):
     objects = RecipeManager()
     title = models.CharField(max_length=65, verbose_name=_('Title'))
+    # Título sem caixa, acentos e espaços repetidos (ver normalize_text).
+    # Mantido por save(); o índice único faz a checagem de duplicados.
+    title_normalized = models.CharField(
+        max_length=255, unique=True, null=True, editable=False)
     description = models.CharField(max_length=165)
     slug = models.SlugField(unique=True)
     preparation_time = models.IntegerField()
@@ -54,15 +67,52 @@ class Recipe(models.Model):
 
     tags = models.ManyToManyField(Tag, blank=True, default='')
 
+    # Preenchido pelo worker process_covers (ver recipes/covers.py)
+    cover_renditions = models.JSONField(default=dict, blank=True)
+
     def __str__(self):
         return self.title
 
     def get_absolute_url(self):
         return reverse('recipes:recipe', args=(self.id,))
 
+    def has_cover_renditions(self):
+        return bool(self.cover) and \
+            self.cover_renditions.get('source') == self.cover.name
+
+    def get_cover_srcset(self, image_format='JPEG', build_url=None):
+        """
+        srcset com as URLs relativas ao MEDIA_URL, como os templates usam.
+        A API passa `build_url` para deixá-las absolutas, como a `cover`.
+        """
+        if not self.has_cover_renditions():
+            return ''
+
+        images = self.cover_renditions.get('images', {})
+        build_url = build_url or (lambda url: url)
+
+        return ', '.join(
+            f'{build_url(settings.MEDIA_URL + image["name"])} '
+            f'{image["width"]}w'
+            for image in sorted(images.values(), key=lambda i: i['width'])
+            if image['format'] == image_format
+        )
+
+    @property
+    def cover_srcset(self):
+        return self.get_cover_srcset('JPEG')
+
+    @property
+    def cover_webp_srcset(self):
+        return self.get_cover_srcset('WEBP')
+
     @staticmethod
     def resize_image(image, new_width=800):
         image_full_path = os.path.join(settings.MEDIA_ROOT, image.name)
+        Recipe.resize_image_file(image_full_path, new_width)
+
+    @staticmethod
+    def resize_image_file(image_full_path, new_width=800):
         image_pillow = Image.open(image_full_path)
         original_width, original_height = image_pillow.size
 
@@ -79,7 +129,24 @@ class Recipe(models.Model):
             quality=50
         )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_title = instance.__dict__.get('title')
+        return instance
+
+    def has_title_changed(self):
+        loaded_title = getattr(self, '_loaded_title', None)
+        return self._state.adding or loaded_title is None or \
+            self.title != loaded_title
+
     def save(self, *args, **kwargs):
+        # Receitas com título repetido de antes da coluna (backfill,
+        # importador) ficam com NULL até alguém renomear: só recalcula
+        # quando o título muda
+        if self.has_title_changed():
+            self.title_normalized = normalize_text(self.title)
+
         if not self.slug:
             rand_letters = ''.join(
                 SystemRandom().choices(
@@ -89,27 +156,42 @@ class Recipe(models.Model):
             )
             self.slug = slugify(f'{self.title}-{rand_letters}')
 
-        saved = super().save(*args, **kwargs)
+        needs_renditions = bool(self.cover) and \
+            not self.has_cover_renditions()
+
+        if needs_renditions:
+            self.cover_renditions = {}
 
-        if self.cover:
-            try:
-                self.resize_image(self.cover, 840)
-            except FileNotFoundError:
-                ...
+        # O índice único é quem garante o título livre (clean() e save()
+        # podem correr com outro save); o savepoint mantém a transação de
+        # quem chamou utilizável depois do erro
+        using = kwargs.get('using') or router.db_for_write(
+            Recipe, instance=self)
+        try:
+            with transaction.atomic(using=using):
+                saved = super().save(*args, **kwargs)
+        except IntegrityError as error:
+            if not Recipe.objects.title_is_taken(self.title, self.pk):
+                raise
+            raise ValidationError({
+                'title': ['Found recipes with the same title']
+            }) from error
+
+        self._loaded_title = self.title
+
+        # O redimensionamento acontece fora do request, no worker
+        # process_covers
+        if needs_renditions:
+            CoverJob.enqueue(self)
 
         return saved
 
     def clean(self, *args, **kwargs):
         error_messages = defaultdict(list)
 
-        recipe_from_db = Recipe.objects.filter(
-            title__iexact=self.title
-        ).first()
-
-        if recipe_from_db:
-            if recipe_from_db.pk != self.pk:
-                error_messages['title'].append(
-                    'Found recipes with the same title')
+        if Recipe.objects.title_is_taken(self.title, exclude_pk=self.pk):
+            error_messages['title'].append(
+                'Found recipes with the same title')
 
         if error_messages:
             raise ValidationError(error_messages)
@@ -117,3 +199,129 @@ class Recipe(models.Model):
     class Meta:
         verbose_name = _('Recipe')
         verbose_name_plural = _('Recipes')
+        # Parciais porque o Django compila is_published=True como
+        # WHERE "is_published", que o SQLite só casa com um índice de mesma
+        # condição. Cobrem home/API, categoria e o dashboard do autor; a
+        # checagem fica em test_recipe_query_plans.py
+        indexes = [
+            models.Index(
+                fields=['-id'],
+                condition=models.Q(is_published=True),
+                name='recipe_published_id_idx'),
+            models.Index(
+                fields=['category', '-id'],
+                condition=models.Q(is_published=True),
+                name='recipe_category_pub_id_idx'),
+            models.Index(
+                fields=['author', '-id'],
+                condition=models.Q(is_published=False),
+                name='recipe_author_draft_id_idx'),
+            # Filtros e ordenações da API v2 (ver recipes/filters.py): o id
+            # no fim desempata e é a segunda parte do cursor
+            models.Index(
+                fields=['author', '-id'],
+                condition=models.Q(is_published=True),
+                name='recipe_author_pub_id_idx'),
+            models.Index(
+                fields=['created_at', 'id'],
+                condition=models.Q(is_published=True),
+                name='recipe_created_pub_id_idx'),
+            models.Index(
+                fields=['preparation_time', 'id'],
+                condition=models.Q(is_published=True),
+                name='recipe_prep_time_pub_id_idx'),
+            models.Index(
+                fields=['servings', 'id'],
+                condition=models.Q(is_published=True),
+                name='recipe_servings_pub_id_idx'),
+            # MAX(updated_at) dos validadores de listagem (ETag e
+            # Last-Modified) sai da ponta do índice
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(is_published=True),
+                name='recipe_updated_pub_idx'),
+        ]
+
+
+class CoverJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    recipe = models.ForeignKey(Recipe, on_delete=models.CASCADE)
+    cover_name = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING,
+        db_index=True)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(default='', blank=True)
+    # Quem pegou o job (um token por claim) e quando: ver
+    # recipes.covers.claim_cover_jobs
+    claim_token = models.CharField(
+        max_length=32, default='', blank=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'{self.cover_name} ({self.status})'
+
+    @classmethod
+    def enqueue(cls, recipe):
+        job, _ = cls.objects.get_or_create(
+            recipe=recipe,
+            cover_name=recipe.cover.name,
+            status__in=[cls.STATUS_PENDING, cls.STATUS_PROCESSING],
+            defaults={'status': cls.STATUS_PENDING}
+        )
+        return job
+
+
+class CategorySummary(models.Model):
+    """
+    Contagem de receitas publicadas por categoria, mantida pelos signals
+    de recipes/signals.py e pelo comando reconcile_summaries. Responde à
+    página de categoria (404, título e paginação) com uma busca pela pk.
+    """
+    category = models.OneToOneField(
+        Category, on_delete=models.CASCADE, primary_key=True,
+        related_name='summary')
+    name = models.CharField(max_length=65)
+    published_count = models.PositiveIntegerField(default=0)
+    newest_recipe_id = models.BigIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.name} ({self.published_count})'
+
+
+class TagSummary(models.Model):
+    """O mesmo que CategorySummary, para a página de tag (busca pelo slug)"""
+    tag = models.OneToOneField(
+        Tag, on_delete=models.CASCADE, primary_key=True,
+        related_name='summary')
+    name = models.CharField(max_length=255)
+    slug = models.SlugField(unique=True)
+    published_count = models.PositiveIntegerField(default=0)
+    newest_recipe_id = models.BigIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.name} ({self.published_count})'
+
+
+class SiteSummary(models.Model):
+    """
+    O mesmo que CategorySummary para todas as receitas publicadas, numa
+    linha só (pk=1). Responde ao total da home e da API v1 sem COUNT(*).
+    """
+    published_count = models.PositiveIntegerField(default=0)
+    newest_recipe_id = models.BigIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f'All recipes ({self.published_count})'
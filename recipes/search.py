@@ -0,0 +1,187 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'recipes_recipe_fts'
+# Ids por comando em index_recipes, abaixo do limite de parâmetros do SQLite
+INDEX_CHUNK_SIZE = 500
+TOKEN_REGEX = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(search_term):
+    """
+    >>> tokenize('  Bolo de "cenoura"!  ')
+    ['Bolo', 'de', 'cenoura']
+    """
+    return TOKEN_REGEX.findall(search_term or '')
+
+
+class BaseSearchBackend:
+    """
+    Interface dos backends de busca de receitas.
+
+    search() recebe o queryset já filtrado pela view e devolve o mesmo
+    queryset restrito aos resultados e ordenado por relevância.
+    """
+
+    def search(self, queryset, search_term):
+        raise NotImplementedError
+
+    def index_recipe(self, recipe):
+        ...
+
+    def index_recipes(self, recipe_ids):
+        """Reindexa só as receitas `recipe_ids`, lidas do banco"""
+        ...
+
+    def remove_recipe(self, recipe_id):
+        ...
+
+    def rebuild(self):
+        return 0
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    """Busca por LIKE '%termo%', sem índice. Usada como último recurso."""
+
+    def search(self, queryset, search_term):
+        return queryset.filter(
+            Q(
+                Q(title__icontains=search_term) |
+                Q(description__icontains=search_term)
+            )
+        )
+
+
+class SqliteFTS5SearchBackend(BaseSearchBackend):
+    """
+    Índice FTS5 do SQLite numa tabela virtual cujo rowid é o id da receita.
+    Criado pela migration 0004_recipe_search_index.
+    """
+
+    def make_match_query(self, search_term):
+        """
+        >>> SqliteFTS5SearchBackend().make_match_query('bolo "de" fubá')
+        '"bolo"* "de"* "fubá"*'
+        """
+        return ' '.join(f'"{token}"*' for token in tokenize(search_term))
+
+    def search(self, queryset, search_term):
+        match_query = self.make_match_query(search_term)
+
+        if not match_query:
+            return queryset.none()
+
+        matched_ids = RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match_query,)
+        )
+        rank = RawSQL(
+            f'SELECT bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s '
+            f'AND rowid = {queryset.model._meta.db_table}.id',
+            (match_query,)
+        )
+
+        # bm25() devolve valores menores para os resultados mais relevantes
+        return queryset.filter(
+            id__in=matched_ids
+        ).annotate(
+            search_rank=rank
+        ).order_by('search_rank', '-id')
+
+    def index_recipe(self, recipe):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [recipe.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+                'VALUES (%s, %s, %s)',
+                [recipe.pk, recipe.title, recipe.description]
+            )
+
+    def index_recipes(self, recipe_ids):
+        recipe_ids = list(recipe_ids)
+
+        with connection.cursor() as cursor:
+            for start in range(0, len(recipe_ids), INDEX_CHUNK_SIZE):
+                chunk = recipe_ids[start:start + INDEX_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f'DELETE FROM {FTS_TABLE} '
+                    f'WHERE rowid IN ({placeholders})', chunk
+                )
+                cursor.execute(
+                    f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+                    'SELECT id, title, description FROM recipes_recipe '
+                    f'WHERE id IN ({placeholders})', chunk
+                )
+
+    def remove_recipe(self, recipe_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [recipe_id]
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, description) '
+                'SELECT id, title, description FROM recipes_recipe'
+            )
+            cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+            return cursor.fetchone()[0]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Busca com tsvector/tsquery do Postgres. O índice GIN sobre a mesma
+    expressão é criado pela migration 0004_recipe_search_index, então não
+    há nada para manter nos signals.
+    """
+
+    config = 'simple'
+
+    def search(self, queryset, search_term):
+        from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                                    SearchVector)
+
+        if not tokenize(search_term):
+            return queryset.none()
+
+        vector = SearchVector('title', weight='A', config=self.config) + \
+            SearchVector('description', weight='B', config=self.config)
+        query = SearchQuery(
+            search_term, search_type='websearch', config=self.config
+        )
+
+        return queryset.annotate(
+            search_document=vector,
+            search_rank=SearchRank(vector, query)
+        ).filter(
+            search_document=query
+        ).order_by('-search_rank', '-id')
+
+
+BACKENDS_BY_VENDOR = {
+    'sqlite': 'recipes.search.SqliteFTS5SearchBackend',
+    'postgresql': 'recipes.search.PostgresSearchBackend',
+}
+
+
+def get_search_backend():
+    backend_path = getattr(settings, 'RECIPES_SEARCH_BACKEND', '')
+
+    if not backend_path:
+        backend_path = BACKENDS_BY_VENDOR.get(
+            connection.vendor,
+            'recipes.search.IContainsSearchBackend'
+        )
+
+    return import_string(backend_path)()
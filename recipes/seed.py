@@ -0,0 +1,295 @@
+import itertools
+import random
+
+from authors.models import Profile
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Max
+from django.utils.text import slugify
+from faker import Faker
+from tag.models import Tag
+from utils.strings import normalize_text
+
+from recipes.cache import bump_page_cache_generation
+from recipes.models import Category, Recipe
+from recipes.search import get_search_backend
+from recipes.summaries import rebuild_summaries
+
+SEED_BATCH_SIZE = 5000
+SEED_LOCALE = 'pt_BR'
+SEED_PASSWORD = 'Seed-Passw0rd'
+
+# Expoentes das distribuições de Zipf: poucos autores escrevem a maior
+# parte das receitas e poucas categorias/tags concentram o catálogo
+AUTHOR_SKEW = 1.2
+CATEGORY_SKEW = 0.8
+TAG_SKEW = 1.0
+
+# O Faker não tem lorem em português: textos, títulos e tags usam estas
+# palavras
+WORDS = (
+    'bolo', 'torta', 'pudim', 'mousse', 'brigadeiro', 'frango', 'carne',
+    'peixe', 'camarão', 'arroz', 'feijão', 'farofa', 'salada', 'sopa',
+    'caldo', 'molho', 'massa', 'lasanha', 'nhoque', 'risoto', 'pão',
+    'cenoura', 'chocolate', 'coco', 'limão', 'laranja', 'milho', 'queijo',
+    'tomate', 'cebola', 'alho', 'batata', 'mandioca', 'abóbora', 'banana',
+    'assado', 'grelhado', 'cozido', 'frito', 'recheado', 'cremoso',
+    'caseiro', 'rápido', 'fácil', 'light', 'vegano', 'picante', 'doce',
+    'misture', 'asse', 'cozinhe', 'refogue', 'tempere', 'sirva', 'forno',
+    'panela', 'minutos', 'fogo', 'baixo', 'médio', 'até', 'dourar',
+)
+
+# (valor, peso)
+TAGS_PER_RECIPE = ((0, 10), (1, 20), (2, 30), (3, 25), (4, 10), (5, 5))
+PREPARATION_TIMES = (
+    ((10, 'Minutos'), 15), ((20, 'Minutos'), 25), ((30, 'Minutos'), 25),
+    ((45, 'Minutos'), 15), ((1, 'Hora'), 10), ((2, 'Horas'), 7),
+    ((4, 'Horas'), 3),
+)
+SERVINGS = (
+    ((1, 'Porção'), 5), ((2, 'Porções'), 20), ((4, 'Porções'), 35),
+    ((6, 'Pessoas'), 20), ((8, 'Pessoas'), 12), ((12, 'Fatias'), 8),
+)
+
+
+def zipf_cum_weights(total, skew):
+    """
+    Pesos acumulados de uma distribuição de Zipf, para random.choices.
+
+    >>> [round(w, 2) for w in zipf_cum_weights(3, 1)]
+    [1.0, 1.5, 1.83]
+    """
+    return list(itertools.accumulate(
+        1 / rank ** skew for rank in range(1, total + 1)
+    ))
+
+
+def weighted(rand, choices):
+    values, weights = zip(*choices)
+    return rand.choices(values, weights=weights)[0]
+
+
+def make_rand(seed, kind, batch):
+    """
+    Random e Faker próprios de cada bloco: o bloco N gera sempre as mesmas
+    linhas para a mesma seed, não importa quantos processos dividem o
+    trabalho.
+    """
+    key = f'{seed}:{kind}:{batch}'
+    fake = Faker(SEED_LOCALE)
+    fake.seed_instance(key)
+    return random.Random(key), fake
+
+
+def get_next_number(model):
+    """Números dos novos registros começam depois do maior id existente"""
+    return (model.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+
+
+def iter_batch_ranges(total, batch_size):
+    """
+    >>> list(iter_batch_ranges(5, 2))
+    [(0, range(0, 2)), (1, range(2, 4)), (2, range(4, 5))]
+    """
+    for batch, start in enumerate(range(0, total, batch_size)):
+        yield batch, range(start, min(start + batch_size, total))
+
+
+class Seeder:
+    """
+    Gera dados sintéticos com bulk_create em blocos: autores (com
+    Profile, já que o signal create_profile não roda no bulk_create),
+    categorias, tags e receitas. Nomes, slugs e títulos levam um número
+    que começa depois do maior id existente, para continuarem únicos
+    quando o seed roda mais de uma vez no mesmo banco. Nas receitas esse
+    início é o `offset`, calculado uma vez e repassado aos processos.
+
+    Como no RecipeImporter, o índice de busca (só das receitas criadas),
+    os resumos e o cache de páginas são atualizados uma vez, no final
+    (finish).
+    """
+
+    def __init__(self, seed=0, batch_size=SEED_BATCH_SIZE,
+                 publish_ratio=0.85, offset=None):
+        self.seed = seed
+        self.batch_size = batch_size
+        self.publish_ratio = publish_ratio
+        self.offset = offset
+        self.password = None
+
+    def create_authors(self, total):
+        # Um hash só: o PBKDF2 de cada autor levaria horas
+        self.password = self.password or make_password(SEED_PASSWORD)
+        offset = get_next_number(User)
+
+        for batch, numbers in iter_batch_ranges(total, self.batch_size):
+            rand, fake = make_rand(self.seed, 'authors', batch)
+            users = []
+
+            for number in numbers:
+                username = f'{fake.user_name()}{offset + number}'
+                users.append(User(
+                    username=username[:150],
+                    first_name=fake.first_name(),
+                    last_name=fake.last_name(),
+                    email=f'{username}@{fake.free_email_domain()}',
+                    password=self.password,
+                ))
+
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                usernames = [user.username for user in users]
+                Profile.objects.bulk_create([
+                    Profile(
+                        author_id=author_id,
+                        bio=fake.text(120, ext_word_list=WORDS),
+                    )
+                    for author_id in User.objects.filter(
+                        username__in=usernames
+                    ).values_list('id', flat=True)
+                ])
+
+    def create_categories(self, total):
+        rand, fake = make_rand(self.seed, 'categories', 0)
+        offset = get_next_number(Category)
+        categories = []
+
+        for number in range(offset, offset + total):
+            name = fake.word(ext_word_list=WORDS).capitalize()
+            categories.append(Category(name=f'{name} {number}'))
+
+        Category.objects.bulk_create(categories, batch_size=self.batch_size)
+
+    def create_tags(self, total):
+        rand, fake = make_rand(self.seed, 'tags', 0)
+        offset = get_next_number(Tag)
+        tags = []
+
+        for number in range(offset, offset + total):
+            name = fake.word(ext_word_list=WORDS)
+            tags.append(Tag(name=name, slug=slugify(f'{name}-{number}')))
+
+        Tag.objects.bulk_create(tags, batch_size=self.batch_size)
+
+    def load_choices(self):
+        """Ids (em ordem, do mais popular para o menos) e pesos acumulados"""
+        choices = {}
+
+        for name, queryset, skew in (
+            ('authors', User.objects.all(), AUTHOR_SKEW),
+            ('categories', Category.objects.all(), CATEGORY_SKEW),
+            ('tags', Tag.objects.all(), TAG_SKEW),
+        ):
+            ids = list(
+                queryset.order_by('id').values_list('id', flat=True)
+            )
+            choices[name] = (ids, zipf_cum_weights(len(ids), skew))
+
+        return choices
+
+    def build_recipe(self, number, rand, fake, choices):
+        title = f'{fake.sentence(3, ext_word_list=WORDS)[:-1]} {number}'[-65:]
+        preparation_time, preparation_time_unit = weighted(
+            rand, PREPARATION_TIMES)
+        servings, servings_unit = weighted(rand, SERVINGS)
+        author_ids, author_weights = choices['authors']
+        category_ids, category_weights = choices['categories']
+
+        return Recipe(
+            title=title,
+            title_normalized=normalize_text(title),
+            slug=slugify(title),
+            description=fake.text(160, ext_word_list=WORDS)[:165],
+            preparation_time=preparation_time,
+            preparation_time_unit=preparation_time_unit,
+            servings=servings,
+            servings_unit=servings_unit,
+            preparation_steps='\n\n'.join(
+                fake.paragraphs(rand.randint(2, 8), ext_word_list=WORDS)
+            ),
+            is_published=rand.random() < self.publish_ratio,
+            category_id=rand.choices(
+                category_ids, cum_weights=category_weights
+            )[0] if category_ids else None,
+            author_id=rand.choices(
+                author_ids, cum_weights=author_weights
+            )[0] if author_ids else None,
+            cover_renditions={},
+        )
+
+    def create_recipe_batch(self, batch, numbers, choices):
+        rand, fake = make_rand(self.seed, 'recipes', batch)
+        tag_ids, tag_weights = choices['tags']
+        recipes = []
+        recipe_tags = {}
+
+        for number in numbers:
+            recipe = self.build_recipe(
+                self.offset + number, rand, fake, choices)
+            recipes.append(recipe)
+
+            recipe_tags[recipe.slug] = set()
+
+            if tag_ids:
+                recipe_tags[recipe.slug].update(rand.choices(
+                    tag_ids, cum_weights=tag_weights,
+                    k=weighted(rand, TAGS_PER_RECIPE)
+                ))
+
+        with transaction.atomic():
+            Recipe.objects.bulk_create(recipes)
+
+            if not all(recipe.id for recipe in recipes):
+                ids = dict(
+                    Recipe.objects.filter(
+                        slug__in=recipe_tags.keys()
+                    ).values_list('slug', 'id')
+                )
+                for recipe in recipes:
+                    recipe.id = ids[recipe.slug]
+
+            Through = Recipe.tags.through
+            Through.objects.bulk_create([
+                Through(recipe_id=recipe.id, tag_id=tag_id)
+                for recipe in recipes
+                for tag_id in recipe_tags[recipe.slug]
+            ])
+
+        return len(recipes)
+
+    def create_recipes(self, total, batches=None, on_batch=None):
+        """
+        Cria as receitas dos blocos `batches` (todos, se None). Processos
+        diferentes podem criar blocos diferentes ao mesmo tempo.
+        """
+        if self.offset is None:
+            self.offset = get_next_number(Recipe)
+
+        choices = self.load_choices()
+        created = 0
+
+        for batch, numbers in iter_batch_ranges(total, self.batch_size):
+            if batches is not None and batch not in batches:
+                continue
+
+            created += self.create_recipe_batch(batch, numbers, choices)
+            if on_batch is not None:
+                on_batch(created)
+
+        return created
+
+    def get_created_recipe_ids(self):
+        """
+        Ids das receitas criadas por este seed, inclusive pelos outros
+        processos: o `offset` é o maior id anterior mais um, então todas
+        ficam a partir dele.
+        """
+        return Recipe.objects.filter(
+            id__gte=self.offset
+        ).values_list('id', flat=True)
+
+    def finish(self):
+        get_search_backend().index_recipes(self.get_created_recipe_ids())
+        rebuild_summaries()
+        bump_page_cache_generation()
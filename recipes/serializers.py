@@ -1,8 +1,36 @@
 from authors.validators import AuthorRecipeValidator
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.urls import reverse
 from rest_framework import serializers
 from tag.models import Tag
 
-from .models import Recipe
+from .models import Category, Recipe
+
+# Campos de RecipeSerializer → colunas de Recipe que eles leem. Com
+# ?fields= a consulta carrega só estas (ver RecipeFieldSelection)
+RECIPE_FIELD_COLUMNS = {
+    'id': ('id',),
+    'title': ('title',),
+    'description': ('description',),
+    'category': ('category',),
+    'author': ('author',),
+    'tags': (),
+    'public': ('is_published',),
+    'preparation': ('preparation_time', 'preparation_time_unit'),
+    'tag_objects': (),
+    'tag_links': (),
+    'preparation_time': ('preparation_time',),
+    'preparation_time_unit': ('preparation_time_unit',),
+    'servings': ('servings',),
+    'servings_unit': ('servings_unit',),
+    'preparation_steps': ('preparation_steps',),
+    'cover': ('cover',),
+    'cover_srcset': ('cover', 'cover_renditions'),
+    'cover_webp_srcset': ('cover', 'cover_renditions'),
+}
+TAG_FIELDS = ('tags', 'tag_objects', 'tag_links')
+EXPANDABLE_FIELDS = ('author', 'category', 'tags')
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -11,6 +39,113 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
 
 
+class CategorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ['id', 'name']
+
+
+class RecipeAuthorSerializer(serializers.ModelSerializer):
+    """Autor em ?expand=author (sem o e-mail, a API é pública)"""
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'first_name', 'last_name']
+
+
+def parse_field_list(value, allowed, param):
+    """
+    Nomes separados por vírgula, sem repetição, todos em `allowed`.
+
+    >>> parse_field_list('id, title,id', ('id', 'title'), 'fields')
+    ('id', 'title')
+    >>> parse_field_list('', ('id',), 'expand')
+    ()
+    """
+    names = tuple(dict.fromkeys(
+        name.strip() for name in value.split(',') if name.strip()
+    ))
+    unknown = [name for name in names if name not in allowed]
+
+    if unknown:
+        raise serializers.ValidationError({param: [
+            f'Unknown field(s): {", ".join(unknown)}. '
+            f'Available: {", ".join(allowed)}.'
+        ]})
+
+    return names
+
+
+class RecipeFieldSelection:
+    """
+    Campos pedidos em ?fields= e relações expandidas em ?expand= na API
+    de receitas. Sem os parâmetros a saída é a de sempre.
+
+    Além de cortar a saída, corta a consulta: só carrega as colunas dos
+    campos pedidos, só faz o JOIN de category/author e o prefetch das
+    tags quando algum campo pedido precisa deles.
+    """
+
+    def __init__(self, fields=None, expand=()):
+        self.fields = fields
+        self.expand = tuple(expand)
+
+    @classmethod
+    def from_query_params(cls, query_params):
+        """Lê e valida ?fields= e ?expand= (ValidationError → 400)"""
+        all_fields = RecipeSerializer.Meta.fields
+        fields = query_params.get('fields', '')
+        expand = parse_field_list(
+            query_params.get('expand', ''), EXPANDABLE_FIELDS, 'expand')
+
+        if not fields:
+            return cls(expand=expand)
+
+        # Expandir um campo também o pede
+        fields = set(parse_field_list(fields, all_fields, 'fields'))
+        fields.update(expand)
+        return cls([name for name in all_fields if name in fields], expand)
+
+    @property
+    def field_names(self):
+        if self.fields is None:
+            return list(RecipeSerializer.Meta.fields)
+        return list(self.fields)
+
+    @property
+    def needs_tags(self):
+        return any(name in TAG_FIELDS for name in self.field_names)
+
+    def get_columns(self):
+        columns = {'id'}
+        for name in self.field_names:
+            columns.update(RECIPE_FIELD_COLUMNS[name])
+        return columns
+
+    def prune_queryset(self, queryset, *extra_columns):
+        """
+        `queryset` sem os JOINs, prefetches e colunas que os campos
+        pedidos não usam. `extra_columns` são colunas lidas fora do
+        serializer (a da ordenação, para o cursor)
+        """
+        field_names = self.field_names
+        related = []
+
+        if 'category' in field_names:
+            related.append('category')
+        if 'author' in self.expand:
+            related.append('author')
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+
+        if related:
+            queryset = queryset.select_related(*related)
+        if self.needs_tags:
+            queryset = queryset.prefetch_related('tags')
+
+        return queryset.only(*sorted(self.get_columns() | set(extra_columns)))
+
+
 class RecipeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Recipe
@@ -19,7 +154,8 @@ class RecipeSerializer(serializers.ModelSerializer):
             'category', 'author', 'tags',
             'public', 'preparation', 'tag_objects',
             'tag_links', 'preparation_time', 'preparation_time_unit',
-            'servings', 'servings_unit', 'preparation_steps', 'cover'
+            'servings', 'servings_unit', 'preparation_steps', 'cover',
+            'cover_srcset', 'cover_webp_srcset'
         ]
 
     public = serializers.BooleanField(source='is_published', read_only=True)
@@ -28,6 +164,8 @@ class RecipeSerializer(serializers.ModelSerializer):
         read_only=True
     )
     category = serializers.StringRelatedField(read_only=True)
+    cover_srcset = serializers.SerializerMethodField()
+    cover_webp_srcset = serializers.SerializerMethodField()
     tag_objects = TagSerializer(many=True, source='tags', read_only=True)
 
     tag_links = serializers.HyperlinkedRelatedField(
@@ -37,9 +175,39 @@ class RecipeSerializer(serializers.ModelSerializer):
         read_only=True
     )
 
+    expanded_fields = {
+        'author': lambda: RecipeAuthorSerializer(read_only=True),
+        'category': lambda: CategorySerializer(read_only=True),
+        'tags': lambda: TagSerializer(many=True, read_only=True),
+    }
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
+        for field_name in expand:
+            self.fields[field_name] = self.expanded_fields[field_name]()
+
     def any_method_name(self, recipe):
         return f'{recipe.preparation_time} {recipe.preparation_time_unit}'
 
+    def build_srcset(self, recipe, image_format):
+        # Absolutas como a `cover`, que o ImageField monta com o request
+        request = self.context.get('request')
+        return recipe.get_cover_srcset(
+            image_format,
+            request.build_absolute_uri if request is not None else None
+        )
+
+    def get_cover_srcset(self, recipe):
+        return self.build_srcset(recipe, 'JPEG')
+
+    def get_cover_webp_srcset(self, recipe):
+        return self.build_srcset(recipe, 'WEBP')
+
     def validate(self, attrs):
         if self.instance is not None and attrs.get('servings') is None:
             attrs['servings'] = self.instance.servings
@@ -47,8 +215,168 @@ class RecipeSerializer(serializers.ModelSerializer):
             attrs['preparation_time'] = self.instance.preparation_time
 
         super_validate = super().validate(attrs)
+
+        # Num PATCH sem title/description valida com os valores atuais,
+        # sem gravá-los de novo
+        data = dict(attrs)
+        if self.instance is not None:
+            data.setdefault('title', self.instance.title)
+            data.setdefault('description', self.instance.description)
+
         AuthorRecipeValidator(
-            data=attrs,
+            data=data,
             ErrorClass=serializers.ValidationError,
         )
+
+        title = attrs.get('title')
+        exclude_pk = self.instance.pk if self.instance is not None else None
+        if title and Recipe.objects.title_is_taken(title, exclude_pk):
+            raise serializers.ValidationError({
+                'title': ['Found recipes with the same title']
+            })
+
         return super_validate
+
+    def save(self, **kwargs):
+        # Recipe.save() transforma o título repetido (IntegrityError) em
+        # ValidationError
+        try:
+            return super().save(**kwargs)
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.message_dict)
+
+
+class RecipeReadSerializer:
+    """
+    Caminho rápido, só de leitura, para listagens de RecipeSerializer.
+
+    Gera a mesma saída, mas resolve as URLs e os acessos aos campos uma
+    vez por request em vez de passar pelos fields do DRF em cada receita.
+    Aceita os mesmos `fields`/`expand` de RecipeSerializer e só lê os
+    atributos dos campos pedidos: as tags só precisam estar em
+    prefetch_related se algum campo de tags foi pedido (ver
+    RecipeFieldSelection.prune_queryset).
+    """
+
+    URL_PK_PLACEHOLDER = 987654321987654321
+    plain_fields = (
+        'id', 'title', 'description',
+        'preparation_time', 'preparation_time_unit',
+        'servings', 'servings_unit', 'preparation_steps',
+    )
+
+    def __init__(self, instance=None, many=False, context=None,
+                 fields=None, expand=()):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+        self.selection = RecipeFieldSelection(fields, expand)
+
+    def make_absolute_url_builder(self):
+        request = self.context.get('request')
+
+        if request is None:
+            return lambda url: url
+
+        base_url = request.build_absolute_uri('/')[:-1]
+
+        def build_absolute_url(url):
+            if url.startswith('/'):
+                return base_url + url
+            return request.build_absolute_uri(url)
+
+        return build_absolute_url
+
+    def make_tag_link_builder(self, build_absolute_url):
+        placeholder = str(self.URL_PK_PLACEHOLDER)
+        url = build_absolute_url(
+            reverse('recipes:recipes_api_v2_tag', args=(placeholder,))
+        )
+        prefix, suffix = url.split(placeholder, 1)
+        return lambda pk: f'{prefix}{pk}{suffix}'
+
+    def make_getters(self, build_absolute_url, build_tag_link):
+        """Campo → função (receita, tags) que gera o seu valor"""
+        def get_category(recipe, tags):
+            category = recipe.category
+            if category is None:
+                return None
+            if 'category' in self.selection.expand:
+                return {'id': category.id, 'name': category.name}
+            return str(category)
+
+        def get_author(recipe, tags):
+            if 'author' not in self.selection.expand:
+                return recipe.author_id
+
+            author = recipe.author
+            if author is None:
+                return None
+            return {
+                'id': author.id,
+                'username': author.username,
+                'first_name': author.first_name,
+                'last_name': author.last_name,
+            }
+
+        def get_tag_objects(recipe, tags):
+            return [{'id': tag.id, 'name': tag.name} for tag in tags]
+
+        def get_cover(recipe, tags):
+            cover = recipe.cover
+            return build_absolute_url(cover.url) if cover else None
+
+        def get_cover_srcset(recipe, tags):
+            return recipe.get_cover_srcset('JPEG', build_absolute_url)
+
+        def get_cover_webp_srcset(recipe, tags):
+            return recipe.get_cover_srcset('WEBP', build_absolute_url)
+
+        getters = {
+            field_name: lambda recipe, tags, field_name=field_name:
+                getattr(recipe, field_name)
+            for field_name in self.plain_fields
+        }
+        getters.update({
+            'category': get_category,
+            'author': get_author,
+            'tags': get_tag_objects if 'tags' in self.selection.expand
+            else lambda recipe, tags: [tag.pk for tag in tags],
+            'public': lambda recipe, tags: recipe.is_published,
+            'preparation': lambda recipe, tags:
+                f'{recipe.preparation_time} {recipe.preparation_time_unit}',
+            'tag_objects': get_tag_objects,
+            'tag_links': lambda recipe, tags:
+                [build_tag_link(tag.pk) for tag in tags],
+            'cover': get_cover,
+            'cover_srcset': get_cover_srcset,
+            'cover_webp_srcset': get_cover_webp_srcset,
+        })
+
+        return [
+            (field_name, getters[field_name])
+            for field_name in self.selection.field_names
+        ]
+
+    def to_representation(self, recipe, getters):
+        tags = list(recipe.tags.all()) if self.selection.needs_tags else ()
+
+        return {
+            field_name: get_value(recipe, tags)
+            for field_name, get_value in getters
+        }
+
+    @property
+    def data(self):
+        build_absolute_url = self.make_absolute_url_builder()
+        getters = self.make_getters(
+            build_absolute_url, self.make_tag_link_builder(build_absolute_url)
+        )
+
+        if self.many:
+            return [
+                self.to_representation(recipe, getters)
+                for recipe in self.instance
+            ]
+
+        return self.to_representation(self.instance, getters)
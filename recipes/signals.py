@@ -1,9 +1,17 @@
 import os
 
-from django.db.models.signals import pre_delete, pre_save
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
 from django.dispatch import receiver
+from tag.models import Tag
 
-from recipes.models import Recipe
+from recipes.cache import (PAGE_CACHE_LIST_SCOPE, bump_page_cache_scopes,
+                           get_recipe_page_scopes, invalidate_recipe_cards)
+from recipes.covers import delete_renditions
+from recipes.models import Category, CategorySummary, Recipe, TagSummary
+from recipes.search import get_search_backend
+from recipes.summaries import (adjust_category_summary, adjust_site_summary,
+                               adjust_tag_summary)
 
 
 def delete_cover(instance):
@@ -12,6 +20,8 @@ def delete_cover(instance):
     except (ValueError, FileNotFoundError):
         ...
 
+    delete_renditions(instance.cover_renditions)
+
 
 @receiver(pre_delete, sender=Recipe)
 def recipe_cover_delete(sender, instance, *args, **kwargs):
@@ -32,3 +42,264 @@ def recipe_cover_update(sender, instance, *args, **kwargs):
 
     if is_new_cover:
         delete_cover(old_instance)
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_search_index_update(sender, instance, *args, **kwargs):
+    get_search_backend().index_recipe(instance)
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_search_index_delete(sender, instance, *args, **kwargs):
+    get_search_backend().remove_recipe(instance.pk)
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def recipe_card_cache_invalidate(sender, instance, *args, **kwargs):
+    invalidate_recipe_cards([instance.pk])
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_card_cache_invalidate(sender, instance, action, pk_set,
+                                      reverse, *args, **kwargs):
+    if not action.startswith('post_'):
+        return
+
+    if not reverse:
+        invalidate_recipe_cards([instance.pk])
+    elif pk_set:
+        invalidate_recipe_cards(pk_set)
+    else:
+        invalidate_recipe_cards(
+            instance.recipe_set.values_list('pk', flat=True)
+        )
+
+
+@receiver(post_save, sender=Category)
+def category_card_cache_invalidate(sender, instance, *args, **kwargs):
+    invalidate_recipe_cards(
+        instance.recipe_set.values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save, sender=Tag)
+def tag_card_cache_invalidate(sender, instance, *args, **kwargs):
+    invalidate_recipe_cards(
+        instance.recipe_set.values_list('pk', flat=True)
+    )
+
+
+@receiver(pre_save, sender=Recipe)
+@receiver(pre_delete, sender=Recipe)
+def recipe_summary_snapshot(sender, instance, *args, **kwargs):
+    # Categoria e publicação antes do save/delete, para saber quais
+    # resumos mudam
+    instance._summary_old_state = Recipe.objects.filter(
+        pk=instance.pk
+    ).values_list('category_id', 'is_published').first()
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_summary_update(sender, instance, created, *args, **kwargs):
+    old_category_id, was_published = getattr(
+        instance, '_summary_old_state', None
+    ) or (None, False)
+
+    is_published = instance.is_published
+    category_changed = old_category_id != instance.category_id
+
+    if was_published and (not is_published or category_changed):
+        adjust_category_summary(old_category_id, [instance.pk], -1)
+    if is_published and (not was_published or category_changed):
+        adjust_category_summary(instance.category_id, [instance.pk], 1)
+
+    if was_published != is_published:
+        adjust_site_summary([instance.pk], 1 if is_published else -1)
+
+    if was_published != is_published and not created:
+        delta = 1 if is_published else -1
+        for tag_id in instance.tags.values_list('pk', flat=True):
+            adjust_tag_summary(tag_id, [instance.pk], delta)
+
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_summary_delete_snapshot(sender, instance, *args, **kwargs):
+    # As linhas de tags somem antes do post_delete
+    instance._summary_tag_ids = list(
+        instance.tags.values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_summary_delete(sender, instance, *args, **kwargs):
+    category_id, was_published = getattr(
+        instance, '_summary_old_state', None
+    ) or (None, False)
+
+    if not was_published:
+        return
+
+    adjust_site_summary([instance.pk], -1)
+    adjust_category_summary(category_id, [instance.pk], -1)
+    for tag_id in getattr(instance, '_summary_tag_ids', []):
+        adjust_tag_summary(tag_id, [instance.pk], -1)
+
+
+def get_published_tag_links(instance, reverse, pk_set):
+    """
+    Ligações receita-tag do m2m_changed que contam nos resumos: ids das
+    tags (receita publicada) ou, do lado reverso, das receitas publicadas
+    """
+    if reverse:
+        linked = instance.recipe_set.filter(is_published=True)
+    elif instance.is_published:
+        linked = instance.tags.all()
+    else:
+        return []
+
+    if pk_set is not None:
+        linked = linked.filter(pk__in=pk_set)
+
+    return list(linked.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_summary_update(sender, instance, action, pk_set, reverse,
+                               *args, **kwargs):
+    # remove/clear: só o que estava ligado antes conta
+    if action in ('pre_remove', 'pre_clear'):
+        instance._summary_tag_links = get_published_tag_links(
+            instance, reverse, pk_set)
+        return
+
+    if action == 'post_add':
+        links, delta = get_published_tag_links(instance, reverse, pk_set), 1
+    elif action in ('post_remove', 'post_clear'):
+        links, delta = getattr(instance, '_summary_tag_links', []), -1
+    else:
+        return
+
+    if reverse:
+        adjust_tag_summary(instance.pk, links, delta * len(links))
+        return
+
+    for tag_id in links:
+        adjust_tag_summary(tag_id, [instance.pk], delta)
+
+
+@receiver(post_save, sender=Category)
+def category_summary_update(sender, instance, *args, **kwargs):
+    CategorySummary.objects.update_or_create(
+        pk=instance.pk, defaults={'name': instance.name})
+
+
+@receiver(post_save, sender=Tag)
+def tag_summary_update(sender, instance, *args, **kwargs):
+    TagSummary.objects.update_or_create(
+        pk=instance.pk,
+        defaults={'name': instance.name, 'slug': instance.slug}
+    )
+
+
+# Cache de páginas: cada página lê a geração do seu escopo ('list',
+# 'recipe:<pk>', 'category:<id>', 'tag:<slug>'). Os handlers abaixo
+# trocam só as gerações das páginas em que a mudança aparece.
+
+@receiver(post_save, sender=Recipe)
+def recipe_page_cache_update(sender, instance, created, *args, **kwargs):
+    old_category_id, was_published = getattr(
+        instance, '_summary_old_state', None
+    ) or (None, False)
+
+    # Rascunho continua fora de todas as páginas em cache
+    if not was_published and not instance.is_published:
+        return
+
+    scopes = {
+        PAGE_CACHE_LIST_SCOPE,
+        f'recipe:{instance.pk}',
+        f'category:{instance.category_id}',
+        f'category:{old_category_id}',
+    }
+
+    if not created:
+        scopes.update(
+            f'tag:{slug}'
+            for slug in instance.tags.values_list('slug', flat=True)
+        )
+
+    bump_page_cache_scopes(scopes)
+
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_page_cache_delete_snapshot(sender, instance, *args, **kwargs):
+    instance._page_cache_scopes = get_recipe_page_scopes([instance.pk])
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_page_cache_delete(sender, instance, *args, **kwargs):
+    bump_page_cache_scopes(getattr(instance, '_page_cache_scopes', ()))
+
+
+def get_tag_link_page_scopes(instance, reverse, pk_set):
+    """Escopos das páginas que mostram as ligações receita-tag mudadas"""
+    if reverse:
+        recipe_ids = pk_set if pk_set is not None else \
+            instance.recipe_set.values_list('pk', flat=True)
+        scopes = get_recipe_page_scopes(recipe_ids)
+        return scopes | {f'tag:{instance.slug}'} if scopes else scopes
+
+    if not instance.is_published:
+        return set()
+
+    tags = instance.tags.all() if pk_set is None else \
+        Tag.objects.filter(pk__in=pk_set)
+
+    return {
+        PAGE_CACHE_LIST_SCOPE,
+        f'recipe:{instance.pk}',
+        f'category:{instance.category_id}',
+        *(f'tag:{slug}' for slug in tags.values_list('slug', flat=True)),
+    }
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_page_cache_update(sender, instance, action, pk_set, reverse,
+                                  *args, **kwargs):
+    if action in ('pre_remove', 'pre_clear'):
+        instance._page_cache_scopes = get_tag_link_page_scopes(
+            instance, reverse, pk_set)
+    elif action == 'post_add':
+        bump_page_cache_scopes(
+            get_tag_link_page_scopes(instance, reverse, pk_set))
+    elif action in ('post_remove', 'post_clear'):
+        bump_page_cache_scopes(getattr(instance, '_page_cache_scopes', ()))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_page_cache_update(sender, instance, *args, **kwargs):
+    bump_page_cache_scopes(
+        {f'category:{instance.pk}'} | get_recipe_page_scopes(
+            instance.recipe_set.values_list('pk', flat=True))
+    )
+
+
+@receiver(pre_save, sender=Tag)
+def tag_page_cache_snapshot(sender, instance, *args, **kwargs):
+    # Slug antes do save: a página do slug antigo também sai do cache
+    instance._page_cache_old_slug = Tag.objects.filter(
+        pk=instance.pk
+    ).values_list('slug', flat=True).first()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def tag_page_cache_update(sender, instance, *args, **kwargs):
+    slugs = {instance.slug, getattr(instance, '_page_cache_old_slug', None)}
+
+    bump_page_cache_scopes(
+        {f'tag:{slug}' for slug in slugs if slug} | get_recipe_page_scopes(
+            instance.recipe_set.values_list('pk', flat=True))
+    )
@@ -0,0 +1,214 @@
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import (BigIntegerField, Count, F, Max, Q, Subquery,
+                              Value)
+from django.db.models.functions import Coalesce, Greatest
+
+PUBLISHED = Q(recipe__is_published=True)
+SITE_SUMMARY_PK = 1
+
+
+def count_published(queryset):
+    return queryset.annotate(
+        published_count=Count('recipe', filter=PUBLISHED),
+        newest_recipe_id=Max('recipe__id', filter=PUBLISHED),
+    )
+
+
+def save_summaries(summary_model, summaries, pks=None):
+    """
+    Grava as linhas recalculadas. Sem `pks` troca a tabela inteira
+    (reconcile_summaries, migration); com `pks` atualiza só essas linhas
+    no lugar, sem apagar, para não correr com os UPDATEs de
+    adjust_summary.
+    """
+    if pks is None:
+        with transaction.atomic():
+            summary_model.objects.all().delete()
+            summary_model.objects.bulk_create(summaries)
+        return
+
+    fields = [
+        field.attname for field in summary_model._meta.concrete_fields
+        if not field.primary_key
+    ]
+    for summary in summaries:
+        summary_model.objects.update_or_create(
+            pk=summary.pk,
+            defaults={field: getattr(summary, field) for field in fields}
+        )
+
+
+def refresh_category_summaries(category_ids=None, apps=global_apps):
+    """
+    Recalcula as linhas de CategorySummary das categorias informadas
+    (todas quando category_ids é None) com uma consulta agregada. É a
+    recontagem completa: os signals usam adjust_category_summary.
+
+    `apps` permite rodar com os models históricos dentro de migrations.
+    """
+    Category = apps.get_model('recipes', 'Category')
+    CategorySummary = apps.get_model('recipes', 'CategorySummary')
+
+    categories = Category.objects.all()
+    if category_ids is not None:
+        category_ids = {pk for pk in category_ids if pk is not None}
+        if not category_ids:
+            return 0
+        categories = categories.filter(pk__in=category_ids)
+
+    summaries = [
+        CategorySummary(
+            category_id=category.pk,
+            name=category.name,
+            published_count=category.published_count,
+            newest_recipe_id=category.newest_recipe_id,
+        )
+        for category in count_published(categories).order_by()
+    ]
+
+    save_summaries(CategorySummary, summaries, category_ids)
+    return len(summaries)
+
+
+def refresh_tag_summaries(tag_ids=None, apps=global_apps):
+    """O mesmo que refresh_category_summaries, para TagSummary"""
+    Tag = apps.get_model('tag', 'Tag')
+    TagSummary = apps.get_model('recipes', 'TagSummary')
+
+    tags = Tag.objects.all()
+    if tag_ids is not None:
+        tag_ids = {pk for pk in tag_ids if pk is not None}
+        if not tag_ids:
+            return 0
+        tags = tags.filter(pk__in=tag_ids)
+
+    summaries = [
+        TagSummary(
+            tag_id=tag.pk,
+            name=tag.name,
+            slug=tag.slug,
+            published_count=tag.published_count,
+            newest_recipe_id=tag.newest_recipe_id,
+        )
+        for tag in count_published(tags).order_by()
+    ]
+
+    save_summaries(TagSummary, summaries, tag_ids)
+    return len(summaries)
+
+
+def refresh_site_summary(pks=None, apps=global_apps):
+    """
+    Recalcula a linha única de SiteSummary. `pks` só existe para servir de
+    `refresh` em adjust_summary: a linha é sempre a mesma.
+    """
+    Recipe = apps.get_model('recipes', 'Recipe')
+    SiteSummary = apps.get_model('recipes', 'SiteSummary')
+
+    data = Recipe.objects.filter(is_published=True).aggregate(
+        published_count=Count('id'),
+        newest_recipe_id=Max('id'),
+    )
+    SiteSummary.objects.update_or_create(pk=SITE_SUMMARY_PK, defaults=data)
+    return 1
+
+
+def get_published_count():
+    """Total de receitas publicadas, lido da linha de SiteSummary"""
+    SiteSummary = global_apps.get_model('recipes', 'SiteSummary')
+    rows = SiteSummary.objects.filter(pk=SITE_SUMMARY_PK)
+    count = rows.values_list('published_count', flat=True).first()
+
+    if count is None:
+        refresh_site_summary()
+        count = rows.values_list('published_count', flat=True).first()
+
+    return count
+
+
+def adjust_summary(summary_model, pk, recipe_ids, delta, published_recipes,
+                   refresh):
+    """
+    Soma `delta` ao published_count da linha `pk` no lugar (UPDATE com
+    F(), sem recontar nem disputar a linha com outro save). `recipe_ids`
+    são as receitas publicadas que entraram ou saíram.
+
+    newest_recipe_id só é recalculado quando a mais nova sai, com um
+    MAX(id) sobre `published_recipes` que o índice responde. Linha
+    faltando ou contagem que ficaria negativa (resumo fora de sincronia)
+    recalculam só essa linha com `refresh`.
+    """
+    if pk is None or not recipe_ids or not delta:
+        return
+
+    rows = summary_model.objects.filter(pk=pk)
+
+    if delta > 0:
+        updated = rows.update(
+            published_count=F('published_count') + delta,
+            newest_recipe_id=Greatest(
+                Coalesce('newest_recipe_id', Value(0)),
+                Value(max(recipe_ids)),
+                output_field=BigIntegerField(),
+            ),
+        )
+    else:
+        updated = rows.filter(published_count__gte=-delta).update(
+            published_count=F('published_count') + delta)
+
+        if updated:
+            rows.filter(newest_recipe_id__in=recipe_ids).update(
+                newest_recipe_id=Subquery(
+                    published_recipes.order_by('-id').values('id')[:1]
+                )
+            )
+
+    if not updated:
+        refresh([pk])
+
+
+def adjust_category_summary(category_id, recipe_ids, delta):
+    Recipe = global_apps.get_model('recipes', 'Recipe')
+    adjust_summary(
+        global_apps.get_model('recipes', 'CategorySummary'),
+        category_id, recipe_ids, delta,
+        Recipe.objects.filter(category_id=category_id, is_published=True),
+        refresh_category_summaries,
+    )
+
+
+def adjust_tag_summary(tag_id, recipe_ids, delta):
+    Recipe = global_apps.get_model('recipes', 'Recipe')
+    adjust_summary(
+        global_apps.get_model('recipes', 'TagSummary'),
+        tag_id, recipe_ids, delta,
+        Recipe.objects.filter(tags=tag_id, is_published=True),
+        refresh_tag_summaries,
+    )
+
+
+def adjust_site_summary(recipe_ids, delta):
+    Recipe = global_apps.get_model('recipes', 'Recipe')
+    adjust_summary(
+        global_apps.get_model('recipes', 'SiteSummary'),
+        SITE_SUMMARY_PK, recipe_ids, delta,
+        Recipe.objects.filter(is_published=True),
+        refresh_site_summary,
+    )
+
+
+def get_summary_rows(apps=global_apps):
+    """Estado atual das tabelas, para o reconcile_summaries comparar"""
+    rows = {}
+    for model_name in ('CategorySummary', 'TagSummary', 'SiteSummary'):
+        model = apps.get_model('recipes', model_name)
+        for row in model.objects.values():
+            rows[(model_name, row.pop(model._meta.pk.attname))] = row
+    return rows
+
+
+def rebuild_summaries(apps=global_apps):
+    refresh_category_summaries(apps=apps)
+    refresh_tag_summaries(apps=apps)
+    refresh_site_summary(apps=apps)
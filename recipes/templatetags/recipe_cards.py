@@ -0,0 +1,24 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from recipes.cache import RECIPE_CARD_TEMPLATE, render_recipe_card
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def recipe_card(context, recipe):
+    """
+    Substitui {% include 'recipes/partials/recipe.html' %} usando o cache
+    de fragmentos de recipes.cache.
+    """
+    mode = 'detail' if context.get('is_detail_page') is True else 'list'
+
+    def render():
+        card_template = context.template.engine.get_template(
+            RECIPE_CARD_TEMPLATE
+        )
+        with context.push(recipe=recipe):
+            return card_template.render(context)
+
+    return mark_safe(render_recipe_card(recipe, mode, render))
@@ -1,6 +1,8 @@
 from unittest.mock import patch
 
+from django.core.cache import cache
 from django.urls import reverse
+from recipes.models import Recipe
 from recipes.tests.teste_recipe_base import RecipeMixin
 from rest_framework import test
 
@@ -46,6 +48,11 @@ class RecipeAPIv2TestMixin(RecipeMixin):
 
 
 class RecipeAPIv2Test(test.APITestCase, RecipeAPIv2TestMixin):
+    def setUp(self):
+        # Os buckets do AuthThrottleMiddleware ficam no cache
+        cache.clear()
+        return super().setUp()
+
     def test_recipe_api_list_returns_status_code_200(self):
         response = self.get_recipe_api_list()
 
@@ -150,6 +157,53 @@ class RecipeAPIv2Test(test.APITestCase, RecipeAPIv2TestMixin):
             wanted_new_title
         )
 
+    def test_recipe_api_patch_without_title_keeps_a_duplicate_title(self):
+        access_data = self.get_auth_data()
+        recipe = self.make_recipe(author_data={'username': 'other'})
+        duplicate = self.make_recipe(
+            title='Duplicate title', slug='duplicate-title',
+            author_data={'username': 'another'},
+        )
+        # Duplicata de antes do índice único, deixada NULL pelo backfill
+        Recipe.objects.filter(pk=duplicate.pk).update(
+            title=recipe.title, title_normalized=None,
+            author=access_data.get('user'),
+        )
+
+        response = self.client.patch(
+            reverse('recipes:recipe-api-detail', args=(duplicate.id,)),
+            data={'servings': 3},
+            HTTP_AUTHORIZATION=f'Bearer {access_data.get("jwt_access_token")}'
+        )
+
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data.get('servings'), 3)
+        duplicate.refresh_from_db()
+        self.assertIsNone(duplicate.title_normalized)
+
+    def test_recipe_api_patch_to_a_taken_title_is_a_validation_error(self):
+        access_data = self.get_auth_data()
+        taken = self.make_recipe(author_data={'username': 'other'})
+        recipe = self.make_recipe(
+            title='Another title', slug='another-title',
+            author_data={'username': 'another'},
+        )
+        Recipe.objects.filter(pk=recipe.pk).update(
+            author=access_data.get('user'))
+
+        # Livre no validate(), gravado por outra request antes do save()
+        with patch('recipes.models.RecipeManager.title_is_taken',
+                   side_effect=[False, True]):
+            response = self.client.patch(
+                reverse('recipes:recipe-api-detail', args=(recipe.id,)),
+                data={'title': taken.title},
+                HTTP_AUTHORIZATION=(
+                    f'Bearer {access_data.get("jwt_access_token")}')
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.data)
+
     def test_recipe_api_list_logged_user_cant_update_a_recipe_owned_by_another_user(self):  # noqa
         # Arrange
         recipe = self.make_recipe()
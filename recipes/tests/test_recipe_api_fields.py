@@ -0,0 +1,154 @@
+import json
+from unittest.mock import patch
+
+from django.urls import reverse
+from parameterized import parameterized
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+from tag.models import Tag
+from utils.query_budget import QueryRecorder
+
+from recipes.models import Recipe
+from recipes.serializers import (RecipeFieldSelection, RecipeReadSerializer,
+                                 RecipeSerializer)
+
+from .teste_recipe_base import RecipeTestBase
+
+
+class RecipeAPIv2FieldsTest(RecipeTestBase):
+
+    def setUp(self):
+        super().setUp()
+        self.recipes = self.criar_recipes_em_lote(3)
+        tags = [Tag.objects.create(name=f'Tag {i}') for i in range(2)]
+        self.recipes[0].tags.set(tags)
+        self.recipes[1].category = None
+        self.recipes[1].save()
+        self.list_url = reverse('recipes:recipe-api-list')
+        self.detail_url = reverse(
+            'recipes:recipe-api-detail', args=(self.recipes[0].pk,))
+
+    def get(self, url):
+        with QueryRecorder() as recorder:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), [query['sql'] for query in recorder.queries]
+
+    def serialize(self, serializer_class, query):
+        request = APIRequestFactory().get(self.list_url + query)
+        selection = RecipeFieldSelection.from_query_params(request.GET)
+        data = serializer_class(
+            Recipe.objects.get_published().order_by('-id'),
+            many=True,
+            context={'request': request},
+            fields=selection.fields,
+            expand=selection.expand,
+        ).data
+        return json.loads(json.dumps(data))
+
+    def test_fields_limits_the_output_in_list_and_detail(self):
+        data, _ = self.get(self.list_url + '?fields=title,id')
+        detail, _ = self.get(self.detail_url + '?fields=title,id')
+
+        self.assertEqual(
+            [list(recipe) for recipe in data['results']],
+            [['id', 'title']] * 3
+        )
+        self.assertEqual(
+            detail, {'id': self.recipes[0].id, 'title': self.recipes[0].title}
+        )
+
+    @parameterized.expand([[''], ['?fields=id,title,cover']])
+    def test_selected_fields_do_not_load_tags_or_heavy_columns(self, query):
+        for url in (self.list_url, self.detail_url):
+            _, queries = self.get(url + query)
+            sql = ' '.join(queries)
+
+            if query:
+                self.assertNotIn('tag', sql)
+                self.assertNotIn('preparation_steps', sql)
+                self.assertNotIn('JOIN', sql)
+            else:
+                self.assertIn('recipes_recipe_tags', sql)
+                self.assertIn('preparation_steps', sql)
+
+    def test_fields_without_tags_save_the_prefetch_query(self):
+        _, all_queries = self.get(self.list_url)
+        _, queries = self.get(self.list_url + '?fields=id,title')
+
+        self.assertEqual(len(queries), len(all_queries) - 1)
+
+    def test_expand_implies_the_field_and_joins_the_relation(self):
+        data, queries = self.get(self.detail_url + '?fields=id&expand=author')
+        author = self.recipes[0].author
+
+        self.assertEqual(data, {'id': self.recipes[0].id, 'author': {
+            'id': author.id,
+            'username': author.username,
+            'first_name': author.first_name,
+            'last_name': author.last_name,
+        }})
+        self.assertIn('auth_user', ' '.join(queries))
+
+    @parameterized.expand([
+        [''],
+        ['?fields=id,tags,tag_links,cover_srcset'],
+        ['?expand=author,category,tags'],
+        ['?fields=title&expand=category'],
+    ])
+    def test_read_serializer_output_matches_recipe_serializer(self, query):
+        self.assertEqual(
+            self.serialize(RecipeSerializer, query),
+            self.serialize(RecipeReadSerializer, query)
+        )
+
+    def test_list_uses_the_same_output_as_detail(self):
+        query = '?fields=id,category,preparation&expand=tags'
+        data, _ = self.get(self.list_url + query)
+        detail, _ = self.get(self.detail_url + query)
+
+        self.assertIn(detail, data['results'])
+
+    @patch('recipes.views.api.RecipeAPIV2Pagination.page_size', new=2)
+    def test_cursor_works_without_the_ordering_column_in_fields(self):
+        ids = []
+        url = self.list_url + '?fields=id&ordering=servings'
+
+        while url:
+            data, _ = self.get(url)
+            ids.extend(recipe['id'] for recipe in data['results'])
+            url = data['next']
+
+        self.assertEqual(sorted(ids), sorted(r.id for r in self.recipes))
+
+    def test_etag_depends_on_the_selected_fields(self):
+        etags = {
+            self.client.get(self.detail_url + query)['ETag']
+            for query in ('', '?fields=id', '?fields=id,title')
+        }
+
+        self.assertEqual(len(etags), 3)
+
+    @parameterized.expand([
+        ['?fields=id,password'], ['?expand=public'], ['?expand=nope'],
+    ])
+    def test_unknown_fields_are_refused(self, query):
+        for url in (self.list_url, self.detail_url):
+            response = self.client.get(url + query)
+
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('Unknown field(s)', response.content.decode())
+
+    def test_fields_are_ignored_on_writes(self):
+        token = RefreshToken.for_user(self.recipes[0].author).access_token
+
+        response = self.client.patch(
+            self.detail_url + '?fields=id',
+            data={'title': 'A patched title', 'servings': 7},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('servings', response.json())
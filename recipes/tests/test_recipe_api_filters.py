@@ -0,0 +1,206 @@
+from datetime import timedelta
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from parameterized import parameterized
+from tag.models import Tag
+
+from recipes.models import Recipe
+
+from .teste_recipe_base import RecipeTestBase
+
+
+class RecipeAPIv2FiltersTest(RecipeTestBase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('recipes:recipe-api-list')
+        self.recipes = []
+
+        for i in range(6):
+            self.recipes.append(self.make_recipe(
+                title=f'Filter recipe {i}',
+                slug=f'filter-recipe-{i}',
+                preparation_time=(i + 1) * 10,
+                servings=i % 3,
+                author_data={'username': f'filter-author-{i}'},
+            ))
+
+    def get_ids(self, query=''):
+        response = self.client.get(self.url + query)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [recipe['id'] for recipe in response.data['results']]
+
+    def walk(self, query):
+        """Ids de todas as páginas, seguindo os links next"""
+        ids = []
+        url = self.url + query
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.data)
+            ids.extend(recipe['id'] for recipe in response.data['results'])
+            url = response.data['next']
+
+        return ids
+
+    def test_default_ordering_is_newest_first(self):
+        self.assertEqual(
+            self.get_ids(),
+            [recipe.id for recipe in reversed(self.recipes)][:5]
+        )
+
+    def test_filter_by_tag_slug(self):
+        tag = Tag.objects.create(name='Filter tag')
+        self.recipes[1].tags.add(tag)
+        self.recipes[4].tags.add(tag)
+
+        self.assertEqual(
+            self.get_ids(f'?tag={tag.slug}'),
+            [self.recipes[4].id, self.recipes[1].id]
+        )
+
+    @patch('recipes.views.api.RecipeAPIV2Pagination.page_size', new=1)
+    def test_tag_pages_follow_the_cursor_both_ways(self):
+        tag = Tag.objects.create(name='Paged tag')
+        tagged = [self.recipes[i] for i in (0, 2, 3, 5)]
+        for recipe in tagged:
+            recipe.tags.add(tag)
+
+        self.assertEqual(
+            self.walk(f'?tag={tag.slug}'),
+            [recipe.id for recipe in reversed(tagged)]
+        )
+
+        second_page = self.client.get(
+            self.client.get(self.url + f'?tag={tag.slug}').data['next'])
+        first_page = self.client.get(second_page.data['previous'])
+        self.assertEqual(
+            [recipe['id'] for recipe in first_page.data['results']],
+            [self.recipes[5].id]
+        )
+
+    def test_filter_by_author(self):
+        recipe = self.recipes[2]
+
+        self.assertEqual(
+            self.get_ids(f'?author={recipe.author_id}'), [recipe.id])
+
+    def test_filter_by_servings(self):
+        self.assertEqual(
+            self.get_ids('?servings=1'),
+            [self.recipes[4].id, self.recipes[1].id]
+        )
+
+    def test_filter_by_preparation_time_range(self):
+        ids = self.get_ids(
+            '?preparation_time_min=20&preparation_time_max=40'
+            '&ordering=preparation_time'
+        )
+
+        self.assertEqual(ids, [recipe.id for recipe in self.recipes[1:4]])
+
+    def test_filter_by_created_at_range(self):
+        now = timezone.now()
+        old = self.recipes[0]
+        Recipe.objects.filter(pk=old.pk).update(
+            created_at=now - timedelta(days=10))
+
+        ids = self.walk(
+            '?ordering=-created_at&created_before=' +
+            (now - timedelta(days=1)).isoformat().replace('+', '%2B')
+        )
+
+        self.assertEqual(ids, [old.id])
+
+    @parameterized.expand([
+        ['preparation_time'], ['-preparation_time'], ['servings'],
+        ['-servings'], ['created_at'], ['-created_at'], ['id'], ['-id'],
+    ])
+    def test_cursor_walk_returns_every_recipe_once_in_order(self, ordering):
+        column = ordering.lstrip('-')
+        expected = sorted(
+            self.recipes,
+            key=lambda recipe: (getattr(recipe, column), recipe.id),
+            reverse=ordering.startswith('-')
+        )
+
+        self.assertEqual(
+            self.walk(f'?ordering={ordering}'),
+            [recipe.id for recipe in expected]
+        )
+
+    def test_previous_link_goes_back_to_the_first_page(self):
+        first_page = self.client.get(self.url + '?ordering=servings')
+        second_page = self.client.get(first_page.data['next'])
+
+        back = self.client.get(second_page.data['previous'])
+
+        self.assertEqual(back.data['results'], first_page.data['results'])
+        self.assertIsNone(back.data['previous'])
+
+    def test_new_recipe_does_not_shift_the_next_page(self):
+        first_page = self.client.get(self.url)
+        self.make_recipe(
+            title='Newest', slug='newest',
+            author_data={'username': 'newest-author'},
+        )
+
+        second_page = self.client.get(first_page.data['next'])
+
+        self.assertEqual(
+            [recipe['id'] for recipe in second_page.data['results']],
+            [self.recipes[0].id]
+        )
+
+    def test_pagination_does_not_count(self):
+        first_page = self.client.get(self.url)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(first_page.data['next'])
+
+        self.assertFalse([
+            query['sql'] for query in context.captured_queries
+            if 'COUNT(' in query['sql']
+        ])
+
+    @patch('recipes.views.api.RecipeAPIV2Pagination.page_size', new=2)
+    def test_page_has_no_count_and_links(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            list(response.data), ['next', 'previous', 'results'])
+        self.assertEqual(len(response.data['results']), 2)
+
+    @parameterized.expand([
+        ['?category_id=1&ordering=created_at'],
+        ['?tag=a-tag&author=1'],
+        ['?created_after=2020-01-01T00:00:00Z'],
+        ['?preparation_time_min=10&ordering=servings'],
+    ])
+    def test_combination_without_index_is_refused(self, query):
+        response = self.client.get(self.url + query)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            'No index serves', response.data['non_field_errors'][0])
+
+    @parameterized.expand([
+        ['?author=abc'], ['?ordering=title'], ['?cursor=invalid'],
+    ])
+    def test_invalid_parameters_are_refused(self, query):
+        response = self.client.get(self.url + query)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_of_another_ordering_is_refused(self):
+        first_page = self.client.get(self.url + '?ordering=servings')
+        query = parse_qs(urlsplit(first_page.data['next']).query)
+
+        response = self.client.get(self.url, {'cursor': query['cursor'][0]})
+
+        self.assertEqual(response.status_code, 400)
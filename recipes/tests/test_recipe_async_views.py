@@ -0,0 +1,91 @@
+import json
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import AsyncRequestFactory
+from django.urls import reverse
+from recipes.views import asynchronous
+
+from .teste_recipe_base import RecipeTestBase
+
+
+class RecipeAsyncViewsTest(RecipeTestBase):
+
+    def make_request(self, path='/', **meta):
+        request = AsyncRequestFactory().get(path)
+        request.META.update(meta)
+        request.user = AnonymousUser()
+        return request
+
+    async def make_recipe_async(self, **kwargs):
+        return await sync_to_async(self.make_recipe)(**kwargs)
+
+    async def test_async_home_lists_published_recipes(self):
+        await self.make_recipe_async(title='Async home recipe')
+
+        response = await asynchronous.recipe_list_home(self.make_request())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Async home recipe', response.content.decode('utf-8'))
+
+    async def test_async_search_requires_a_term(self):
+        with self.assertRaises(Http404):
+            await asynchronous.recipe_list_search(self.make_request())
+
+    async def test_async_search_keeps_rank_order_with_keyset(self):
+        await self.make_recipe_async(
+            title='Chocolate pie', slug='in-title',
+            author_data={'username': 'one'})
+        await self.make_recipe_async(
+            title='Simple cake', slug='in-description',
+            description='Goes well with chocolate',
+            author_data={'username': 'two'})
+
+        with patch('recipes.views.asynchronous.PAGINATION_MODE', 'keyset'):
+            response = await asynchronous.recipe_list_search(
+                self.make_request('/?q=chocolate'))
+
+        content = response.content.decode('utf-8')
+        self.assertLess(
+            content.index('Chocolate pie'), content.index('Simple cake'))
+
+    async def test_async_detail_answers_conditional_get(self):
+        recipe = await self.make_recipe_async()
+
+        response = await asynchronous.recipe_detail(
+            self.make_request(), pk=recipe.pk)
+        self.assertEqual(response.status_code, 200)
+
+        response = await asynchronous.recipe_detail(
+            self.make_request(HTTP_IF_NONE_MATCH=response['ETag']),
+            pk=recipe.pk
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_async_api_v1_matches_the_sync_view(self):
+        await self.make_recipe_async()
+
+        response = await asynchronous.recipe_list_api_v1(self.make_request())
+        sync_response = await self.async_client.get(
+            reverse('recipes:recipes_api_v1'))
+
+        self.assertEqual(
+            json.loads(response.content), json.loads(sync_response.content)
+        )
+
+    async def test_async_api_v1_detail_404_for_unpublished(self):
+        recipe = await self.make_recipe_async(is_published=False)
+
+        with self.assertRaises(Http404):
+            await asynchronous.recipe_detail_api_v1(
+                self.make_request(), pk=recipe.pk)
+
+    async def test_middleware_stack_runs_under_asgi(self):
+        await self.make_recipe_async()
+
+        response = await self.async_client.get(reverse('recipes:home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.query_report.view_name, 'recipes:home')
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from recipes.management.commands.bench import ROUTES, get_route_names
+from recipes.models import Recipe
+
+
+class RecipeBenchCommandTest(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, 'bench.json')
+        return super().setUp()
+
+    def call_bench(self, *args):
+        call_command(
+            'bench', '--recipes', '10', '--iterations', '2', '--warmup', '0',
+            '--route', 'recipes:home', '--route', 'authors:author-api-me',
+            '--output', self.output, *args, stdout=StringIO(),
+        )
+        with open(self.output, encoding='utf-8') as file:
+            return json.load(file)
+
+    def test_every_named_route_has_a_benchmark(self):
+        self.assertEqual(set(ROUTES), get_route_names())
+
+    def test_bench_writes_metrics_and_rolls_back_the_seed(self):
+        results = self.call_bench()
+
+        self.assertEqual(
+            set(results['routes']), {'recipes:home', 'authors:author-api-me'}
+        )
+        home = results['routes']['recipes:home']
+        self.assertEqual(home['path'], '/')
+        self.assertGreater(home['queries'], 0)
+        self.assertLessEqual(home['p50_ms'], home['p99_ms'])
+        self.assertEqual(
+            results['routes']['authors:author-api-me']['auth'], 'jwt'
+        )
+        self.assertFalse(Recipe.objects.exists())
+
+    def test_bench_fails_on_regressions_over_the_baseline(self):
+        baseline = self.call_bench()
+        baseline['routes']['recipes:home']['queries'] -= 1
+        baseline_path = self.output + '.baseline'
+        with open(baseline_path, 'w', encoding='utf-8') as file:
+            json.dump(baseline, file)
+
+        with self.assertRaisesMessage(CommandError, '1 regression(s)'):
+            self.call_bench('--baseline', baseline_path, '--threshold', '10')
+
+    def test_bench_asgi_asks_for_a_seed_when_there_are_no_recipes(self):
+        with self.assertRaisesMessage(CommandError, 'manage.py seed'):
+            call_command('bench_asgi', stdout=StringIO())
@@ -0,0 +1,55 @@
+from django.urls import reverse
+from tag.models import Tag
+
+from .teste_recipe_base import RecipeTestBase
+
+
+class RecipeCardCacheTest(RecipeTestBase):
+    def test_recipe_card_is_rendered_only_once_per_language(self):
+        self.make_recipe()
+
+        response = self.client.get(reverse('recipes:home'))
+        self.assertTemplateUsed(response, 'recipes/partials/recipe.html')
+
+        response = self.client.get(reverse('recipes:home'))
+        self.assertTemplateNotUsed(response, 'recipes/partials/recipe.html')
+        self.assertIn('Recipe Title', response.content.decode('utf-8'))
+
+    def test_recipe_card_list_and_detail_are_cached_separately(self):
+        recipe = self.make_recipe(preparation_steps='Secret steps')
+
+        home = self.client.get(reverse('recipes:home'))
+        detail = self.client.get(reverse('recipes:recipe', args=(recipe.id,)))
+
+        self.assertNotIn('Secret steps', home.content.decode('utf-8'))
+        self.assertIn('Secret steps', detail.content.decode('utf-8'))
+
+    def test_recipe_card_is_refreshed_when_recipe_changes(self):
+        recipe = self.make_recipe()
+        self.client.get(reverse('recipes:home'))
+
+        recipe.title = 'Changed Title'
+        recipe.save()
+
+        response = self.client.get(reverse('recipes:home'))
+        self.assertIn('Changed Title', response.content.decode('utf-8'))
+
+    def test_recipe_card_is_refreshed_when_author_changes(self):
+        recipe = self.make_recipe()
+        self.client.get(reverse('recipes:home'))
+
+        recipe.author.first_name = 'Renamed'
+        recipe.author.save()
+
+        response = self.client.get(reverse('recipes:home'))
+        self.assertIn('Renamed', response.content.decode('utf-8'))
+
+    def test_recipe_card_is_refreshed_when_tags_change(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', args=(recipe.id,))
+        self.client.get(url)
+
+        recipe.tags.add(Tag.objects.create(name='Brand new tag'))
+
+        response = self.client.get(url)
+        self.assertIn('Brand new tag', response.content.decode('utf-8'))
@@ -0,0 +1,96 @@
+from django.urls import reverse
+from parameterized import parameterized
+
+from .teste_recipe_base import RecipeTestBase
+
+
+class RecipeConditionalGetTest(RecipeTestBase):
+
+    def get_urls(self, recipe):
+        return {
+            'detail': reverse('recipes:recipe', args=(recipe.id,)),
+            'detail_api_v1': reverse(
+                'recipes:recipes_api_v1_detail', args=(recipe.id,)),
+            'list_api_v1': reverse('recipes:recipes_api_v1'),
+            'list_api_v2': reverse('recipes:recipe-api-list'),
+            'detail_api_v2': reverse(
+                'recipes:recipe-api-detail', args=(recipe.id,)),
+        }
+
+    @parameterized.expand([
+        ['detail'], ['detail_api_v1'], ['list_api_v1'],
+        ['list_api_v2'], ['detail_api_v2'],
+    ])
+    def test_matching_etag_returns_304(self, url_name):
+        recipe = self.make_recipe()
+        url = self.get_urls(recipe)[url_name]
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response.headers)
+        self.assertIn('Last-Modified', response.headers)
+
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response.headers['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    @parameterized.expand([
+        ['detail'], ['list_api_v1'], ['list_api_v2'], ['detail_api_v2'],
+    ])
+    def test_etag_changes_when_recipe_is_updated(self, url_name):
+        recipe = self.make_recipe()
+        url = self.get_urls(recipe)[url_name]
+        etag = self.client.get(url).headers['ETag']
+
+        recipe.title = 'Updated Title'
+        recipe.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_list_etag_changes_when_a_recipe_is_unpublished(self):
+        recipes = self.criar_recipes_em_lote(2)
+        url = reverse('recipes:recipe-api-list')
+        etag = self.client.get(url).headers['ETag']
+
+        recipes[0].is_published = False
+        recipes[0].save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_etag_depends_on_the_page(self):
+        self.criar_recipes_em_lote(12)
+        url = reverse('recipes:recipe-api-list')
+
+        page_1 = self.client.get(url + '?page=1').headers['ETag']
+        page_2 = self.client.get(url + '?page=2').headers['ETag']
+
+        self.assertNotEqual(page_1, page_2)
+
+    def test_api_v2_not_modified_costs_a_single_query(self):
+        self.criar_recipes_em_lote(3)
+        url = reverse('recipes:recipe-api-list')
+        etag = self.client.get(url).headers['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_detail_page_answers_304_without_queries(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', args=(recipe.id,))
+        etag = self.client.get(url).headers['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_recipe_is_still_404(self):
+        url = reverse('recipes:recipe-api-detail', args=(1000,))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
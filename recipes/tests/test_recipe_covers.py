@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import QuerySet
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from recipes.covers import (claim_cover_jobs, finish_cover_job,
+                            process_cover_jobs)
+from recipes.models import CoverJob
+
+from .teste_recipe_base import RecipeTestBase
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image_file(width=1200, height=600, name='cover.png'):
+    image_bytes = BytesIO()
+    Image.new('RGB', (width, height), 'orange').save(image_bytes, 'PNG')
+    return SimpleUploadedFile(name, image_bytes.getvalue(), 'image/png')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class RecipeCoverJobTest(RecipeTestBase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        return super().tearDownClass()
+
+    def make_recipe_with_cover(self, **kwargs):
+        recipe = self.make_recipe(**kwargs)
+        recipe.cover = make_image_file()
+        recipe.save()
+        return recipe
+
+    def process_jobs(self):
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return process_cover_jobs(executor=executor)
+
+    def test_saving_a_cover_enqueues_a_job_instead_of_resizing(self):
+        recipe = self.make_recipe_with_cover()
+
+        self.assertEqual(
+            CoverJob.objects.filter(
+                recipe=recipe, status=CoverJob.STATUS_PENDING).count(),
+            1
+        )
+        with Image.open(recipe.cover.path) as cover:
+            self.assertEqual(cover.size[0], 1200)
+        self.assertEqual(recipe.cover_srcset, '')
+
+    def test_saving_again_does_not_enqueue_duplicated_jobs(self):
+        recipe = self.make_recipe_with_cover()
+        recipe.title = 'Another Title'
+        recipe.save()
+
+        self.assertEqual(CoverJob.objects.filter(recipe=recipe).count(), 1)
+
+    def test_worker_builds_renditions_and_resizes_original(self):
+        recipe = self.make_recipe_with_cover()
+
+        self.assertEqual(self.process_jobs(), 1)
+
+        recipe.refresh_from_db()
+        self.assertTrue(recipe.has_cover_renditions())
+        self.assertIn('400w', recipe.cover_srcset)
+        self.assertIn('840w', recipe.cover_webp_srcset)
+
+        for image in recipe.cover_renditions['images'].values():
+            self.assertTrue(
+                os.path.exists(os.path.join(MEDIA_ROOT, image['name']))
+            )
+
+        with Image.open(recipe.cover.path) as cover:
+            self.assertEqual(cover.size[0], 840)
+
+        self.assertEqual(
+            CoverJob.objects.get(recipe=recipe).status,
+            CoverJob.STATUS_DONE
+        )
+
+    def test_failed_jobs_are_retried_then_marked_as_failed(self):
+        recipe = self.make_recipe_with_cover()
+        os.remove(recipe.cover.path)
+
+        for _ in range(3):
+            self.assertEqual(self.process_jobs(), 0)
+
+        job = CoverJob.objects.get(recipe=recipe)
+        self.assertEqual(job.status, CoverJob.STATUS_FAILED)
+        self.assertEqual(job.attempts, 3)
+
+    def test_claim_skips_jobs_another_worker_claimed_meanwhile(self):
+        self.make_recipe_with_cover()
+        values_list = QuerySet.values_list
+
+        def select_then_lose_the_race(queryset, *args, **kwargs):
+            job_ids = list(values_list(queryset, *args, **kwargs))
+            # Outro worker marca os mesmos jobs antes do nosso UPDATE
+            CoverJob.objects.filter(id__in=job_ids).update(
+                status=CoverJob.STATUS_PROCESSING,
+                claim_token='other-worker',
+                claimed_at=timezone.now(),
+            )
+            return job_ids
+
+        with patch.object(QuerySet, 'values_list', select_then_lose_the_race):
+            self.assertEqual(claim_cover_jobs(10), [])
+
+    def test_job_left_processing_by_a_dead_worker_is_reclaimed(self):
+        recipe = self.make_recipe_with_cover()
+        CoverJob.objects.filter(recipe=recipe).update(
+            status=CoverJob.STATUS_PROCESSING,
+            claim_token='dead-worker',
+            claimed_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(self.process_jobs(), 1)
+
+        job = CoverJob.objects.get(recipe=recipe)
+        self.assertEqual(job.status, CoverJob.STATUS_DONE)
+        self.assertEqual(job.attempts, 2)
+        recipe.refresh_from_db()
+        self.assertTrue(recipe.has_cover_renditions())
+
+    def test_recent_claims_are_not_reclaimed(self):
+        recipe = self.make_recipe_with_cover()
+        CoverJob.objects.filter(recipe=recipe).update(
+            status=CoverJob.STATUS_PROCESSING,
+            claim_token='busy-worker',
+            claimed_at=timezone.now(),
+        )
+
+        self.assertEqual(claim_cover_jobs(10), [])
+
+    def test_expired_claim_does_not_overwrite_the_new_one(self):
+        recipe = self.make_recipe_with_cover()
+        [job] = claim_cover_jobs(10)
+        CoverJob.objects.filter(pk=job.pk).update(claim_token='new-worker')
+
+        finish_cover_job(job, error='Too slow')
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, CoverJob.STATUS_PROCESSING)
+        self.assertEqual(job.attempts, 0)
+        self.assertEqual(CoverJob.objects.get(recipe=recipe).error, '')
+
+    def test_api_srcset_urls_are_absolute_like_the_cover(self):
+        recipe = self.make_recipe_with_cover()
+        self.process_jobs()
+        fields = '?fields=cover,cover_srcset,cover_webp_srcset'
+
+        for url in (
+            reverse('recipes:recipe-api-list') + fields,
+            reverse('recipes:recipe-api-detail', args=(recipe.pk,)) + fields,
+        ):
+            data = self.client.get(url).json()
+            data = data['results'][0] if 'results' in data else data
+
+            self.assertTrue(data['cover'].startswith('http://testserver/'))
+            for field_name in ('cover_srcset', 'cover_webp_srcset'):
+                urls = [
+                    entry.split()[0]
+                    for entry in data[field_name].split(', ')
+                ]
+                self.assertTrue(urls, field_name)
+                for srcset_url in urls:
+                    self.assertTrue(
+                        srcset_url.startswith('http://testserver/media/'),
+                        srcset_url
+                    )
+
+    def test_template_srcset_urls_stay_relative(self):
+        recipe = self.make_recipe_with_cover()
+        self.process_jobs()
+        recipe.refresh_from_db()
+
+        self.assertTrue(recipe.cover_srcset.startswith('/media/'))
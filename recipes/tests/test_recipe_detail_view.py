@@ -1,5 +1,6 @@
 from django.urls import resolve, reverse
 from recipes.views import site
+from tag.models import Tag
 
 from .teste_recipe_base import RecipeTestBase
 
@@ -38,3 +39,14 @@ class RecipeDetailViewTest(RecipeTestBase):
         )
 
         self.assertEqual(response.status_code, 404)
+
+    def test_recipe_detail_api_v1_lists_tag_ids(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='Doce', slug='doce')
+        recipe.tags.add(tag)
+
+        response = self.client.get(
+            reverse('recipes:recipes_api_v1_detail', args=(recipe.id,))
+        )
+
+        self.assertEqual(response.json()['tags'], [tag.id])
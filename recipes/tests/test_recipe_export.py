@@ -0,0 +1,82 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from recipes.models import Recipe
+from recipes.tests.test_recipe_api import RecipeAPIv2TestMixin
+from rest_framework import test
+from tag.models import Tag
+
+
+class RecipeExportTest(test.APITestCase, RecipeAPIv2TestMixin):
+
+    def get_export(self, query='', authenticated=True):
+        url = reverse('recipes:recipes_api_v2_export') + query
+
+        if authenticated:
+            access_token = self.get_auth_data()['jwt_access_token']
+            return self.client.get(
+                url, HTTP_AUTHORIZATION=f'Bearer {access_token}')
+
+        return self.client.get(url)
+
+    def read_lines(self, response):
+        content = b''.join(response.streaming_content).decode('utf-8')
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_export_requires_authentication(self):
+        response = self.get_export(authenticated=False)
+        self.assertEqual(response.status_code, 401)
+
+    def test_export_streams_one_published_recipe_per_line(self):
+        recipes = self.criar_recipes_em_lote(3)
+        recipes[0].is_published = False
+        recipes[0].save()
+        recipes[1].tags.add(Tag.objects.create(name='Exported tag'))
+
+        response = self.get_export()
+        lines = self.read_lines(response)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(
+            [line['id'] for line in lines],
+            [recipes[1].id, recipes[2].id]
+        )
+        self.assertEqual(lines[0]['tag_objects'][0]['name'], 'Exported tag')
+        self.assertIn('updated_at', lines[0])
+
+    def test_export_since_only_returns_recently_updated_recipes(self):
+        old, new = self.criar_recipes_em_lote(2)
+        Recipe.objects.filter(pk=old.pk).update(
+            updated_at=timezone.now() - timedelta(days=10)
+        )
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+
+        response = self.get_export(
+            '?since=' + since.replace('+', '%2B')
+        )
+
+        self.assertEqual(
+            [line['id'] for line in self.read_lines(response)],
+            [new.id]
+        )
+
+    def test_export_rejects_invalid_since(self):
+        response = self.get_export('?since=yesterday')
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_command_walks_all_chunks(self):
+        recipes = self.criar_recipes_em_lote(5)
+        output = StringIO()
+
+        call_command('export_recipes', '--chunk-size', '2', stdout=output)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(
+            [line['id'] for line in lines],
+            [recipe.id for recipe in recipes]
+        )
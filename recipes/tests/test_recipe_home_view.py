@@ -60,6 +60,7 @@ class RecipeHomeViewTest(RecipeTestBase):
             self.assertNotIn('pagination-content', conteudo)
 
             self.make_recipe(
+                title=f'Recipe title {i}',
                 slug=f'receita-teste-{i}',
                 author_data={'username': f'usuario{i}'}
             )
@@ -99,7 +100,8 @@ class RecipeHomeViewTest(RecipeTestBase):
                 "author_data":  {
                     "username": f'u{i}'
                 },
-                "slug":         f'r{i}'
+                "slug":         f'r{i}',
+                "title":        f'Recipe title {i}'
             }
             self.make_recipe(**kwargs)
 
@@ -119,7 +121,8 @@ class RecipeHomeViewTest(RecipeTestBase):
                 "author_data":  {
                     "username": f'u{i}'
                 },
-                "slug":         f'r{i}'
+                "slug":         f'r{i}',
+                "title":        f'Recipe title {i}'
             }
             self.make_recipe(**kwargs)
 
@@ -141,3 +144,48 @@ class RecipeHomeViewTest(RecipeTestBase):
                 response.context['recipes'].number,
                 3
             )
+
+    def test_recipe_home_keyset_pagination_walks_all_recipes(self):
+        recipes = self.criar_recipes_em_lote(7)
+        expected_ids = sorted([recipe.id for recipe in recipes], reverse=True)
+
+        with patch('recipes.views.site.RECIPES_PER_PAGE', new=3), \
+                patch.object(site.RecipeListViewHome, 'pagination_mode',
+                             new='keyset'):
+            url = reverse('recipes:home')
+            seen_ids = []
+
+            while url:
+                response = self.client.get(url)
+                page_obj = response.context['recipes']
+                seen_ids += [recipe.id for recipe in page_obj]
+                next_cursor = response.context['pagination_range'][
+                    'next_cursor']
+                url = None
+                if next_cursor:
+                    url = reverse('recipes:home') + f'?cursor={next_cursor}'
+
+        self.assertEqual(seen_ids, expected_ids)
+
+    def test_recipe_home_keyset_pagination_goes_back_with_prev_cursor(self):
+        self.criar_recipes_em_lote(7)
+
+        with patch('recipes.views.site.RECIPES_PER_PAGE', new=3), \
+                patch.object(site.RecipeListViewHome, 'pagination_mode',
+                             new='keyset'):
+            first_page = self.client.get(reverse('recipes:home'))
+            next_cursor = first_page.context['pagination_range'][
+                'next_cursor']
+            second_page = self.client.get(
+                reverse('recipes:home') + f'?cursor={next_cursor}')
+            prev_cursor = second_page.context['pagination_range'][
+                'previous_cursor']
+            back_page = self.client.get(
+                reverse('recipes:home') + f'?cursor={prev_cursor}')
+
+        self.assertEqual(
+            [recipe.id for recipe in first_page.context['recipes']],
+            [recipe.id for recipe in back_page.context['recipes']],
+        )
+        self.assertFalse(back_page.context['recipes'].has_previous())
+        self.assertIn('rel="next"', back_page.content.decode('utf-8'))
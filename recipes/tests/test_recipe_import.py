@@ -0,0 +1,170 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.urls import reverse
+from recipes.models import Category, CoverJob, Recipe
+from recipes.search import SqliteFTS5SearchBackend
+from tag.models import Tag
+
+from .teste_recipe_base import RecipeTestBase
+
+CSV_HEADER = (
+    'slug,title,description,preparation_time,preparation_time_unit,'
+    'servings,servings_unit,preparation_steps,preparation_steps_is_html,'
+    'is_published,cover,category,author,tags\n'
+)
+
+
+class RecipeImportCommandTest(RecipeTestBase):
+
+    def write_file(self, content, suffix):
+        file = tempfile.NamedTemporaryFile(
+            'w', suffix=suffix, delete=False, encoding='utf-8'
+        )
+        file.write(content)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def import_file(self, path, *args):
+        output = StringIO()
+        call_command('import_recipes', path, *args, stdout=output)
+        return output.getvalue()
+
+    def test_import_csv_creates_recipes_categories_and_tags(self):
+        self.make_author(username='importer')
+        path = self.write_file(
+            CSV_HEADER +
+            'bolo,Bolo de fubá,Fofinho,40,Minutos,8,Porções,Misture,0,1,,'
+            'Doces,importer,Bolo|Fubá\n'
+            'pao,Pão caseiro,Simples,2,Horas,4,Pedaços,Sove,0,0,,'
+            'Pães,unknown,Pão\n',
+            '.csv'
+        )
+
+        output = self.import_file(path, '--batch-size', '1')
+
+        self.assertIn('2 created', output)
+        bolo = Recipe.objects.get(slug='bolo')
+        self.assertEqual(bolo.author.username, 'importer')
+        self.assertEqual(bolo.category.name, 'Doces')
+        self.assertEqual(
+            sorted(bolo.tags.values_list('name', flat=True)),
+            ['Bolo', 'Fubá']
+        )
+        self.assertTrue(bolo.is_published)
+        self.assertIsNone(Recipe.objects.get(slug='pao').author)
+        self.assertEqual(Category.objects.count(), 2)
+
+    def test_import_ndjson_upserts_by_slug(self):
+        recipe = self.make_recipe(slug='existing')
+        recipe.tags.add(Tag.objects.create(name='Old tag'))
+        path = self.write_file(
+            json.dumps({
+                'slug': 'existing',
+                'title': 'Imported title',
+                'description': 'Imported description',
+                'preparation_time': 5,
+                'preparation_time_unit': 'Minutos',
+                'servings': 1,
+                'servings_unit': 'Pessoas',
+                'preparation_steps': 'Steps',
+                'is_published': True,
+                'tags': ['New tag'],
+            }) + '\n',
+            '.ndjson'
+        )
+
+        output = self.import_file(path)
+
+        self.assertIn('1 updated', output)
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.title, 'Imported title')
+        self.assertEqual(
+            list(recipe.tags.values_list('name', flat=True)),
+            ['New tag']
+        )
+        self.assertEqual(Recipe.objects.count(), 1)
+
+    def test_import_defers_cover_processing(self):
+        path = self.write_file(
+            CSV_HEADER +
+            'capa,Com capa,Desc,1,Minutos,1,Porções,Passos,0,1,'
+            'recipes/covers/capa.jpg,,,\n',
+            '.csv'
+        )
+
+        self.import_file(path)
+
+        recipe = Recipe.objects.get(slug='capa')
+        self.assertEqual(
+            CoverJob.objects.get(recipe=recipe).cover_name,
+            'recipes/covers/capa.jpg'
+        )
+
+    def test_imported_recipes_are_searchable(self):
+        path = self.write_file(
+            CSV_HEADER +
+            'torta,Torta de limão,Azedinha,1,Horas,8,Porções,Asse,0,1,,,,\n',
+            '.csv'
+        )
+
+        self.import_file(path)
+
+        response = self.client.get(reverse('recipes:search') + '?q=limão')
+        self.assertEqual(len(response.context['recipes']), 1)
+
+    def test_import_indexes_only_the_imported_recipes(self):
+        self.make_recipe(title='Torta de maçã', slug='torta')
+        self.make_recipe(
+            title='Pudim de limão', slug='pudim',
+            author_data={'username': 'other'}
+        )
+        path = self.write_file(
+            CSV_HEADER +
+            'torta,Torta de limão,Azedinha,1,Horas,8,Porções,Asse,0,1,,,,\n',
+            '.csv'
+        )
+
+        with patch.object(
+            SqliteFTS5SearchBackend, 'rebuild'
+        ) as rebuild, patch.object(
+            SqliteFTS5SearchBackend, 'index_recipes',
+            autospec=True,
+            side_effect=SqliteFTS5SearchBackend.index_recipes,
+        ) as index_recipes:
+            self.import_file(path)
+
+        rebuild.assert_not_called()
+        self.assertEqual(
+            list(index_recipes.call_args.args[1]),
+            [Recipe.objects.get(slug='torta').id]
+        )
+        response = self.client.get(reverse('recipes:search') + '?q=limão')
+        self.assertEqual(
+            {recipe.slug for recipe in response.context['recipes']},
+            {'torta', 'pudim'}
+        )
+        response = self.client.get(reverse('recipes:search') + '?q=maçã')
+        self.assertEqual(len(response.context['recipes']), 0)
+
+    def test_import_keeps_duplicated_titles_out_of_the_unique_index(self):
+        self.make_recipe(title='Torta de Limão', slug='existing')
+        path = self.write_file(
+            CSV_HEADER +
+            'torta,TORTA de limao,Desc,1,Horas,8,Porções,Asse,0,1,,,,\n',
+            '.csv'
+        )
+
+        output = self.import_file(path)
+
+        self.assertIn('1 recipes have titles that already exist', output)
+        self.assertIsNone(Recipe.objects.get(slug='torta').title_normalized)
+        self.assertEqual(
+            Recipe.objects.get(slug='existing').title_normalized,
+            'torta de limao'
+        )
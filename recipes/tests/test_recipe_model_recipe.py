@@ -1,6 +1,8 @@
 from django.forms import ValidationError
 from parameterized import parameterized
 
+from recipes.titles import backfill_title_normalized
+
 from .teste_recipe_base import Recipe, RecipeTestBase
 
 
@@ -13,7 +15,7 @@ class RecipeModelTest(RecipeTestBase):
         return Recipe(
             category=self.make_category(name='Test Default Category'),
             author=self.make_author(username='newuser'),
-            title='Recipe Title',
+            title='Recipe Title No Defaults',
             description='Recipe Description',
             slug='recipe-slug-for-no-defaults',
             preparation_time=10,
@@ -59,3 +61,65 @@ class RecipeModelTest(RecipeTestBase):
                          'Testing Representation',
                          msg=f'Recipe string representation must be "{needed}"'
                          )
+
+    def test_recipe_title_must_be_unique_ignoring_case_and_accents(self):
+        self.recipe.title = 'Pão de Queijo'
+        self.recipe.save()
+
+        recipe = self.make_recipe_no_defaults()
+        recipe.title = '  PAO de   queijo '
+
+        with self.assertRaises(ValidationError) as error:
+            recipe.full_clean()
+
+        self.assertIn('title', error.exception.message_dict)
+
+    def test_recipe_title_normalized_is_set_on_save(self):
+        self.recipe.title = 'Pão de Queijo'
+        self.recipe.save()
+        self.recipe.full_clean()
+
+        self.assertEqual(self.recipe.title_normalized, 'pao de queijo')
+
+    def test_saving_a_duplicate_left_empty_keeps_it_empty(self):
+        recipe = self.make_recipe_no_defaults()
+        recipe.save()
+        Recipe.objects.filter(pk=recipe.pk).update(
+            title=self.recipe.title, title_normalized=None)
+        recipe = Recipe.objects.get(pk=recipe.pk)
+
+        recipe.servings = 7
+        recipe.save()
+
+        recipe.refresh_from_db()
+        self.assertIsNone(recipe.title_normalized)
+        self.assertEqual(recipe.servings, 7)
+
+    def test_save_turns_a_title_taken_after_clean_into_validation_error(self):
+        recipe = self.make_recipe_no_defaults()
+        recipe.full_clean()
+        # Outra receita grava o mesmo título entre o clean() e o save()
+        Recipe.objects.filter(pk=self.recipe.pk).update(
+            title='Recipe Title No Defaults',
+            title_normalized='recipe title no defaults',
+        )
+
+        with self.assertRaises(ValidationError) as error:
+            recipe.save()
+
+        self.assertIn('title', error.exception.message_dict)
+        self.assertIsNone(recipe.pk)
+
+    def test_backfill_title_normalized_leaves_duplicates_empty(self):
+        recipe = self.make_recipe_no_defaults()
+        recipe.save()
+        # Duplicata antiga, de antes do índice único
+        Recipe.objects.filter(pk=recipe.pk).update(title='RECIPE  Títle')
+        Recipe.objects.update(title_normalized=None)
+
+        updated, duplicated_ids = backfill_title_normalized(Recipe)
+
+        self.assertEqual(updated, 1)
+        self.assertEqual(duplicated_ids, [recipe.id])
+        self.recipe.refresh_from_db()
+        self.assertEqual(self.recipe.title_normalized, 'recipe title')
@@ -0,0 +1,192 @@
+from django.urls import reverse
+from tag.models import Tag
+
+from recipes.cache import bump_page_cache_generation
+
+from .teste_recipe_base import RecipeTestBase
+
+
+class RecipePageCacheTest(RecipeTestBase):
+
+    def test_anonymous_home_is_served_from_cache_without_queries(self):
+        self.make_recipe()
+        url = reverse('recipes:home')
+        first = self.client.get(url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+
+        self.assertEqual(first.content, second.content)
+
+    def test_page_cache_is_invalidated_when_recipe_is_published(self):
+        recipe = self.make_recipe(is_published=False)
+        url = reverse('recipes:home')
+        self.client.get(url)
+
+        recipe.is_published = True
+        recipe.save()
+
+        response = self.client.get(url)
+        self.assertIn('Recipe Title', response.content.decode('utf-8'))
+
+    def test_page_cache_varies_on_page_query(self):
+        self.criar_recipes_em_lote(10)
+        url = reverse('recipes:home')
+
+        page_1 = self.client.get(url + '?page=1')
+        page_2 = self.client.get(url + '?page=2')
+        self.assertNotEqual(page_1.content, page_2.content)
+
+    def test_page_cache_ignores_unknown_query_params(self):
+        self.make_recipe()
+        url = reverse('recipes:home')
+        self.client.get(url)
+
+        with self.assertNumQueries(0):
+            self.client.get(url + '?utm_source=crawler')
+
+    def test_page_cache_varies_on_language(self):
+        self.make_recipe()
+        url = reverse('recipes:home')
+
+        pt_br = self.client.get(url, HTTP_ACCEPT_LANGUAGE='pt-br')
+        en = self.client.get(url, HTTP_ACCEPT_LANGUAGE='en')
+
+        self.assertIn('lang="pt-br"', pt_br.content.decode('utf-8'))
+        self.assertIn('lang="en"', en.content.decode('utf-8'))
+
+    def test_page_cache_is_bypassed_for_authenticated_users(self):
+        self.make_recipe(author_data={'username': 'cached'})
+        url = reverse('recipes:home')
+        self.client.get(url)
+
+        self.client.login(username='cached', password='123456')
+        response = self.client.get(url)
+
+        self.assertIsNotNone(response.context)
+
+    def test_page_cache_is_bypassed_when_there_are_flash_messages(self):
+        self.make_recipe()
+        url = reverse('recipes:home')
+        self.client.get(url)
+
+        self.client.post(
+            reverse('authors:login_create'),
+            data={'username': 'nobody', 'password': 'wrong'}
+        )
+
+        response = self.client.get(url)
+        self.assertIn('Invalid credentials', response.content.decode('utf-8'))
+
+        response = self.client.get(url)
+        self.assertNotIn(
+            'Invalid credentials', response.content.decode('utf-8')
+        )
+
+    def make_two_recipes(self):
+        recipes = self.criar_recipes_em_lote(2)
+        urls = {
+            'home': reverse('recipes:home'),
+            'detail_0': reverse('recipes:recipe', args=(recipes[0].pk,)),
+            'detail_1': reverse('recipes:recipe', args=(recipes[1].pk,)),
+            'category_1': reverse(
+                'recipes:category', args=(recipes[1].category_id,)),
+        }
+
+        for url in urls.values():
+            self.client.get(url)
+
+        return recipes, urls
+
+    def assertPageIsCached(self, url):
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    def test_editing_a_recipe_keeps_unrelated_pages_cached(self):
+        recipes, urls = self.make_two_recipes()
+
+        recipes[0].title = 'An edited title'
+        recipes[0].save()
+
+        self.assertPageIsCached(urls['detail_1'])
+        self.assertPageIsCached(urls['category_1'])
+        self.assertIn(
+            'An edited title',
+            self.client.get(urls['detail_0']).content.decode('utf-8')
+        )
+        self.assertIn(
+            'An edited title',
+            self.client.get(urls['home']).content.decode('utf-8')
+        )
+
+    def test_editing_a_draft_keeps_every_page_cached(self):
+        _, urls = self.make_two_recipes()
+        draft = self.make_recipe(
+            is_published=False, slug='draft',
+            author_data={'username': 'drafter'}
+        )
+        self.client.get(urls['home'])
+
+        draft.title = 'Still a draft'
+        draft.save()
+
+        for url in urls.values():
+            self.assertPageIsCached(url)
+
+    def test_renaming_a_tag_invalidates_only_its_pages(self):
+        recipes, urls = self.make_two_recipes()
+        tag = Tag.objects.create(name='Old tag name')
+        recipes[0].tags.add(tag)
+        tag_url = reverse('recipes:tag', args=(tag.slug,))
+        self.client.get(tag_url)
+        self.client.get(urls['detail_0'])
+
+        tag.name = 'New tag name'
+        tag.save()
+
+        self.assertPageIsCached(urls['detail_1'])
+        for url in (tag_url, urls['detail_0']):
+            self.assertIn(
+                'New tag name',
+                self.client.get(url).content.decode('utf-8')
+            )
+
+    def test_changing_a_tag_slug_invalidates_the_old_slug_page(self):
+        recipes, _ = self.make_two_recipes()
+        tag = Tag.objects.create(name='Tag', slug='old-slug')
+        recipes[0].tags.add(tag)
+        old_url = reverse('recipes:tag', args=('old-slug',))
+        self.assertIn(
+            recipes[0].title,
+            self.client.get(old_url).content.decode('utf-8')
+        )
+
+        tag.slug = 'new-slug'
+        tag.save()
+
+        self.assertNotIn(
+            recipes[0].title,
+            self.client.get(old_url).content.decode('utf-8')
+        )
+
+    def test_renaming_an_author_invalidates_only_their_recipe_pages(self):
+        recipes, urls = self.make_two_recipes()
+
+        author = recipes[0].author
+        author.first_name = 'Renamed'
+        author.save()
+
+        self.assertPageIsCached(urls['detail_1'])
+        self.assertIn(
+            'Renamed',
+            self.client.get(urls['detail_0']).content.decode('utf-8')
+        )
+
+    def test_bump_page_cache_generation_invalidates_every_page(self):
+        _, urls = self.make_two_recipes()
+
+        bump_page_cache_generation()
+
+        for url in urls.values():
+            response = self.client.get(url)
+            self.assertIsNotNone(response.context)
@@ -0,0 +1,77 @@
+from django.urls import reverse
+from parameterized import parameterized
+from tag.models import Tag
+from utils.query_budget import QueryBudgetTestMixin
+
+from .teste_recipe_base import RecipeTestBase
+
+
+class RecipeQueryBudgetTest(QueryBudgetTestMixin, RecipeTestBase):
+    """
+    Cada view precisa caber no orçamento de QUERY_BUDGETS com o cache
+    frio, tanto para visitantes quanto para usuários logados.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_author(username='budget', password='P4ss')
+        self.tag = Tag.objects.create(name='Budget tag')
+        self.recipes = []
+
+        for i in range(4):
+            recipe = self.make_recipe(
+                title=f'Budget recipe {i}',
+                slug=f'budget-recipe-{i}',
+                author_data={'username': f'budget-author-{i}'},
+            )
+            recipe.tags.add(self.tag)
+            self.recipes.append(recipe)
+
+        self.draft = self.recipes[-1]
+        self.draft.author = self.author
+        self.draft.is_published = False
+        self.draft.save()
+
+    def get_urls(self):
+        recipe = self.recipes[0]
+        return {
+            'home': reverse('recipes:home'),
+            'category': reverse(
+                'recipes:category', args=(recipe.category_id,)),
+            'tag': reverse('recipes:tag', args=(self.tag.slug,)),
+            'detail': reverse('recipes:recipe', args=(recipe.id,)),
+            'search': reverse('recipes:search') + '?q=budget',
+            'home_api_v1': reverse('recipes:recipes_api_v1'),
+            'list_api_v2': reverse('recipes:recipe-api-list'),
+            'detail_api_v2': reverse(
+                'recipes:recipe-api-detail', args=(recipe.id,)),
+            'profile': reverse(
+                'authors:profile', args=(recipe.author.profile.id,)),
+        }
+
+    @parameterized.expand([
+        ['home'], ['category'], ['tag'], ['detail'], ['search'],
+        ['home_api_v1'], ['list_api_v2'], ['detail_api_v2'], ['profile'],
+    ])
+    def test_view_is_within_query_budget(self, url_name):
+        url = self.get_urls()[url_name]
+
+        self.assertWithinQueryBudget(self.client.get(url))
+
+        self.client.login(username='budget', password='P4ss')
+        self.assertWithinQueryBudget(self.client.get(url))
+
+    @parameterized.expand([
+        ['dashboard'], ['dashboard_recipe_new'], ['dashboard_recipe_edit'],
+    ])
+    def test_dashboard_is_within_query_budget(self, url_name):
+        self.client.login(username='budget', password='P4ss')
+        urls = {
+            'dashboard': reverse('authors:dashboard'),
+            'dashboard_recipe_new': reverse('authors:dashboard_recipe_new'),
+            'dashboard_recipe_edit': reverse(
+                'authors:dashboard_recipe_edit', args=(self.draft.id,)),
+        }
+        url = urls[url_name]
+
+        self.assertWithinQueryBudget(self.client.get(url))
@@ -0,0 +1,178 @@
+import re
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from parameterized import parameterized
+from tag.models import Tag
+
+from .teste_recipe_base import RecipeTestBase
+
+FULL_SCAN_REGEX = re.compile(
+    r'^SCAN (recipes_recipe|recipes_recipe_tags)\b'
+)
+PAGE_LIMIT_REGEX = re.compile(r'\bLIMIT \d+( OFFSET \d+)?$')
+
+
+def is_full_scan(detail, sql, sorted_sql=()):
+    """
+    SCAN ... USING INDEX só passa quando é a leitura ordenada de uma
+    página: o LIMIT no fim da consulta para a varredura e nada é
+    ordenado em memória (TEMP B-TREE)
+    """
+    return bool(FULL_SCAN_REGEX.match(detail)) and not (
+        ' USING ' in detail and
+        PAGE_LIMIT_REGEX.search(sql) and
+        sql not in sorted_sql
+    )
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN do SQLite')
+class RecipeQueryPlanTest(RecipeTestBase):
+    """
+    Roda EXPLAIN QUERY PLAN em todas as consultas que cada página faz
+    em recipes_recipe e na tabela de tags e falha se alguma delas
+    precisar varrer a tabela inteira.
+
+    Passar por um índice inteiro (SCAN ... USING [COVERING] INDEX) também
+    é varrer a tabela; só passam SEARCH e a leitura ordenada de uma
+    página, que o LIMIT interrompe.
+    """
+
+    maxDiff = None
+
+    def setUp(self):
+        super().setUp()
+        self.author = self.make_author(username='planner', password='P4ss')
+        self.recipes = []
+
+        for i in range(3):
+            recipe = self.make_recipe(
+                title=f'Plan recipe {i}',
+                slug=f'plan-recipe-{i}',
+                author_data={'username': f'plan-author-{i}'},
+            )
+            self.recipes.append(recipe)
+
+        self.tag = Tag.objects.create(name='Plan tag')
+        self.recipes[0].tags.add(self.tag)
+        self.recipes[1].tags.add(self.tag)
+
+        draft = self.recipes[2]
+        draft.author = self.author
+        draft.is_published = False
+        draft.save()
+
+    def get_urls(self):
+        recipe = self.recipes[0]
+        return {
+            'home': reverse('recipes:home'),
+            'home_api_v1': reverse('recipes:recipes_api_v1'),
+            'category': reverse(
+                'recipes:category', args=(recipe.category_id,)),
+            'tag': reverse('recipes:tag', args=(self.tag.slug,)),
+            'detail': reverse('recipes:recipe', args=(recipe.id,)),
+            'list_api_v2': reverse('recipes:recipe-api-list'),
+            'list_api_v2_category': reverse('recipes:recipe-api-list') +
+            f'?category_id={recipe.category_id}',
+            'list_api_v2_author': reverse('recipes:recipe-api-list') +
+            f'?author={recipe.author_id}',
+            'list_api_v2_tag': reverse('recipes:recipe-api-list') +
+            f'?tag={self.tag.slug}',
+            'list_api_v2_tag_cursor': self.get_next_page_url(
+                f'?tag={self.tag.slug}'),
+            'list_api_v2_servings': reverse('recipes:recipe-api-list') +
+            f'?servings={recipe.servings}',
+            'list_api_v2_preparation_time': reverse(
+                'recipes:recipe-api-list') +
+            '?preparation_time_min=5&ordering=-preparation_time',
+            'list_api_v2_created_at': reverse('recipes:recipe-api-list') +
+            '?created_after=2020-01-01T00:00:00Z&ordering=created_at',
+            'list_api_v2_ordering_servings': reverse(
+                'recipes:recipe-api-list') + '?ordering=servings',
+            'dashboard': reverse('authors:dashboard'),
+            'dashboard_recipe': reverse(
+                'authors:dashboard_recipe_edit', args=(self.recipes[2].id,)),
+        }
+
+    def get_next_page_url(self, query):
+        with patch('recipes.views.api.RecipeAPIV2Pagination.page_size', 1):
+            return self.client.get(
+                reverse('recipes:recipe-api-list') + query
+            ).data['next']
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+
+    def get_plans(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+        for query in context.captured_queries:
+            sql = query['sql']
+
+            if not sql.startswith('SELECT') or 'recipes_recipe' not in sql:
+                continue
+
+            for detail in self.explain(sql):
+                yield detail, sql
+
+    def get_full_scans(self, url):
+        plans = list(self.get_plans(url))
+        sorted_sql = {sql for detail, sql in plans if 'TEMP B-TREE' in detail}
+
+        return [
+            (detail, sql) for detail, sql in plans
+            if is_full_scan(detail, sql, sorted_sql)
+        ]
+
+    def test_index_scans_without_a_page_limit_are_full_scans(self):
+        sql = (
+            'SELECT COUNT(*) FROM "recipes_recipe" '
+            'WHERE "recipes_recipe"."is_published"'
+        )
+        details = self.explain(sql)
+
+        self.assertIn(' USING ', ' '.join(details))
+        self.assertTrue(any(is_full_scan(detail, sql) for detail in details))
+        self.assertFalse(any(
+            is_full_scan(detail, f'{sql} ORDER BY id DESC LIMIT 10')
+            for detail in self.explain(f'{sql} ORDER BY id DESC LIMIT 10')
+        ))
+
+    @parameterized.expand([
+        ['home'], ['home_api_v1'], ['category'], ['tag'], ['detail'],
+        ['list_api_v2'], ['list_api_v2_category'], ['list_api_v2_author'],
+        ['list_api_v2_tag'], ['list_api_v2_servings'],
+        ['list_api_v2_preparation_time'], ['list_api_v2_created_at'],
+        ['list_api_v2_ordering_servings'],
+        ['dashboard'], ['dashboard_recipe'],
+    ])
+    def test_recipe_queries_do_not_scan_the_whole_table(self, url_name):
+        self.client.login(username='planner', password='P4ss')
+
+        full_scans = self.get_full_scans(self.get_urls()[url_name])
+
+        self.assertEqual(full_scans, [])
+
+    @parameterized.expand([
+        ['list_api_v2'], ['list_api_v2_category'], ['list_api_v2_author'],
+        ['list_api_v2_tag'], ['list_api_v2_tag_cursor'],
+        ['list_api_v2_servings'], ['list_api_v2_preparation_time'],
+        ['list_api_v2_created_at'], ['list_api_v2_ordering_servings'],
+    ])
+    def test_api_v2_pages_are_read_in_index_order(self, url_name):
+        # Com LIMIT e sem ordenação temporária o banco para na página
+        sorts = [
+            (detail, sql)
+            for detail, sql in self.get_plans(self.get_urls()[url_name])
+            if 'TEMP B-TREE' in detail
+        ]
+
+        self.assertEqual(sorts, [])
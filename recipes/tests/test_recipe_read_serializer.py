@@ -0,0 +1,55 @@
+import json
+
+from recipes.models import Recipe
+from recipes.serializers import RecipeReadSerializer, RecipeSerializer
+from rest_framework.test import APIRequestFactory
+from tag.models import Tag
+
+from .teste_recipe_base import RecipeTestBase
+
+
+class RecipeReadSerializerTest(RecipeTestBase):
+
+    def make_recipes(self):
+        recipes = self.criar_recipes_em_lote(3)
+        tags = [Tag.objects.create(name=f'Tag {i}') for i in range(2)]
+
+        recipes[0].tags.set(tags)
+        recipes[1].tags.set(tags[:1])
+        recipes[1].cover = 'recipes/covers/2022/10/01/cover image.jpg'
+        recipes[1].save()
+        recipes[2].category = None
+        recipes[2].save()
+
+        return Recipe.objects.get_published().order_by('-id')
+
+    def serialize(self, serializer_class, queryset):
+        request = APIRequestFactory().get('/recipes/api/v2/')
+        data = serializer_class(
+            queryset, many=True, context={'request': request}
+        ).data
+        return json.loads(json.dumps(data))
+
+    def test_read_serializer_output_matches_recipe_serializer(self):
+        queryset = self.make_recipes()
+
+        self.assertEqual(
+            self.serialize(RecipeSerializer, queryset),
+            self.serialize(RecipeReadSerializer, queryset)
+        )
+
+    def test_read_serializer_does_not_query_with_prefetched_rows(self):
+        queryset = list(self.make_recipes())
+
+        with self.assertNumQueries(0):
+            self.serialize(RecipeReadSerializer, queryset)
+
+    def test_api_v2_list_uses_the_read_serializer_output(self):
+        queryset = self.make_recipes()
+        response = self.client.get('/recipes/api/v2/?page=1')
+
+        expected = self.serialize(RecipeSerializer, queryset)
+        expected_by_id = {recipe['id']: recipe for recipe in expected}
+
+        for recipe in response.json()['results']:
+            self.assertEqual(recipe, expected_by_id[recipe['id']])
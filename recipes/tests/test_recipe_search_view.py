@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from django.urls import resolve, reverse
 from recipes.views import site
 
@@ -55,3 +57,65 @@ class RecipeSearchViewTest(RecipeTestBase):
 
         self.assertIn(recipe1, response_both.context['recipes'])
         self.assertIn(recipe2, response_both.context['recipes'])
+
+    def test_recipe_search_ranks_title_matches_first(self):
+        in_description = self.make_recipe(
+            slug='in-description',
+            title='Simple cake',
+            description='Goes well with chocolate',
+            author_data={'username': 'one'}
+        )
+        in_title = self.make_recipe(
+            slug='in-title',
+            title='Chocolate pie',
+            description='A classic pie',
+            author_data={'username': 'two'}
+        )
+
+        response = self.client.get(reverse('recipes:search') + '?q=chocolate')
+
+        self.assertEqual(
+            [in_title, in_description],
+            list(response.context['recipes'])
+        )
+
+    def test_recipe_search_keeps_rank_order_with_keyset_pagination(self):
+        # Mais antiga: na ordem por id ela viria por último
+        in_title = self.make_recipe(
+            slug='in-title',
+            title='Chocolate pie',
+            description='A classic pie',
+            author_data={'username': 'one'}
+        )
+        in_description = self.make_recipe(
+            slug='in-description',
+            title='Simple cake',
+            description='Goes well with chocolate',
+            author_data={'username': 'two'}
+        )
+
+        with patch.object(site.RecipeListViewBase, 'pagination_mode',
+                          new='keyset'):
+            response = self.client.get(
+                reverse('recipes:search') + '?q=chocolate')
+
+        self.assertEqual(
+            [in_title, in_description],
+            list(response.context['recipes'])
+        )
+
+    def test_recipe_search_index_follows_recipe_changes(self):
+        recipe = self.make_recipe(title='Old title for search')
+        search_url = reverse('recipes:search')
+
+        recipe.title = 'Brand new title'
+        recipe.save()
+
+        response_old = self.client.get(f'{search_url}?q=old')
+        response_new = self.client.get(f'{search_url}?q=brand')
+        self.assertNotIn(recipe, response_old.context['recipes'])
+        self.assertIn(recipe, response_new.context['recipes'])
+
+        recipe.delete()
+        response_deleted = self.client.get(f'{search_url}?q=brand')
+        self.assertEqual(len(response_deleted.context['recipes']), 0)
@@ -0,0 +1,91 @@
+from io import StringIO
+from unittest.mock import patch
+
+from authors.models import Profile
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from recipes.models import CategorySummary, Recipe
+from recipes.search import SqliteFTS5SearchBackend
+from recipes.seed import Seeder
+from tag.models import Tag
+
+
+class RecipeSeedTest(TestCase):
+
+    def get_recipes(self):
+        return list(
+            Recipe.objects.order_by('title').values_list(
+                'title', 'is_published', 'author__username',
+                'category__name',
+            )
+        )
+
+    def get_recipe_tags(self):
+        return sorted(
+            Recipe.tags.through.objects.values_list(
+                'recipe__title', 'tag__slug'
+            )
+        )
+
+    def test_seed_command_creates_authors_with_profiles_and_summaries(self):
+        call_command(
+            'seed', '--recipes', '50', '--authors', '5', '--categories', '3',
+            '--tags', '10', '--batch-size', '20', stdout=StringIO(),
+        )
+
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Profile.objects.count(), 5)
+        self.assertEqual(Tag.objects.count(), 10)
+        self.assertEqual(Recipe.objects.count(), 50)
+        self.assertEqual(
+            sum(CategorySummary.objects.values_list(
+                'published_count', flat=True)),
+            Recipe.objects.filter(is_published=True).count()
+        )
+
+    def test_batches_are_the_same_whatever_the_order_they_run(self):
+        seeder = Seeder(seed=7, batch_size=10)
+        seeder.create_authors(3)
+        seeder.create_categories(2)
+        seeder.create_tags(5)
+        seeder.create_recipes(30)
+        recipes = self.get_recipes()
+        recipe_tags = self.get_recipe_tags()
+
+        Recipe.objects.all().delete()
+        # Como dois processos dividindo os blocos
+        parallel = Seeder(seed=7, batch_size=10, offset=seeder.offset)
+        parallel.create_recipes(30, batches={2})
+        parallel.create_recipes(30, batches={0, 1})
+
+        self.assertEqual(self.get_recipes(), recipes)
+        self.assertEqual(self.get_recipe_tags(), recipe_tags)
+
+    def test_publish_ratio(self):
+        seeder = Seeder(publish_ratio=0)
+        seeder.create_authors(1)
+        seeder.create_recipes(10)
+
+        self.assertFalse(Recipe.objects.filter(is_published=True).exists())
+
+    def test_finish_indexes_only_the_created_recipes(self):
+        seeder = Seeder(seed=3, batch_size=10)
+        seeder.create_authors(1)
+        seeder.create_recipes(5)
+        seeder.finish()
+        first_ids = set(Recipe.objects.values_list('id', flat=True))
+
+        seeder = Seeder(seed=3, batch_size=10)
+        seeder.create_recipes(20)
+        with patch.object(SqliteFTS5SearchBackend, 'rebuild') as rebuild, \
+                patch.object(
+                    SqliteFTS5SearchBackend, 'index_recipes'
+                ) as index_recipes:
+            seeder.finish()
+
+        rebuild.assert_not_called()
+        self.assertEqual(
+            set(index_recipes.call_args.args[0]),
+            set(Recipe.objects.values_list('id', flat=True)) - first_ids
+        )
@@ -0,0 +1,220 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from recipes.models import CategorySummary, Recipe, SiteSummary, TagSummary
+from recipes.summaries import SITE_SUMMARY_PK, get_published_count
+from tag.models import Tag
+
+from .teste_recipe_base import RecipeTestBase
+
+
+class RecipeSummaryTest(RecipeTestBase):
+
+    def get_category_summary(self, recipe):
+        return CategorySummary.objects.get(pk=recipe.category_id)
+
+    def test_category_summary_follows_recipe_changes(self):
+        recipe = self.make_recipe()
+        summary = self.get_category_summary(recipe)
+        self.assertEqual(summary.published_count, 1)
+        self.assertEqual(summary.newest_recipe_id, recipe.id)
+
+        recipe.is_published = False
+        recipe.save()
+        self.assertEqual(self.get_category_summary(recipe).published_count, 0)
+
+        recipe.is_published = True
+        recipe.save()
+        old_category_id = recipe.category_id
+        recipe.category = self.make_category(name='Other')
+        recipe.save()
+        self.assertEqual(
+            CategorySummary.objects.get(pk=old_category_id).published_count,
+            0
+        )
+        self.assertEqual(self.get_category_summary(recipe).published_count, 1)
+
+        recipe.delete()
+        self.assertEqual(self.get_category_summary(recipe).published_count, 0)
+
+    def test_tag_summary_follows_tags_and_publication(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='Doce')
+        self.assertEqual(TagSummary.objects.get(pk=tag.pk).published_count, 0)
+
+        recipe.tags.add(tag)
+        self.assertEqual(TagSummary.objects.get(pk=tag.pk).published_count, 1)
+
+        recipe.is_published = False
+        recipe.save()
+        self.assertEqual(TagSummary.objects.get(pk=tag.pk).published_count, 0)
+
+        recipe.is_published = True
+        recipe.save()
+        recipe.tags.clear()
+        self.assertEqual(TagSummary.objects.get(pk=tag.pk).published_count, 0)
+
+        tag.recipe_set.add(recipe)
+        recipe.delete()
+        self.assertEqual(TagSummary.objects.get(pk=tag.pk).published_count, 0)
+
+    def test_recipe_changes_update_counts_in_place_without_recounting(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='Doce')
+        recipe.tags.add(tag)
+
+        with CaptureQueriesContext(connection) as context:
+            recipe.is_published = False
+            recipe.save()
+            recipe.is_published = True
+            recipe.save()
+
+        self.assertFalse([
+            query['sql'] for query in context.captured_queries
+            if 'summary' in query['sql'] and (
+                'COUNT(' in query['sql'] or 'DELETE' in query['sql'])
+        ])
+        self.assertEqual(self.get_category_summary(recipe).published_count, 1)
+        self.assertEqual(TagSummary.objects.get(pk=tag.pk).published_count, 1)
+
+    def test_newest_recipe_follows_publications_and_removals(self):
+        older = self.make_recipe()
+        newer = self.make_recipe(
+            title='Newer recipe', slug='newer-recipe',
+            category_data={'name': 'Ignored'},
+            author_data={'username': 'newer'},
+        )
+        newer.category = older.category
+        newer.save()
+        self.assertEqual(
+            self.get_category_summary(older).newest_recipe_id, newer.id)
+
+        newer.is_published = False
+        newer.save()
+        self.assertEqual(
+            self.get_category_summary(older).newest_recipe_id, older.id)
+
+        older.delete()
+        summary = CategorySummary.objects.get(pk=newer.category_id)
+        self.assertEqual(summary.published_count, 0)
+        self.assertIsNone(summary.newest_recipe_id)
+
+    def test_removing_tags_that_are_not_linked_changes_nothing(self):
+        recipe = self.make_recipe()
+        linked = Tag.objects.create(name='A')
+        other = Tag.objects.create(name='B')
+        recipe.tags.add(linked)
+
+        recipe.tags.remove(linked, other)
+        other.recipe_set.remove(recipe)
+
+        self.assertEqual(
+            TagSummary.objects.get(pk=linked.pk).published_count, 0)
+        self.assertEqual(
+            TagSummary.objects.get(pk=other.pk).published_count, 0)
+
+    def test_reverse_tag_changes_count_only_published_recipes(self):
+        published = self.make_recipe()
+        draft = self.make_recipe(
+            title='Draft recipe', slug='draft-recipe', is_published=False,
+            author_data={'username': 'draft'},
+        )
+        tag = Tag.objects.create(name='Reverse')
+
+        tag.recipe_set.add(published, draft)
+        self.assertEqual(TagSummary.objects.get(pk=tag.pk).published_count, 1)
+
+        tag.recipe_set.clear()
+        self.assertEqual(TagSummary.objects.get(pk=tag.pk).published_count, 0)
+
+    def test_missing_or_drifted_row_is_recounted(self):
+        recipe = self.make_recipe()
+        CategorySummary.objects.filter(pk=recipe.category_id).delete()
+
+        recipe.is_published = False
+        recipe.save()
+        self.assertEqual(self.get_category_summary(recipe).published_count, 0)
+
+        recipe.is_published = True
+        recipe.save()
+        CategorySummary.objects.filter(pk=recipe.category_id).update(
+            published_count=0)
+        recipe.is_published = False
+        recipe.save()
+        self.assertEqual(self.get_category_summary(recipe).published_count, 0)
+
+    def test_renaming_updates_summary_name(self):
+        recipe = self.make_recipe()
+        recipe.category.name = 'Renamed'
+        recipe.category.save()
+
+        self.assertEqual(self.get_category_summary(recipe).name, 'Renamed')
+
+    def test_reconcile_summaries_fixes_drifted_rows(self):
+        recipe = self.make_recipe()
+        Recipe.objects.filter(pk=recipe.pk).update(is_published=False)
+        output = StringIO()
+
+        call_command('reconcile_summaries', stdout=output)
+
+        self.assertIn('2 were out of date', output.getvalue())
+        self.assertIn('SiteSummary 1', output.getvalue())
+        self.assertEqual(self.get_category_summary(recipe).published_count, 0)
+        self.assertEqual(get_published_count(), 0)
+
+    def test_site_summary_follows_publications_and_deletions(self):
+        recipes = self.criar_recipes_em_lote(2)
+        self.assertEqual(get_published_count(), 2)
+
+        recipes[0].is_published = False
+        recipes[0].save()
+        self.assertEqual(get_published_count(), 1)
+
+        recipes[0].title = 'Draft edit'
+        recipes[0].save()
+        recipes[1].delete()
+        self.assertEqual(get_published_count(), 0)
+        self.assertIsNone(
+            SiteSummary.objects.get(pk=SITE_SUMMARY_PK).newest_recipe_id)
+
+    def test_home_pages_count_from_site_summary(self):
+        self.criar_recipes_em_lote(2)
+
+        for url in (reverse('recipes:home'), reverse('recipes:recipes_api_v1')):
+            with CaptureQueriesContext(connection) as context:
+                self.client.get(url)
+
+            sql = ' '.join(query['sql'] for query in context.captured_queries)
+            self.assertNotIn('COUNT(', sql)
+
+    def test_category_page_uses_summary_for_404_title_and_count(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:category', args=(recipe.category_id,))
+
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+
+        self.assertIn('Category', response.context['title'])
+        self.assertEqual(
+            response.context['recipes'].paginator.count, 1
+        )
+
+        recipe.is_published = False
+        recipe.save()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_tag_page_uses_summary_for_title(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='Salgado')
+        recipe.tags.add(tag)
+
+        response = self.client.get(reverse('recipes:tag', args=(tag.slug,)))
+
+        self.assertEqual(response.context['page_title'], 'Salgado - Tag |')
+        self.assertEqual(len(response.context['recipes']), 1)
+        self.assertEqual(
+            response.context['recipes'].paginator.count, 1
+        )
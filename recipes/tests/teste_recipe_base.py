@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from recipes.models import Category, Recipe, User
 
@@ -72,4 +73,5 @@ class RecipeMixin:
 
 class RecipeTestBase(TestCase, RecipeMixin):
     def setUp(self) -> None:
+        cache.clear()
         return super().setUp()
@@ -0,0 +1,53 @@
+from utils.strings import normalize_text
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_title_normalized(recipe_model, batch_size=BACKFILL_BATCH_SIZE):
+    """
+    Preenche title_normalized das receitas que ainda não têm o campo.
+
+    Recebe o model como parâmetro para servir tanto à migration (model
+    histórico) quanto ao comando backfill_title_normalized. Receitas cujo
+    título já existe ficam com NULL e seus ids são devolvidos para que
+    alguém renomeie.
+    """
+    updated = 0
+    duplicated_ids = []
+    last_id = 0
+
+    while True:
+        recipes = list(
+            recipe_model.objects.filter(
+                id__gt=last_id,
+                title_normalized__isnull=True
+            ).order_by('id').only('id', 'title')[:batch_size]
+        )
+
+        if not recipes:
+            return updated, duplicated_ids
+
+        last_id = recipes[-1].id
+
+        for recipe in recipes:
+            recipe.title_normalized = normalize_text(recipe.title)
+
+        taken = set(
+            recipe_model.objects.filter(
+                title_normalized__in={
+                    recipe.title_normalized for recipe in recipes
+                }
+            ).values_list('title_normalized', flat=True)
+        )
+
+        to_update = []
+        for recipe in recipes:
+            if recipe.title_normalized in taken:
+                duplicated_ids.append(recipe.id)
+                continue
+
+            taken.add(recipe.title_normalized)
+            to_update.append(recipe)
+
+        recipe_model.objects.bulk_update(to_update, ['title_normalized'])
+        updated += len(to_update)
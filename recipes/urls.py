@@ -1,9 +1,11 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import SimpleRouter
 from rest_framework_simplejwt.views import (TokenObtainPairView,
                                             TokenRefreshView, TokenVerifyView)
 
 from recipes import views
+from recipes.views import asynchronous
 
 app_name = 'recipes'
 
@@ -14,11 +16,24 @@ recipe_api_v2_router.register(
     basename='recipe-api'
 )
 
+if settings.RECIPES_ASYNC_VIEWS:
+    home_view = asynchronous.recipe_list_home
+    search_view = asynchronous.recipe_list_search
+    detail_view = asynchronous.recipe_detail
+    api_v1_list_view = asynchronous.recipe_list_api_v1
+    api_v1_detail_view = asynchronous.recipe_detail_api_v1
+else:
+    home_view = views.RecipeListViewHome.as_view()
+    search_view = views.RecipeListViewSearch.as_view()
+    detail_view = views.RecipeDetail.as_view()
+    api_v1_list_view = views.RecipeListViewHomeApi.as_view()
+    api_v1_detail_view = views.RecipeDetailApi.as_view()
+
 urlpatterns = [
     # /
-    path('', views.RecipeListViewHome.as_view(), name="home"),
+    path('', home_view, name="home"),
     path('recipes/search/',
-         views.RecipeListViewSearch.as_view(),
+         search_view,
          name="search"
          ),
     path('recipes/tags/<slug:slug>',
@@ -30,14 +45,16 @@ urlpatterns = [
          name="category"
          ),
     # /recipe
-    path('recipes/<int:pk>/', views.RecipeDetail.as_view(), name="recipe"),
+    path('recipes/<int:pk>/', detail_view, name="recipe"),
     path('recipes/api/v1/',
-         views.RecipeListViewHomeApi.as_view(), name="recipes_api_v1"),
+         api_v1_list_view, name="recipes_api_v1"),
     path('recipes/api/v1/<int:pk>/',
-         views.RecipeDetailApi.as_view(), name="recipes_api_v1_detail"),
+         api_v1_detail_view, name="recipes_api_v1_detail"),
     path('recipes/theory/', views.theory, name='theory',),
     path('recipes/api/v2/tag/<int:pk>', views.recipe_api_tag,
          name='recipes_api_v2_tag'),
+    path('recipes/api/v2/export/', views.recipe_api_export,
+         name='recipes_api_v2_export'),
 
     path('recipes/api/token/',
          TokenObtainPairView.as_view(), name='token_obtain_pair'),
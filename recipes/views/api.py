@@ -1,19 +1,174 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from datetime import datetime
+from functools import partial
+
+from django.db.models import F, Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
-from rest_framework.decorators import api_view
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.permissions import (IsAuthenticated,
+                                        IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.viewsets import ModelViewSet
 from tag.models import Tag
 
+from ..conditional import (conditional_get, get_detail_validators,
+                           get_page_validators)
+from ..export import iter_ndjson_lines, parse_since
+from ..filters import (DEFAULT_ORDERING, RecipeAPIFilterSerializer,
+                       parse_ordering)
 from ..models import Recipe
 from ..permissions import IsOwner
-from ..serializers import RecipeSerializer, TagSerializer
+from ..serializers import (RecipeFieldSelection, RecipeReadSerializer,
+                           RecipeSerializer, TagSerializer)
+
 
+class RecipeAPIV2Pagination(BasePagination):
+    """
+    Paginação por cursor (keyset) sobre (coluna da ordenação, id): cada
+    página é um SELECT que começa na posição do cursor e para no LIMIT,
+    sem COUNT nem OFFSET. Páginas profundas custam o mesmo que a
+    primeira e receitas publicadas no meio da navegação não repetem nem
+    pulam itens.
+
+    O cursor leva a ordenação em que foi gerado; um cursor de outra
+    ordenação é recusado.
+    """
 
-class RecipeAPIV2Pagination(PageNumberPagination):
     page_size = 5
+    cursor_query_param = 'cursor'
+
+    def __init__(self):
+        self.request = None
+        self.ordering = DEFAULT_ORDERING
+        self.direction = None
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    def encode_cursor(self, direction, recipe):
+        column, _ = parse_ordering(self.ordering)
+        value = getattr(recipe, column)
+
+        if isinstance(value, datetime):
+            value = value.isoformat()
+
+        raw = json.dumps([direction, self.ordering, value, recipe.id])
+        return urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        column, _ = parse_ordering(self.ordering)
+
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            direction, ordering, value, pk = json.loads(
+                urlsafe_b64decode(cursor + padding))
+        except (ValueError, TypeError, UnicodeError):
+            raise ValidationError({'cursor': ['Invalid cursor.']})
+
+        if column == 'created_at' and isinstance(value, str):
+            value = parse_datetime(value)
+
+        if direction not in ('next', 'prev') or \
+                ordering != self.ordering or \
+                not isinstance(pk, int) or \
+                not isinstance(value, datetime if column == 'created_at'
+                               else int):
+            raise ValidationError({'cursor': ['Invalid cursor.']})
+
+        return direction, value, pk
+
+    def get_position_filter(self, column, descending, value, pk):
+        after = 'lt' if descending else 'gt'
+
+        if column == 'id':
+            return Q(**{f'id__{after}': pk})
+
+        # O >=/<= dá ao banco o início da faixa no índice; o OR só
+        # desempata as receitas com o mesmo valor
+        return Q(**{f'{column}__{after}e': value}) & (
+            Q(**{f'{column}__{after}': value}) | Q(**{f'id__{after}': pk})
+        )
+
+    def get_page_queryset(self, queryset, request, ordering,
+                          id_expression=None):
+        """
+        Consulta da página (page_size + 1 linhas, na ordem do banco).
+        `id_expression` troca a coluna do id na ordenação (ver
+        RecipeAPIFilterSerializer.get_id_expression)
+        """
+        self.request = request
+        self.ordering = ordering
+        column, descending = parse_ordering(ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            self.direction, value, pk = self.decode_cursor(cursor)
+
+            # Voltando, a consulta anda no sentido contrário da ordenação
+            if self.direction == 'prev':
+                descending = not descending
+
+            queryset = queryset.filter(
+                self.get_position_filter(column, descending, value, pk))
+
+        id_expression = id_expression or F('id')
+        order_by = [
+            id_expression.desc() if descending else id_expression.asc()
+        ]
+        if column != 'id':
+            order_by.insert(0, f'-{column}' if descending else column)
+
+        return queryset.order_by(*order_by)[:self.page_size + 1]
+
+    def get_page(self, recipes):
+        has_more = len(recipes) > self.page_size
+        recipes = recipes[:self.page_size]
+
+        if self.direction == 'prev':
+            recipes.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, self.direction == 'next'
+
+        self.next_cursor = self.encode_cursor('next', recipes[-1]) \
+            if recipes and has_next else None
+        self.previous_cursor = self.encode_cursor('prev', recipes[0]) \
+            if recipes and has_previous else None
+
+        return recipes
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if view is None:
+            ordering, id_expression = DEFAULT_ORDERING, None
+        else:
+            ordering = view.get_ordering()
+            id_expression = view.get_filters().get_id_expression()
+
+        return self.get_page(list(self.get_page_queryset(
+            queryset, request, ordering, id_expression)))
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param,
+            cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_link(self.next_cursor)),
+            ('previous', self.get_link(self.previous_cursor)),
+            ('results', data),
+        ]))
 
 
 class RecipeAPIV2ViewSet(ModelViewSet):
@@ -24,6 +179,10 @@ class RecipeAPIV2ViewSet(ModelViewSet):
     http_method_names = ['get', 'options', 'head', 'patch', 'post', 'delete']
 
     def get_serializer(self, *args, **kwargs):
+        if self.request.method in ('GET', 'HEAD'):
+            selection = self.get_field_selection()
+            kwargs.setdefault('fields', selection.fields)
+            kwargs.setdefault('expand', selection.expand)
         return super().get_serializer(*args, **kwargs)
 
     def get_serializer_class(self):
@@ -33,15 +192,85 @@ class RecipeAPIV2ViewSet(ModelViewSet):
         context = super().get_context_data(**kwargs)
         return context
 
+    def get_filters(self):
+        """Filtros e ordenação da listagem, validados (400 se inválidos)"""
+        if not hasattr(self, '_filters'):
+            serializer = RecipeAPIFilterSerializer(
+                data=self.request.query_params)
+            serializer.is_valid(raise_exception=True)
+            self._filters = serializer
+
+        return self._filters
+
+    def get_ordering(self):
+        return self.get_filters().validated_data['ordering']
+
+    def get_field_selection(self):
+        """?fields= e ?expand= das leituras, validados (400 se inválidos)"""
+        if not hasattr(self, '_field_selection'):
+            self._field_selection = RecipeFieldSelection.from_query_params(
+                self.request.query_params)
+
+        return self._field_selection
+
     def get_queryset(self):
         qs = super().get_queryset()
 
-        category_id = self.request.query_params.get('category_id', '')
-        if category_id != '' and category_id.isnumeric():
-            qs = qs.filter(category_id=category_id)
+        if self.action == 'list':
+            qs = self.get_filters().filter_queryset(qs)
+
+        if self.request.method in ('GET', 'HEAD'):
+            # A coluna da ordenação vai no cursor da página
+            extra_columns = [parse_ordering(self.get_ordering())[0]] \
+                if self.action == 'list' else []
+            qs = self.get_field_selection().prune_queryset(
+                qs, *extra_columns)
 
         return qs
 
+    def list(self, request, *args, **kwargs):
+        page_queryset = self.paginator.get_page_queryset(
+            self.filter_queryset(self.get_queryset()),
+            request,
+            self.get_ordering(),
+            self.get_filters().get_id_expression()
+        )
+        etag, last_modified = get_page_validators(
+            page_queryset, request.query_params.urlencode()
+        )
+        return conditional_get(
+            request, etag, last_modified,
+            partial(self.fast_list, page_queryset)
+        )
+
+    def fast_list(self, page_queryset):
+        """
+        Mesmo resultado de ModelViewSet.list, mas serializando com
+        RecipeReadSerializer. RecipeSerializer continua sendo usado para
+        create/retrieve/patch.
+        """
+        page = self.paginator.get_page(list(page_queryset))
+        selection = self.get_field_selection()
+        serializer = RecipeReadSerializer(
+            page,
+            many=True,
+            context=self.get_serializer_context(),
+            fields=selection.fields,
+            expand=selection.expand,
+        )
+
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = get_detail_validators(
+            self.get_queryset(), self.kwargs.get('pk', ''),
+            request.query_params.urlencode()
+        )
+        return conditional_get(
+            request, etag, last_modified,
+            partial(super().retrieve, request, *args, **kwargs)
+        )
+
     def get_object(self):
         pk = self.kwargs.get('pk', '')
         obj = get_object_or_404(
@@ -91,3 +320,27 @@ def recipe_api_tag(request, pk):
     serializer = TagSerializer(instance=tag, many=False,
                                context={'request': request})
     return Response(serializer.data)
+
+
+@api_view()
+@permission_classes([IsAuthenticated, ])
+def recipe_api_export(request):
+    since = request.query_params.get('since', '')
+    since_datetime = None
+
+    if since:
+        try:
+            since_datetime = parse_since(since)
+        except ValueError as error:
+            return Response(
+                {'since': [str(error)]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    return StreamingHttpResponse(
+        iter_ndjson_lines(
+            since=since_datetime,
+            context={'request': request}
+        ),
+        content_type='application/x-ndjson'
+    )
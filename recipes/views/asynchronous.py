@@ -0,0 +1,147 @@
+"""
+Versões assíncronas das páginas de listagem, detalhe, busca e da API v1,
+usadas quando o projeto roda pelo project.asgi com RECIPES_ASYNC_VIEWS=1
+(opt-in).
+
+O Django 4.0 ainda não tem ORM assíncrono: as consultas e a renderização
+dos templates (que acessam request.user e o cache de cards) rodam via
+sync_to_async, e a view só segura o event loop enquanto espera.
+"""
+from asgiref.sync import sync_to_async
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils import translation
+from utils.pagination import (PAGINATION_MODE, RECIPES_PER_PAGE,
+                              make_keyset_pagination, make_pagination)
+
+from recipes.cache import cache_anonymous_page
+from recipes.conditional import (aconditional_get, get_detail_validators,
+                                 get_list_validators)
+from recipes.models import Recipe
+from recipes.search import get_search_backend
+from recipes.summaries import get_published_count
+
+from .site import recipe_to_dict
+
+arender = sync_to_async(render)
+
+
+def get_published_recipes():
+    return Recipe.objects.filter(
+        is_published=True
+    ).select_related(
+        'author', 'category'
+    ).prefetch_related(
+        'tags', 'author__profile'
+    ).order_by('-id')
+
+
+def get_detail_recipes():
+    return Recipe.objects.filter(
+        is_published=True
+    ).select_related('author__profile', 'category').prefetch_related('tags')
+
+
+@sync_to_async
+def paginate(request, queryset, pagination_mode=None, count=None):
+    if (pagination_mode or PAGINATION_MODE) == 'keyset':
+        page_obj, pagination_range = make_keyset_pagination(
+            request, queryset, RECIPES_PER_PAGE)
+    else:
+        page_obj, pagination_range = make_pagination(
+            request, queryset, RECIPES_PER_PAGE, count=count)
+
+    # Avalia a página aqui para o template não consultar o banco
+    page_obj.object_list = list(page_obj.object_list)
+    return page_obj, pagination_range
+
+
+async def render_list(request, template_name, queryset,
+                      pagination_mode=None, count=None, **extra_context):
+    page_obj, pagination_range = await paginate(
+        request, queryset, pagination_mode, count)
+
+    return await arender(request, template_name, {
+        'recipes': page_obj,
+        'pagination_range': pagination_range,
+        'html_language': translation.get_language(),
+        **extra_context,
+    })
+
+
+@cache_anonymous_page
+async def recipe_list_home(request):
+    return await render_list(
+        request, 'recipes/pages/home.html', get_published_recipes(),
+        count=await sync_to_async(get_published_count)()
+    )
+
+
+async def recipe_list_search(request):
+    search_term = request.GET.get('q', '')
+
+    if not search_term:
+        raise Http404()
+
+    queryset = get_search_backend().search(
+        get_published_recipes(), search_term
+    )
+
+    # Busca fica no Paginator: o keyset trocaria a relevância pelo id
+    return await render_list(
+        request, 'recipes/pages/search.html', queryset,
+        pagination_mode='page',
+        page_title=f'Search for "{search_term}" |',
+        search_term=search_term,
+        additional_url_query=f'&q={search_term}',
+    )
+
+
+@cache_anonymous_page(scope='recipe:{pk}')
+async def recipe_detail(request, pk):
+    queryset = get_detail_recipes()
+    etag, last_modified = await sync_to_async(get_detail_validators)(
+        queryset, pk, translation.get_language()
+    )
+
+    async def get_response():
+        recipe = await sync_to_async(get_object_or_404)(queryset, pk=pk)
+        return await arender(request, 'recipes/pages/recipe-view.html', {
+            'recipe': recipe,
+            'is_detail_page': True,
+        })
+
+    return await aconditional_get(request, etag, last_modified, get_response)
+
+
+async def recipe_list_api_v1(request):
+    queryset = get_published_recipes()
+    total = await sync_to_async(get_published_count)()
+    etag, last_modified = await sync_to_async(get_list_validators)(
+        queryset, total, request.GET.urlencode()
+    )
+
+    @sync_to_async
+    def get_page_values():
+        page_obj, _ = make_pagination(
+            request, queryset.values(), RECIPES_PER_PAGE, count=total)
+        return list(page_obj.object_list)
+
+    async def get_response():
+        return JsonResponse(await get_page_values(), safe=False)
+
+    return await aconditional_get(request, etag, last_modified, get_response)
+
+
+async def recipe_detail_api_v1(request, pk):
+    queryset = Recipe.objects.filter(is_published=True)
+    etag, last_modified = await sync_to_async(get_detail_validators)(
+        queryset, pk, translation.get_language()
+    )
+
+    async def get_response():
+        recipe = await sync_to_async(get_object_or_404)(queryset, pk=pk)
+        recipe_dict = await sync_to_async(recipe_to_dict)(request, recipe)
+        return JsonResponse(recipe_dict, safe=False)
+
+    return await aconditional_get(request, etag, last_modified, get_response)
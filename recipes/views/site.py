@@ -1,16 +1,24 @@
-from django.db.models import F, Q, Value
+from functools import partial
+
+from django.db.models import F, Value
 from django.db.models.aggregates import Avg, Count, Max, Min, Sum
 from django.db.models.functions import Concat
 from django.forms.models import model_to_dict
 from django.http import Http404, JsonResponse
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.utils import translation
+from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
 from django.views.generic import DetailView, ListView
-from tag.models import Tag
-from utils.pagination import RECIPES_PER_PAGE, make_pagination
+from utils.pagination import (PAGINATION_MODE, RECIPES_PER_PAGE,
+                              make_keyset_pagination, make_pagination)
 
-from recipes.models import Recipe
+from recipes.cache import cache_anonymous_page
+from recipes.conditional import (conditional_get, get_detail_validators,
+                                 get_list_validators)
+from recipes.models import CategorySummary, Recipe, TagSummary
+from recipes.search import get_search_backend
+from recipes.summaries import get_published_count
 
 
 class RecipeListViewBase(ListView):
@@ -18,6 +26,7 @@ class RecipeListViewBase(ListView):
     context_object_name = 'recipes'
     paginate_by = None
     ordering = ['-id']
+    pagination_mode = PAGINATION_MODE
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset()
@@ -29,11 +38,20 @@ class RecipeListViewBase(ListView):
 
         return qs
 
+    def get_pagination_count(self):
+        return None
+
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
 
-        page_obj, pagination_range = make_pagination(
-            self.request, ctx.get(self.context_object_name), RECIPES_PER_PAGE)
+        if self.pagination_mode == 'keyset':
+            page_obj, pagination_range = make_keyset_pagination(
+                self.request, ctx.get(self.context_object_name),
+                RECIPES_PER_PAGE)
+        else:
+            page_obj, pagination_range = make_pagination(
+                self.request, ctx.get(self.context_object_name),
+                RECIPES_PER_PAGE, count=self.get_pagination_count())
 
         html_language = translation.get_language()
 
@@ -46,15 +64,34 @@ class RecipeListViewBase(ListView):
         return ctx
 
 
+@method_decorator(cache_anonymous_page, name='dispatch')
 class RecipeListViewHome(RecipeListViewBase):
     template_name = 'recipes/pages/home.html'
 
+    def get_pagination_count(self):
+        return get_published_count()
+
 
 class RecipeListViewHomeApi(RecipeListViewBase):
     template_name = 'recipes/pages/home.html'
 
+    def get_pagination_count(self):
+        if not hasattr(self, '_published_count'):
+            self._published_count = get_published_count()
+        return self._published_count
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = get_list_validators(
+            self.get_queryset(), self.get_pagination_count(),
+            request.GET.urlencode()
+        )
+        return conditional_get(
+            request, etag, last_modified,
+            partial(super().get, request, *args, **kwargs)
+        )
+
     def render_to_response(self, context, **response_kwargs):
-        recipe_obj = self.get_context_data()['recipes']
+        recipe_obj = context['recipes']
         recipes = recipe_obj.object_list.values()
 
         return JsonResponse(
@@ -63,29 +100,37 @@ class RecipeListViewHomeApi(RecipeListViewBase):
         )
 
 
+@method_decorator(
+    cache_anonymous_page(scope='category:{category_id}'), name='dispatch'
+)
 class RecipeListViewCategory(RecipeListViewBase):
     template_name = 'recipes/pages/category.html'
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
 
+        self.summary = get_object_or_404(
+            CategorySummary,
+            pk=self.kwargs.get('category_id'),
+            published_count__gt=0
+        )
+
         qs = qs.filter(
-            category__id=self.kwargs.get('category_id'),
+            category__id=self.summary.pk,
             is_published=True
         )
 
-        if not qs:
-            raise Http404()
-
         return qs
 
+    def get_pagination_count(self):
+        return self.summary.published_count
+
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
         category_translation = _('Category')
-        category_name = ctx.get('recipes')[0].category.name
 
         ctx.update({
-            'title': f'{category_name} - {category_translation} | '
+            'title': f'{self.summary.name} - {category_translation} | '
         })
 
         return ctx
@@ -93,6 +138,8 @@ class RecipeListViewCategory(RecipeListViewBase):
 
 class RecipeListViewSearch(RecipeListViewBase):
     template_name = 'recipes/pages/search.html'
+    # O keyset ordena por id e jogaria fora a ordem por relevância
+    pagination_mode = 'page'
 
     def get_queryset(self, *args, **kwargs):
         search_term = self.request.GET.get('q', '')
@@ -102,12 +149,9 @@ class RecipeListViewSearch(RecipeListViewBase):
 
         qs = super().get_queryset(*args, **kwargs)
 
-        qs = qs.filter(
-            Q(
-                Q(title__icontains=search_term) |
-                Q(description__icontains=search_term)
-            ),
-            is_published=True
+        qs = get_search_backend().search(
+            qs.filter(is_published=True),
+            search_term
         )
 
         return qs
@@ -125,6 +169,9 @@ class RecipeListViewSearch(RecipeListViewBase):
         return ctx
 
 
+@method_decorator(
+    cache_anonymous_page(scope='recipe:{pk}'), name='dispatch'
+)
 class RecipeDetail(DetailView):
     model = Recipe
     context_object_name = 'recipe'
@@ -133,9 +180,21 @@ class RecipeDetail(DetailView):
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
         qs = qs.filter(is_published=True)
+        qs = qs.select_related('author__profile', 'category')
+        qs = qs.prefetch_related('tags')
 
         return qs
 
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = get_detail_validators(
+            self.get_queryset(), self.kwargs.get('pk'),
+            translation.get_language()
+        )
+        return conditional_get(
+            request, etag, last_modified,
+            partial(super().get, request, *args, **kwargs)
+        )
+
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx.update({'is_detail_page': True})
@@ -143,26 +202,32 @@ class RecipeDetail(DetailView):
         return ctx
 
 
-class RecipeDetailApi(RecipeDetail):
+def recipe_to_dict(request, recipe):
+    recipe_dict = model_to_dict(recipe)
 
-    def render_to_response(self, context, **response_kwargs):
-        recipe = self.get_context_data()['recipe']
-        recipe_dict = model_to_dict(recipe)
+    recipe_dict['created_at'] = str(recipe.created_at)
+    recipe_dict['updated_at'] = str(recipe.updated_at)
+    recipe_dict['tags'] = [tag.id for tag in recipe_dict['tags']]
 
-        recipe_dict['created_at'] = str(recipe.created_at)
-        recipe_dict['updated_at'] = str(recipe.updated_at)
+    if recipe_dict.get('cover'):
+        recipe_dict['cover'] = request.build_absolute_uri() + \
+            recipe_dict['cover'].url[1:]
+    else:
+        recipe_dict['cover'] = ''
 
-        if recipe_dict.get('cover'):
-            recipe_dict['cover'] = self.request.build_absolute_uri() + \
-                recipe_dict['cover'].url[1:]
-        else:
-            recipe_dict['cover'] = ''
+    del recipe_dict['is_published']
+    del recipe_dict['preparation_steps_is_html']
 
-        del recipe_dict['is_published']
-        del recipe_dict['preparation_steps_is_html']
+    return recipe_dict
+
+
+class RecipeDetailApi(RecipeDetail):
+
+    def render_to_response(self, context, **response_kwargs):
+        recipe = self.get_context_data()['recipe']
 
         return JsonResponse(
-            recipe_dict,
+            recipe_to_dict(self.request, recipe),
             safe=False
         )
 
@@ -196,22 +261,34 @@ def theory(request, *args, **kwargs):
     )
 
 
+@method_decorator(
+    cache_anonymous_page(scope='tag:{slug}'), name='dispatch'
+)
 class RecipeListViewTag(RecipeListViewBase):
     template_name = 'recipes/pages/tag.html'
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
 
+        self.summary = TagSummary.objects.filter(
+            slug=self.kwargs.get('slug', '')
+        ).first()
+
+        if self.summary is None:
+            return qs.none()
+
         qs = qs.filter(
-            tags__slug=self.kwargs.get('slug', '')
+            tags__id=self.summary.pk
         )
 
         return qs
 
+    def get_pagination_count(self):
+        return self.summary.published_count if self.summary else 0
+
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
-        page_title = Tag.objects.filter(
-            slug=self.kwargs.get('slug', '')).first()
+        page_title = self.summary.name if self.summary else None
 
         if not page_title:
             page_title = 'No recipes found'
@@ -1,6 +1,7 @@
 import time
 
 from django.contrib.staticfiles.testing import StaticLiveServerTestCase
+from django.core.cache import cache
 from selenium.webdriver.common.by import By
 from utils.browser import make_chrome_browser
 
@@ -9,6 +10,8 @@ class AuthorsBaseTest(StaticLiveServerTestCase):
 
     def setUp(self) -> None:
         self.browser = make_chrome_browser()
+        # Os buckets do AuthThrottleMiddleware ficam no cache
+        cache.clear()
         return super().setUp()
 
     def tearDown(self) -> None:
@@ -0,0 +1,131 @@
+import json
+import math
+import time
+import tracemalloc
+
+from utils.query_budget import QueryRecorder
+
+COMPARED_METRICS = ('p95_ms', 'queries', 'memory_kb')
+
+
+def percentile(values, pct):
+    """
+    Percentil pelo método nearest-rank.
+
+    >>> percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 50)
+    5
+    >>> percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 99)
+    10
+    >>> percentile([7], 95)
+    7
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def measure_call(call, iterations, warmup=0, setup=None):
+    """
+    Roda `call` `warmup` vezes sem medir, `iterations` vezes medindo só o
+    tempo e uma última vez com QueryRecorder e tracemalloc, que deixariam
+    as latências mais altas se estivessem ligados o tempo todo. `setup`
+    roda antes de cada chamada, fora da medição.
+    """
+    setup = setup or (lambda: None)
+
+    for _ in range(warmup):
+        setup()
+        call()
+
+    latencies = []
+    for _ in range(iterations):
+        setup()
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    setup()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+
+    with QueryRecorder() as recorder:
+        result = call()
+
+    _, peak = tracemalloc.get_traced_memory()
+    if not was_tracing:
+        tracemalloc.stop()
+
+    return result, {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'queries': recorder.count,
+        'memory_kb': round((peak - before) / 1024, 1),
+    }
+
+
+def compare_results(results, baseline, threshold):
+    """
+    Lista as regressões de `results` em relação a `baseline` (ambos no
+    formato {'routes': {nome: métricas}}): métricas de COMPARED_METRICS
+    que passaram de baseline * (1 + threshold). Consultas não têm
+    tolerância, qualquer consulta a mais é uma regressão.
+
+    >>> old = {'routes': {'home': {'p95_ms': 10, 'queries': 3}}}
+    >>> new = {'routes': {'home': {'p95_ms': 11, 'queries': 4}}}
+    >>> compare_results(new, old, 0.2)
+    [('home', 'queries', 3, 4)]
+    >>> compare_results(new, old, 0.05)
+    [('home', 'p95_ms', 10, 11), ('home', 'queries', 3, 4)]
+    """
+    regressions = []
+
+    for name, metrics in results['routes'].items():
+        old_metrics = baseline['routes'].get(name)
+
+        if old_metrics is None:
+            continue
+
+        for metric in COMPARED_METRICS:
+            old = old_metrics.get(metric)
+            new = metrics.get(metric)
+
+            if old is None or new is None:
+                continue
+
+            limit = old if metric == 'queries' else old * (1 + threshold)
+
+            if new > limit:
+                regressions.append((name, metric, old, new))
+
+    return regressions
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_results(path, results):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def run_in_django(target, *args):
+    """
+    Alvo de multiprocessing (contexto 'spawn'): sobe o Django no processo
+    novo e só então importa e chama `target` ('modulo.funcao'), que pode
+    estar num módulo que importa models.
+    """
+    import django
+    from django.utils.module_loading import import_string
+
+    django.setup()
+    return import_string(target)(*args)
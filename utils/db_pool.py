@@ -0,0 +1,170 @@
+import os
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils.deprecation import MiddlewareMixin
+
+STATS_CACHE_PREFIX = 'db_pool_stats'
+STATS_CACHE_TIMEOUT = 60 * 5
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+_local = threading.local()
+_last_published = 0.0
+
+
+def get_health_checks_enabled():
+    return getattr(settings, 'DATABASE_CONN_HEALTH_CHECKS', True)
+
+
+def get_idle_timeout():
+    return getattr(settings, 'DATABASE_CONN_IDLE_TIMEOUT', 0)
+
+
+def get_stats_interval():
+    return getattr(settings, 'DATABASE_POOL_STATS_INTERVAL', 10)
+
+
+def increment(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def get_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def get_thread_state():
+    if not hasattr(_local, 'last_used'):
+        _local.last_used = {}
+        _local.was_open = {}
+    return _local
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    increment('connects')
+
+
+def check_out_connections():
+    """
+    Roda antes de cada request. O close_old_connections do Django já
+    fechou as conexões que passaram do CONN_MAX_AGE; aqui as que
+    sobraram são testadas (pre-ping) e as paradas há muito tempo fecham.
+    Conexões fechadas reabrem sob demanda na primeira consulta.
+    """
+    state = get_thread_state()
+    now = time.monotonic()
+
+    for connection in connections.all():
+        alias = connection.alias
+
+        if connection.connection is None:
+            # Estava aberta no fim da última request e o Django fechou
+            if state.was_open.pop(alias, False):
+                increment('closed')
+            continue
+
+        idle_timeout = get_idle_timeout()
+        idle_for = now - state.last_used.get(alias, now)
+
+        if idle_timeout and idle_for > idle_timeout:
+            connection.close()
+            increment('idle_reaped')
+            continue
+
+        if get_health_checks_enabled() and not connection.is_usable():
+            connection.close()
+            increment('health_check_failures')
+            continue
+
+        increment('reuses')
+
+    increment('checkouts')
+
+
+def check_in_connections():
+    state = get_thread_state()
+    now = time.monotonic()
+
+    for connection in connections.all():
+        is_open = connection.connection is not None
+        state.was_open[connection.alias] = is_open
+
+        if is_open:
+            state.last_used[connection.alias] = now
+
+    publish_stats()
+
+
+def get_stats_key(pid):
+    return f'{STATS_CACHE_PREFIX}:{pid}'
+
+
+def publish_stats(force=False):
+    """
+    Cada worker grava as próprias estatísticas no cache (no máximo a cada
+    DATABASE_POOL_STATS_INTERVAL segundos) para o comando db_pool_stats.
+    Com o LocMemCache só o próprio processo enxerga os números.
+    """
+    global _last_published
+
+    now = time.monotonic()
+    if not force and now - _last_published < get_stats_interval():
+        return
+
+    _last_published = now
+    pid = os.getpid()
+
+    cache.set(get_stats_key(pid), get_stats(), STATS_CACHE_TIMEOUT)
+
+    workers = set(cache.get(STATS_CACHE_PREFIX, []))
+    if pid not in workers:
+        workers.add(pid)
+        cache.set(STATS_CACHE_PREFIX, sorted(workers), None)
+
+
+def get_published_stats():
+    """Estatísticas publicadas por worker ({pid: stats}) ainda no cache"""
+    workers = cache.get(STATS_CACHE_PREFIX, [])
+    published = cache.get_many([get_stats_key(pid) for pid in workers])
+
+    return {
+        pid: published[get_stats_key(pid)]
+        for pid in workers if get_stats_key(pid) in published
+    }
+
+
+class PersistentConnectionMiddleware(MiddlewareMixin):
+    """
+    Complementa o CONN_MAX_AGE (conexões persistentes por thread) com
+    pre-ping, fechamento de conexões ociosas e contadores: checkouts
+    (requests), reuses, connects, closed (recicladas pelo Django),
+    idle_reaped e health_check_failures.
+
+    Não há contador de waits: não existe pool compartilhado, cada thread
+    tem a sua própria conexão e nenhuma request espera outra liberar uma.
+    O custo que sobra é abrir conexão, medido por connects (reconexões).
+
+    No ASGI os hooks rodam via sync_to_async, na mesma thread das
+    consultas da request.
+    """
+
+    def process_request(self, request):
+        check_out_connections()
+
+    def process_response(self, request, response):
+        check_in_connections()
+        return response
@@ -0,0 +1,200 @@
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import (ImproperlyConfigured,
+                                    SuspiciousFileOperation)
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from utils.staticfiles import get_file_etag, is_not_modified
+
+MEDIA_SERVE_MODES = ('django', 'x-accel-redirect', 'x-sendfile')
+RANGE_REGEX = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(ValueError):
+    ...
+
+
+def get_media_serve_mode():
+    mode = getattr(settings, 'MEDIA_SERVE_MODE', 'django')
+
+    if mode not in MEDIA_SERVE_MODES:
+        raise ImproperlyConfigured(
+            f'MEDIA_SERVE_MODE must be one of {MEDIA_SERVE_MODES}, '
+            f'got {mode!r}'
+        )
+
+    return mode
+
+
+def parse_range(header, size):
+    """
+    (início, fim inclusivo) do Range. None quando não há um intervalo
+    único e válido (a resposta vai inteira) e RangeNotSatisfiable quando
+    o intervalo começa depois do fim do arquivo.
+
+    >>> parse_range('bytes=0-99', 1000)
+    (0, 99)
+    >>> parse_range('bytes=900-', 1000)
+    (900, 999)
+    >>> parse_range('bytes=-100', 1000)
+    (900, 999)
+    >>> parse_range('bytes=500-2000', 1000)
+    (500, 999)
+    >>> parse_range('bytes=0-1,5-9', 1000) is None
+    True
+    >>> parse_range('bytes=1000-', 1000)  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    RangeNotSatisfiable: bytes=1000-
+    """
+    match = RANGE_REGEX.match(header or '')
+    if match is None:
+        return None
+
+    first, last = match.groups()
+
+    if first == '':
+        if last == '' or int(last) == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - int(last), 0), size - 1
+
+    first = int(first)
+    last = size - 1 if last == '' else min(int(last), size - 1)
+
+    if first > last:
+        if first >= size:
+            raise RangeNotSatisfiable(header)
+        return None
+
+    return first, last
+
+
+class FileRange:
+    """
+    Lê no máximo `length` bytes a partir de `start`. Como tem fileno e
+    tell, o wsgi.file_wrapper do gunicorn envia o intervalo com sendfile
+    (sem copiar para o processo), limitado pelo Content-Length; sem
+    file_wrapper o FileResponse lê em blocos de block_size.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def should_use_range(request, etag, mtime):
+    """If-Range: o intervalo só vale se o arquivo não mudou"""
+    if_range = request.META.get('HTTP_IF_RANGE')
+
+    if if_range is None:
+        return True
+
+    return if_range == etag or if_range == http_date(mtime)
+
+
+def set_validators(response, etag, mtime):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    response['Cache-Control'] = f'public, max-age={settings.MEDIA_MAX_AGE}'
+    return response
+
+
+def serve_file(request, full_path, file_stat, content_type):
+    etag = f'"{get_file_etag(file_stat)}"'
+    mtime = int(file_stat.st_mtime)
+    size = file_stat.st_size
+
+    if is_not_modified(request, etag, mtime):
+        return set_validators(HttpResponseNotModified(), etag, mtime)
+
+    byte_range = None
+    if should_use_range(request, etag, mtime):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return set_validators(response, etag, mtime)
+
+    start, end = byte_range or (0, size - 1)
+    length = end - start + 1
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    else:
+        response = FileResponse(
+            FileRange(open(full_path, 'rb'), start, length),
+            content_type=content_type
+        )
+
+    if byte_range is not None:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['Content-Length'] = length
+    response['Accept-Ranges'] = 'bytes'
+    return set_validators(response, etag, mtime)
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Arquivos do MEDIA_ROOT (capas das receitas e renditions). Conforme o
+    MEDIA_SERVE_MODE, entrega o arquivo para o proxy da frente
+    (X-Accel-Redirect do nginx, ver deploy/nginx-*.txt, ou X-Sendfile do
+    Apache/lighttpd) ou serve no processo em streaming, com Range, ETag e
+    Cache-Control, sem carregar o arquivo na memória do worker.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        file_stat = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404()
+
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404()
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    mode = get_media_serve_mode()
+
+    if mode == 'django':
+        return serve_file(request, full_path, file_stat, content_type)
+
+    response = HttpResponse(content_type=content_type)
+    response['Cache-Control'] = f'public, max-age={settings.MEDIA_MAX_AGE}'
+
+    if mode == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = \
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+    else:
+        response['X-Sendfile'] = full_path
+
+    return response
@@ -1,10 +1,14 @@
 import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from os import environ
 
 from django.core.paginator import Paginator
 
 RECIPES_PER_PAGE = int(environ.get('PER_PAGE', 9))
 
+# 'page' = Paginator com COUNT + OFFSET, 'keyset' = cursores sobre o id
+PAGINATION_MODE = environ.get('PAGINATION_MODE', 'page')
+
 
 def make_pagination_range(
     page_range, qtd_paginas, current_page
@@ -37,13 +41,18 @@ def make_pagination_range(
     }
 
 
-def make_pagination(request, queryset, per_page, qtd_paginas=4):
+def make_pagination(request, queryset, per_page, qtd_paginas=4, count=None):
     try:
         current_page = int(request.GET.get('page', 1))
     except ValueError:
         current_page = 1
 
     paginator = Paginator(queryset, per_page)
+
+    # Total já conhecido (ex.: CategorySummary) evita o COUNT(*)
+    if count is not None:
+        paginator.count = count
+
     page_obj = paginator.get_page(current_page)
 
     pagination_range = make_pagination_range(
@@ -53,3 +62,125 @@ def make_pagination(request, queryset, per_page, qtd_paginas=4):
     )
 
     return page_obj, pagination_range
+
+
+def encode_cursor(direction, key):
+    """
+    >>> decode_cursor(encode_cursor('next', 42))
+    ('next', 42)
+    """
+    raw = f'{direction}:{key}'.encode('ascii')
+    return urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    >>> decode_cursor('invalid cursor')
+    (None, None)
+    """
+    if not cursor:
+        return None, None
+
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        raw = urlsafe_b64decode(cursor + padding).decode('ascii')
+        direction, key = raw.split(':', 1)
+        key = int(key)
+    except (ValueError, UnicodeError):
+        return None, None
+
+    if direction not in ('next', 'prev'):
+        return None, None
+
+    return direction, key
+
+
+class KeysetPage:
+    """
+    Página de uma paginação por cursor. Imita a interface de
+    django.core.paginator.Page usada pelos templates, sem depender de
+    COUNT(*) ou OFFSET.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<KeysetPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def make_keyset_pagination(request, queryset, per_page, key='id'):
+    """
+    Paginação por cursor (keyset) sobre a ordenação '-<key>'.
+
+    Cada página é um único SELECT com WHERE key < cursor LIMIT per_page + 1,
+    então a página 5.000 custa o mesmo que a página 1.
+    """
+    direction, cursor_key = decode_cursor(request.GET.get('cursor', ''))
+    queryset = queryset.order_by()
+
+    if direction == 'next':
+        rows = queryset.filter(
+            **{f'{key}__lt': cursor_key}
+        ).order_by(f'-{key}')[:per_page + 1]
+    elif direction == 'prev':
+        rows = queryset.filter(
+            **{f'{key}__gt': cursor_key}
+        ).order_by(key)[:per_page + 1]
+    else:
+        rows = queryset.order_by(f'-{key}')[:per_page + 1]
+
+    rows = list(rows)
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if direction == 'prev':
+        rows.reverse()
+
+    first_key = getattr(rows[0], key) if rows else None
+    last_key = getattr(rows[-1], key) if rows else None
+
+    if direction == 'prev':
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, direction == 'next'
+
+    next_cursor = None
+    previous_cursor = None
+
+    if rows and has_next:
+        next_cursor = encode_cursor('next', last_key)
+    if rows and has_previous:
+        previous_cursor = encode_cursor('prev', first_key)
+
+    page_obj = KeysetPage(rows, next_cursor, previous_cursor)
+
+    pagination_range = {
+        'keyset': True,
+        'next_cursor': next_cursor,
+        'previous_cursor': previous_cursor,
+        'has_next': page_obj.has_next(),
+        'has_previous': page_obj.has_previous(),
+    }
+
+    return page_obj, pagination_range
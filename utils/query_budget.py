@@ -0,0 +1,231 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger(__name__)
+
+IN_PARAMS_REGEX = re.compile(r'IN \((%s, )*%s\)')
+QUERY_BUDGET_MODES = ('off', 'log', 'raise')
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+class QueryBudgetExceeded(AssertionError):
+    ...
+
+
+def get_query_budgets():
+    return getattr(settings, 'QUERY_BUDGETS', {})
+
+
+def get_query_budget_mode():
+    return getattr(settings, 'QUERY_BUDGET_MODE', 'log')
+
+
+def get_query_budget(view_name, method, budgets=None):
+    """
+    Orçamento da view para o método. Chaves só com o nome da URL valem
+    para leituras (GET/HEAD); escritas só têm orçamento declarado como
+    (nome, método).
+
+    >>> budgets = {'app:list': 5, ('app:list', 'POST'): 9}
+    >>> get_query_budget('app:list', 'HEAD', budgets)
+    5
+    >>> get_query_budget('app:list', 'POST', budgets)
+    9
+    >>> get_query_budget('app:list', 'PATCH', budgets) is None
+    True
+    """
+    budgets = get_query_budgets() if budgets is None else budgets
+    budget = budgets.get((view_name, method))
+
+    if budget is None and method in SAFE_METHODS:
+        budget = budgets.get(view_name)
+
+    return budget
+
+
+def get_sql_shape(sql):
+    """
+    Formato da consulta, sem os parâmetros: consultas com o mesmo formato
+    repetidas numa request costumam ser um N+1.
+
+    >>> get_sql_shape('SELECT * FROM t WHERE id IN (%s, %s, %s)')
+    'SELECT * FROM t WHERE id IN (...)'
+    >>> get_sql_shape('SELECT * FROM t WHERE id = %s')
+    'SELECT * FROM t WHERE id = %s'
+    """
+    return IN_PARAMS_REGEX.sub('IN (...)', sql)
+
+
+class QueryRecorder:
+    """
+    Registra as consultas de todos os bancos (primário e réplicas)
+    enquanto estiver ativo:
+
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.duration, recorder.get_duplicates()
+    """
+
+    def __init__(self):
+        self.queries = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'sql': sql,
+                'shape': get_sql_shape(sql),
+                'alias': context['connection'].alias,
+                'duration': time.perf_counter() - start,
+            })
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(query['duration'] for query in self.queries)
+
+    def get_duplicates(self):
+        counter = Counter(query['shape'] for query in self.queries)
+        return {shape: count for shape, count in counter.items() if count > 1}
+
+
+class QueryReport:
+    def __init__(self, view_name, recorder, budget=None):
+        self.view_name = view_name
+        self.recorder = recorder
+        self.budget = budget
+
+    @property
+    def count(self):
+        return self.recorder.count
+
+    @property
+    def duration(self):
+        return self.recorder.duration
+
+    @property
+    def duplicates(self):
+        return self.recorder.get_duplicates()
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.count > self.budget
+
+    def format(self):
+        """Lista numerada das consultas, marcando as que passaram do limite"""
+        lines = [
+            f'{self.view_name}: {self.count} queries '
+            f'(budget {self.budget}), {self.duration * 1000:.1f}ms'
+        ]
+
+        for number, query in enumerate(self.recorder.queries, start=1):
+            marker = '+' if self.budget is not None and \
+                number > self.budget else ' '
+            lines.append(f'{marker} {number}. [{query["alias"]}] '
+                         f'{query["sql"]}')
+
+        for shape, count in self.duplicates.items():
+            lines.append(f'! {count}x {shape}')
+
+        return '\n'.join(lines)
+
+
+def get_view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else None
+
+
+class QueryBudgetMiddleware(MiddlewareMixin):
+    """
+    Conta as consultas de cada request e compara com QUERY_BUDGETS, que é
+    indexado pelo nome da URL ('recipes:home', só leituras) ou por
+    (nome, método) (ver get_query_budget). Em QUERY_BUDGET_MODE 'log'
+    estouros viram um warning; em 'raise' (o modo dos testes, ligado no
+    conftest.py) viram QueryBudgetExceeded com a lista das consultas.
+
+    O relatório fica em response.query_report para o
+    QueryBudgetTestMixin. No ASGI os hooks rodam via sync_to_async, na
+    mesma thread das consultas da request.
+    """
+
+    def process_request(self, request):
+        if get_query_budget_mode() == 'off':
+            return
+
+        request._query_recorder = QueryRecorder().__enter__()
+
+    def process_response(self, request, response):
+        recorder = getattr(request, '_query_recorder', None)
+
+        if recorder is None:
+            return response
+
+        recorder.__exit__(None, None, None)
+        del request._query_recorder
+
+        view_name = get_view_name(request)
+        report = QueryReport(
+            view_name, recorder, get_query_budget(view_name, request.method)
+        )
+        response.query_report = report
+
+        if report.over_budget:
+            if get_query_budget_mode() == 'raise':
+                raise QueryBudgetExceeded(report.format())
+
+            logger.warning(
+                'Query budget exceeded for %s: %s > %s queries',
+                view_name, report.count, report.budget,
+                extra={'query_report': report.format()}
+            )
+
+        return response
+
+
+class QueryBudgetTestMixin:
+    """
+    Para TestCases: self.assertWithinQueryBudget(response) falha com a
+    lista das consultas quando a view passou do orçamento ou repetiu a
+    mesma consulta mais de `max_duplicates` vezes.
+    """
+
+    def assertWithinQueryBudget(self, response, max_duplicates=1):
+        report = getattr(response, 'query_report', None)
+
+        if report is None:
+            self.fail('Response has no query_report, is '
+                      'QueryBudgetMiddleware enabled?')
+
+        if report.budget is None:
+            self.fail(f'No query budget declared for {report.view_name}')
+
+        repeated = {
+            shape: count for shape, count in report.duplicates.items()
+            if count > max_duplicates
+        }
+
+        if report.over_budget or repeated:
+            self.fail(report.format())
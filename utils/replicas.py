@@ -0,0 +1,128 @@
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+PRIMARY_DB = 'default'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_use_primary = ContextVar('use_primary', default=False)
+_wrote_to_primary = ContextVar('wrote_to_primary', default=False)
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def get_sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+
+def get_sticky_cookie_name():
+    return getattr(settings, 'REPLICA_STICKY_COOKIE_NAME', 'db_primary')
+
+
+def pin_to_primary():
+    _use_primary.set(True)
+
+
+def is_pinned_to_primary():
+    return _use_primary.get()
+
+
+class PrimaryReplicaRouter:
+    """
+    Leituras vão para uma réplica, escritas para o primário. Depois de
+    qualquer escrita o contexto atual (request) passa a ler do primário,
+    e o PrimaryStickinessMiddleware estende isso às próximas requests.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+
+        if not replicas or is_pinned_to_primary():
+            return PRIMARY_DB
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _wrote_to_primary.set(True)
+        pin_to_primary()
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY_DB, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB
+
+
+class PrimaryStickinessMiddleware(MiddlewareMixin):
+    """
+    Garante read-your-writes: requests que escrevem (ou que chegam com o
+    cookie de stickiness) leem do primário, e quem escreveu continua no
+    primário por REPLICA_STICKY_SECONDS.
+
+    Usa os hooks do MiddlewareMixin para funcionar também no ASGI; as
+    ContextVars voltam ao padrão no fim de cada request.
+    """
+
+    def process_request(self, request):
+        _use_primary.set(
+            request.method not in SAFE_METHODS or
+            get_sticky_cookie_name() in request.COOKIES
+        )
+        _wrote_to_primary.set(False)
+
+    def process_response(self, request, response):
+        if _wrote_to_primary.get():
+            response.set_cookie(
+                get_sticky_cookie_name(), '1',
+                max_age=get_sticky_seconds(),
+                httponly=True,
+                samesite='Lax'
+            )
+
+        _use_primary.set(False)
+        _wrote_to_primary.set(False)
+        return response
+
+
+def copy_sqlite_database(source_name, target_name):
+    import sqlite3
+
+    source = sqlite3.connect(source_name)
+    target = sqlite3.connect(target_name)
+
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+def simulate_replication(lag_seconds, iterations=None, stdout=None):
+    """
+    Simulador de atraso de replicação para réplicas SQLite locais: a cada
+    `lag_seconds` copia o arquivo do primário para cada réplica.
+    """
+    primary_name = settings.DATABASES[PRIMARY_DB]['NAME']
+    done = 0
+
+    while iterations is None or done < iterations:
+        time.sleep(lag_seconds)
+
+        for alias in get_replicas():
+            copy_sqlite_database(
+                primary_name, settings.DATABASES[alias]['NAME']
+            )
+
+        done += 1
+
+        if stdout is not None:
+            stdout.write(f'Replicas synced ({done}).')
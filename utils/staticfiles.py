@@ -0,0 +1,305 @@
+import gzip
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+try:
+    import brotli
+except ImportError:  # pip install Brotli para gerar as variantes .br
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.txt', '.html', '.json', '.xml',
+)
+# (encoding, sufixo), na ordem de preferência quando o cliente aceita os dois
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+def compress_gzip(content):
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def compress_brotli(content):
+    return brotli.compress(content, quality=11)
+
+
+def get_compressors():
+    compressors = [('.gz', compress_gzip)]
+    if brotli is not None:
+        compressors.insert(0, ('.br', compress_brotli))
+    return compressors
+
+
+def write_compressed_variants(path):
+    """
+    Grava path.br e path.gz ao lado do arquivo, só para os tipos de texto
+    e quando a variante economiza pelo menos 5%.
+    """
+    if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return []
+
+    with open(path, 'rb') as file:
+        content = file.read()
+
+    written = []
+    for suffix, compress in get_compressors():
+        compressed = compress(content)
+        if len(compressed) < len(content) * 0.95:
+            with open(path + suffix, 'wb') as file:
+                file.write(compressed)
+            written.append(path + suffix)
+
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Nomes com hash do conteúdo (styles.3f2a9c.css, via manifest) e
+    variantes .br/.gz geradas no collectstatic, para o
+    StaticFilesMiddleware servir sem comprimir nada por request.
+
+    Sem manifest (collectstatic ainda não rodou, como em dev e nos testes)
+    o {% static %} devolve o nome original em vez de falhar.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+
+        if dry_run:
+            return
+
+        names = set(self.hashed_files) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if self.exists(name):
+                write_compressed_variants(self.path(name))
+
+
+def parse_accept_encoding(header):
+    """
+    >>> parse_accept_encoding('gzip, br;q=0.5, identity;q=0')
+    {'gzip': 1.0, 'br': 0.5, 'identity': 0.0}
+    >>> parse_accept_encoding('br;q=abc')
+    {'br': 0.0}
+    """
+    qualities = {}
+
+    for part in header.split(','):
+        encoding, _, params = part.strip().partition(';')
+        quality = 1.0
+
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+
+        if encoding:
+            qualities[encoding.strip().lower()] = quality
+
+    return qualities
+
+
+def choose_encoding(header, available):
+    """
+    Melhor encoding de `available` para o Accept-Encoding, ou None
+    (identity).
+
+    >>> choose_encoding('gzip, deflate, br', {'br', 'gzip'})
+    'br'
+    >>> choose_encoding('gzip;q=1, br;q=0.1', {'br', 'gzip'})
+    'gzip'
+    >>> choose_encoding('*;q=0.5, gzip;q=0', {'br', 'gzip'})
+    'br'
+    >>> choose_encoding('gzip', {'br'}) is None
+    True
+    """
+    qualities = parse_accept_encoding(header or '')
+    best = None
+    best_quality = 0.0
+
+    for encoding, _ in ENCODINGS:
+        if encoding not in available:
+            continue
+
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+def is_not_modified(request, etag, mtime):
+    """
+    If-None-Match (comparação fraca) ou, sem ele, If-Modified-Since
+    contra o ETag e o mtime (segundos) do arquivo.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+
+    if if_none_match is not None:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in [
+            value.removeprefix('W/') for value in etags
+        ]
+
+    if_modified_since = parse_http_date_safe(
+        request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and mtime <= if_modified_since
+
+
+def get_file_etag(stat):
+    return f'{stat.st_size:x}-{stat.st_mtime_ns:x}'
+
+
+class StaticVariant:
+    def __init__(self, path, etag, memory_max_size):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.etag = etag
+        self.content = None
+
+        if self.size <= memory_max_size:
+            with open(path, 'rb') as file:
+                self.content = file.read()
+
+
+class StaticAsset:
+    """Um arquivo do STATIC_ROOT e as variantes comprimidas dele"""
+
+    def __init__(self, path, immutable, memory_max_size):
+        stat = os.stat(path)
+        self.mtime = int(stat.st_mtime)
+        self.immutable = immutable
+        self.content_type = self.guess_content_type(path)
+
+        etag = get_file_etag(stat)
+        self.variants = {None: StaticVariant(
+            path, f'"{etag}"', memory_max_size)}
+
+        for encoding, suffix in ENCODINGS:
+            if os.path.isfile(path + suffix):
+                self.variants[encoding] = StaticVariant(
+                    path + suffix, f'"{etag}-{encoding}"', memory_max_size)
+
+    def guess_content_type(self, path):
+        content_type, _ = mimetypes.guess_type(path)
+        content_type = content_type or 'application/octet-stream'
+
+        if content_type.startswith('text/') or \
+                content_type == 'application/javascript':
+            content_type += '; charset=utf-8'
+
+        return content_type
+
+    @property
+    def cache_control(self):
+        if self.immutable:
+            return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        return f'public, max-age={settings.STATIC_MAX_AGE}'
+
+    def set_headers(self, response, variant):
+        response['ETag'] = variant.etag
+        response['Last-Modified'] = http_date(self.mtime)
+        response['Cache-Control'] = self.cache_control
+
+        if len(self.variants) > 1:
+            response['Vary'] = 'Accept-Encoding'
+
+        return response
+
+    def serve(self, request):
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING'), set(self.variants))
+        variant = self.variants[encoding]
+
+        if is_not_modified(request, variant.etag, self.mtime):
+            return self.set_headers(HttpResponseNotModified(), variant)
+
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=self.content_type)
+        elif variant.content is not None:
+            response = HttpResponse(
+                variant.content, content_type=self.content_type)
+        else:
+            response = FileResponse(
+                open(variant.path, 'rb'), content_type=self.content_type)
+
+        response['Content-Length'] = variant.size
+        if encoding is not None:
+            response['Content-Encoding'] = encoding
+
+        return self.set_headers(response, variant)
+
+
+def build_static_index(root, memory_max_size):
+    """
+    {nome relativo: StaticAsset} de todos os arquivos do STATIC_ROOT.
+    Nomes que estão no manifest como versão com hash ganham cache
+    imutável.
+    """
+    storage = CompressedManifestStaticFilesStorage(location=root)
+    hashed_names = set(storage.hashed_files.values())
+    suffixes = tuple(suffix for _, suffix in ENCODINGS)
+    index = {}
+
+    for directory, _, file_names in os.walk(root):
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+
+            if name.endswith(suffixes) or name == storage.manifest_name:
+                continue
+
+            index[name] = StaticAsset(
+                path, name in hashed_names, memory_max_size)
+
+    return index
+
+
+class StaticFilesMiddleware(MiddlewareMixin):
+    """
+    Serve o STATIC_ROOT do próprio processo, para deploys sem nginx na
+    frente: o índice (e o conteúdo dos arquivos até
+    STATIC_MEMORY_MAX_SIZE) é montado uma vez, na inicialização, e cada
+    request só consulta um dicionário, sem stat nem compressão.
+
+    Negocia br/gzip pelo Accept-Encoding, responde 304 por ETag ou
+    If-Modified-Since e marca os nomes com hash como imutáveis. Com DEBUG
+    ou sem STATIC_ROOT o middleware sai da pilha e o static() do
+    project/urls.py continua servindo os arquivos.
+    """
+
+    def __init__(self, get_response):
+        root = settings.STATIC_ROOT
+
+        if settings.DEBUG or not root or not os.path.isdir(root):
+            raise MiddlewareNotUsed()
+
+        super().__init__(get_response)
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self.index = build_static_index(
+            str(root), settings.STATIC_MEMORY_MAX_SIZE)
+
+    def process_request(self, request):
+        if request.method not in ('GET', 'HEAD') or \
+                not request.path_info.startswith(self.prefix):
+            return None
+
+        asset = self.index.get(request.path_info[len(self.prefix):])
+        if asset is None:
+            return None
+
+        return asset.serve(request)
@@ -1,3 +1,6 @@
+import unicodedata
+
+
 def is_positive_number(string):
     try:
         number_string = float(string)
@@ -5,3 +8,20 @@ def is_positive_number(string):
         return False
 
     return number_string > 0
+
+
+def normalize_text(string):
+    """
+    Texto sem diferenças de caixa, acentos e espaços, usado para comparar
+    títulos.
+
+    >>> normalize_text('  Bolo   de  CENOURA com Açúcar ')
+    'bolo de cenoura com acucar'
+    >>> normalize_text('Straße') == normalize_text('STRASSE')
+    True
+    """
+    decomposed = unicodedata.normalize('NFKD', string or '')
+    without_accents = ''.join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+    return ' '.join(without_accents.casefold().split())
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from utils.bench import measure_call
+
+
+class MeasureCallTest(TestCase):
+
+    def test_counts_queries_of_a_single_call(self):
+        calls = []
+
+        def call():
+            calls.append(1)
+            return User.objects.count()
+
+        result, metrics = measure_call(call, iterations=3, warmup=2)
+
+        self.assertEqual(result, 0)
+        self.assertEqual(len(calls), 6)
+        self.assertEqual(metrics['iterations'], 3)
+        self.assertEqual(metrics['queries'], 1)
+        self.assertLessEqual(metrics['p50_ms'], metrics['p99_ms'])
+
+    def test_setup_runs_before_every_call(self):
+        events = []
+
+        measure_call(
+            lambda: events.append('call'), iterations=1,
+            setup=lambda: events.append('setup'),
+        )
+
+        self.assertEqual(events, ['setup', 'call'] * 2)
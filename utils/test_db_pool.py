@@ -0,0 +1,89 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from utils import db_pool
+
+
+class FakeConnection:
+    def __init__(self, alias='default', is_open=True, usable=True):
+        self.alias = alias
+        self.connection = object() if is_open else None
+        self.usable = usable
+
+    def is_usable(self):
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+@override_settings(
+    DATABASE_CONN_HEALTH_CHECKS=True,
+    DATABASE_CONN_IDLE_TIMEOUT=60,
+    DATABASE_POOL_STATS_INTERVAL=0,
+)
+class PersistentConnectionTest(SimpleTestCase):
+
+    def setUp(self):
+        db_pool.reset_stats()
+        db_pool.get_thread_state().last_used.clear()
+        db_pool.get_thread_state().was_open.clear()
+        cache.clear()
+        return super().setUp()
+
+    def run_request(self, *fake_connections):
+        with patch.object(db_pool.connections, 'all',
+                          return_value=list(fake_connections)):
+            db_pool.check_out_connections()
+            db_pool.check_in_connections()
+
+    def test_healthy_connection_is_reused(self):
+        connection = FakeConnection()
+
+        self.run_request(connection)
+        self.run_request(connection)
+
+        stats = db_pool.get_stats()
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['reuses'], 2)
+        self.assertIsNotNone(connection.connection)
+
+    def test_broken_connection_is_closed_before_the_request(self):
+        connection = FakeConnection(usable=False)
+
+        self.run_request(connection)
+
+        self.assertIsNone(connection.connection)
+        self.assertEqual(db_pool.get_stats()['health_check_failures'], 1)
+
+    def test_idle_connection_is_reaped(self):
+        connection = FakeConnection()
+        self.run_request(connection)
+
+        with patch('utils.db_pool.time.monotonic', return_value=10 ** 9):
+            self.run_request(connection)
+
+        self.assertIsNone(connection.connection)
+        self.assertEqual(db_pool.get_stats()['idle_reaped'], 1)
+
+    def test_connections_closed_by_django_are_counted(self):
+        connection = FakeConnection()
+        self.run_request(connection)
+
+        # close_old_connections no request_finished (CONN_MAX_AGE)
+        connection.close()
+        self.run_request(connection)
+
+        self.assertEqual(db_pool.get_stats()['closed'], 1)
+
+    def test_db_pool_stats_command_reads_published_stats(self):
+        self.run_request(FakeConnection())
+        output = StringIO()
+
+        call_command('db_pool_stats', stdout=output)
+
+        self.assertIn('total\t1\t1\t0\t0\t0\t0', output.getvalue())
@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+from django.http import FileResponse
+from django.test import SimpleTestCase, override_settings
+
+COVER = 'recipes/covers/2022/10/01/bolo.jpg'
+LARGE_COVER_SIZE = 20 * 1024 * 1024
+
+
+class ServeMediaTest(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        settings = override_settings(MEDIA_ROOT=self.root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.content = bytes(range(256)) * 4
+        self.write(COVER, self.content)
+        return super().setUp()
+
+    def write(self, name, content):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(content)
+
+    def get(self, name=COVER, **headers):
+        return self.client.get(f'/media/{name}', **headers)
+
+    def read(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_serves_the_whole_file_with_validators(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.read(response), self.content)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Content-Length'], '1024')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=86400')
+        self.assertTrue(response.has_header('ETag'))
+
+    def test_range_request(self):
+        response = self.get(HTTP_RANGE='bytes=10-19')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(self.read(response), self.content[10:20])
+
+    def test_suffix_range_and_unsatisfiable_range(self):
+        response = self.get(HTTP_RANGE='bytes=-4')
+        self.assertEqual(self.read(response), self.content[-4:])
+
+        response = self.get(HTTP_RANGE='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */1024')
+
+    def test_if_range_with_an_old_etag_sends_the_whole_file(self):
+        response = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"old"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.read(response), self.content)
+
+    def test_not_modified(self):
+        etag = self.get()['ETag']
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_files_directories_and_traversal_are_404(self):
+        for name in ('missing.jpg', 'recipes/covers', '../etc/passwd'):
+            with self.subTest(name=name):
+                self.assertEqual(self.get(name).status_code, 404)
+
+    @override_settings(MEDIA_SERVE_MODE='x-accel-redirect')
+    def test_x_accel_redirect_mode(self):
+        response = self.get()
+
+        self.assertEqual(
+            response['X-Accel-Redirect'], f'/protected-media/{COVER}')
+        self.assertEqual(response.content, b'')
+
+    @override_settings(MEDIA_SERVE_MODE='x-sendfile')
+    def test_x_sendfile_mode(self):
+        response = self.get()
+
+        self.assertEqual(
+            response['X-Sendfile'], os.path.join(self.root, COVER))
+
+    def test_large_covers_are_streamed_not_buffered(self):
+        name = 'recipes/covers/2022/10/01/grande.png'
+        self.write(name, os.urandom(1024) * (LARGE_COVER_SIZE // 1024))
+
+        tracemalloc.start()
+        try:
+            response = self.get(name)
+            total = sum(len(chunk) for chunk in response.streaming_content)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(total, LARGE_COVER_SIZE)
+        self.assertLess(peak, 1024 * 1024)
@@ -1,6 +1,7 @@
 from unittest import TestCase
 
-from utils.pagination import make_pagination_range
+from utils.pagination import (decode_cursor, encode_cursor,
+                              make_pagination_range)
 
 
 class PaginationTest(TestCase):
@@ -56,3 +57,11 @@ class PaginationTest(TestCase):
         )['pagination']
 
         self.assertEqual([17, 18, 19, 20], pagination)
+
+    def test_decode_cursor_ignores_unknown_directions(self):
+        cursor = encode_cursor('sideways', 10)
+        self.assertEqual((None, None), decode_cursor(cursor))
+
+    def test_decode_cursor_ignores_non_numeric_keys(self):
+        cursor = encode_cursor('next', 'abc')
+        self.assertEqual((None, None), decode_cursor(cursor))
@@ -0,0 +1,87 @@
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import ResolverMatch
+
+from utils.query_budget import (QueryBudgetExceeded, QueryBudgetMiddleware,
+                                QueryRecorder)
+
+
+def n_plus_one_view(request):
+    for user in User.objects.all():
+        User.objects.filter(pk=user.pk).exists()
+    return HttpResponse('ok')
+
+
+@override_settings(QUERY_BUDGETS={'test:view': 2})
+class QueryBudgetMiddlewareTest(TestCase):
+
+    def setUp(self):
+        for i in range(3):
+            User.objects.create(username=f'budget-{i}')
+        return super().setUp()
+
+    def make_request(self, method='get'):
+        request = getattr(RequestFactory(), method)('/')
+        request.resolver_match = ResolverMatch(
+            n_plus_one_view, (), {}, url_name='view', app_names=['test'],
+            namespaces=['test']
+        )
+        return request
+
+    def test_recorder_groups_queries_by_shape(self):
+        with QueryRecorder() as recorder:
+            n_plus_one_view(None)
+
+        self.assertEqual(recorder.count, 4)
+        self.assertEqual(list(recorder.get_duplicates().values()), [3])
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_raise_mode_fails_with_the_offending_queries(self):
+        middleware = QueryBudgetMiddleware(n_plus_one_view)
+
+        with self.assertRaises(QueryBudgetExceeded) as error:
+            middleware(self.make_request())
+
+        message = str(error.exception)
+        self.assertIn('test:view: 4 queries (budget 2)', message)
+        self.assertIn('+ 3.', message)
+        self.assertIn('! 3x', message)
+
+    @override_settings(QUERY_BUDGET_MODE='log')
+    def test_log_mode_only_warns(self):
+        middleware = QueryBudgetMiddleware(n_plus_one_view)
+
+        with self.assertLogs('utils.query_budget', 'WARNING') as logs:
+            response = middleware(self.make_request())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('test:view', logs.output[0])
+        self.assertEqual(response.query_report.count, 4)
+
+    @override_settings(QUERY_BUDGET_MODE='off')
+    def test_off_mode_does_not_record(self):
+        response = QueryBudgetMiddleware(n_plus_one_view)(self.make_request())
+
+        self.assertFalse(hasattr(response, 'query_report'))
+
+    @override_settings(QUERY_BUDGET_MODE='raise')
+    def test_read_budget_does_not_apply_to_writes(self):
+        middleware = QueryBudgetMiddleware(n_plus_one_view)
+
+        response = middleware(self.make_request('post'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.query_report.budget)
+
+    @override_settings(
+        QUERY_BUDGET_MODE='raise',
+        QUERY_BUDGETS={'test:view': 2, ('test:view', 'POST'): 3},
+    )
+    def test_write_budget_is_declared_per_method(self):
+        middleware = QueryBudgetMiddleware(n_plus_one_view)
+
+        with self.assertRaises(QueryBudgetExceeded) as error:
+            middleware(self.make_request('post'))
+
+        self.assertIn('test:view: 4 queries (budget 3)', str(error.exception))
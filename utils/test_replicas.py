@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import tempfile
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from utils.replicas import (PrimaryReplicaRouter, PrimaryStickinessMiddleware,
+                            copy_sqlite_database)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'], REPLICA_STICKY_SECONDS=7)
+class PrimaryReplicaRouterTest(SimpleTestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+        return super().setUp()
+
+    def run_middleware(self, request, view):
+        middleware = PrimaryStickinessMiddleware(view)
+        return middleware(request)
+
+    def test_reads_go_to_replica_on_safe_requests(self):
+        def view(request):
+            return HttpResponse(self.router.db_for_read(None))
+
+        response = self.run_middleware(self.factory.get('/'), view)
+
+        self.assertEqual(response.content, b'replica_1')
+        self.assertNotIn('db_primary', response.cookies)
+
+    def test_reads_after_a_write_go_to_primary_and_set_sticky_cookie(self):
+        def view(request):
+            before = self.router.db_for_read(None)
+            self.router.db_for_write(None)
+            after = self.router.db_for_read(None)
+            return HttpResponse(f'{before},{after}')
+
+        response = self.run_middleware(self.factory.get('/'), view)
+
+        self.assertEqual(response.content, b'replica_1,default')
+        self.assertEqual(response.cookies['db_primary']['max-age'], 7)
+
+    def test_unsafe_methods_read_from_primary(self):
+        def view(request):
+            return HttpResponse(self.router.db_for_read(None))
+
+        response = self.run_middleware(self.factory.post('/'), view)
+        self.assertEqual(response.content, b'default')
+
+    def test_sticky_cookie_pins_next_requests_to_primary(self):
+        def view(request):
+            return HttpResponse(self.router.db_for_read(None))
+
+        request = self.factory.get('/')
+        request.COOKIES['db_primary'] = '1'
+        response = self.run_middleware(request, view)
+
+        self.assertEqual(response.content, b'default')
+
+    def test_pin_does_not_leak_to_the_next_request(self):
+        def writer(request):
+            self.router.db_for_write(None)
+            return HttpResponse()
+
+        def reader(request):
+            return HttpResponse(self.router.db_for_read(None))
+
+        self.run_middleware(self.factory.get('/'), writer)
+        response = self.run_middleware(self.factory.get('/'), reader)
+
+        self.assertEqual(response.content, b'replica_1')
+
+    def test_only_primary_is_migrated(self):
+        self.assertTrue(self.router.allow_migrate('default', 'recipes'))
+        self.assertFalse(self.router.allow_migrate('replica_1', 'recipes'))
+
+
+class CopySqliteDatabaseTest(SimpleTestCase):
+
+    def test_replica_receives_primary_rows(self):
+        with tempfile.TemporaryDirectory() as directory:
+            primary = os.path.join(directory, 'primary.sqlite3')
+            replica = os.path.join(directory, 'replica.sqlite3')
+
+            with sqlite3.connect(primary) as connection:
+                connection.execute('CREATE TABLE t (id INTEGER)')
+                connection.execute('INSERT INTO t VALUES (1)')
+            connection.close()
+
+            copy_sqlite_database(primary, replica)
+
+            connection = sqlite3.connect(replica)
+            rows = connection.execute('SELECT id FROM t').fetchall()
+            connection.close()
+
+        self.assertEqual(rows, [(1,)])
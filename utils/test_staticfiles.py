@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from utils.staticfiles import StaticFilesMiddleware
+
+STYLES = 'global/css/styles.css'
+
+
+class StaticFilesMiddlewareTest(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        settings = override_settings(STATIC_ROOT=self.root, DEBUG=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        call_command(
+            'collectstatic', interactive=False, verbosity=0,
+            ignore_patterns=['admin', 'rest_framework', 'debug_toolbar'],
+        )
+        with open(os.path.join(self.root, 'staticfiles.json')) as file:
+            self.hashed = json.load(file)['paths'][STYLES]
+
+        self.middleware = StaticFilesMiddleware(
+            lambda request: HttpResponse('fallback'))
+        return super().setUp()
+
+    def get(self, name, **headers):
+        return self.middleware(RequestFactory().get(f'/static/{name}',
+                                                    **headers))
+
+    def read_original(self):
+        with open(os.path.join(self.root, STYLES), 'rb') as file:
+            return file.read()
+
+    def test_collectstatic_writes_hashed_names_and_gzip_variants(self):
+        self.assertNotEqual(self.hashed, STYLES)
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.root, self.hashed + '.gz')))
+
+    def test_hashed_name_is_served_compressed_and_immutable(self):
+        response = self.get(self.hashed, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(
+            response['Content-Type'], 'text/css; charset=utf-8')
+        self.assertEqual(
+            gzip.decompress(response.content), self.read_original())
+
+    def test_identity_when_client_does_not_accept_compression(self):
+        response = self.get(self.hashed, HTTP_ACCEPT_ENCODING='gzip;q=0')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, self.read_original())
+        self.assertEqual(
+            response['Content-Length'], str(len(self.read_original())))
+
+    def test_original_name_gets_a_short_max_age(self):
+        response = self.get(STYLES)
+
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+
+    def test_not_modified_by_etag_of_the_same_encoding(self):
+        etag = self.get(self.hashed, HTTP_ACCEPT_ENCODING='gzip')['ETag']
+
+        response = self.get(
+            self.hashed, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.get(self.hashed, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_modified_since(self):
+        last_modified = self.get(self.hashed)['Last-Modified']
+
+        response = self.get(
+            self.hashed, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_files_fall_through(self):
+        self.assertEqual(self.get('missing.css').content, b'fallback')
+
+    def test_not_used_with_debug(self):
+        with override_settings(DEBUG=True):
+            with self.assertRaises(MiddlewareNotUsed):
+                StaticFilesMiddleware(lambda request: None)
@@ -0,0 +1,151 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from utils import throttle
+
+
+@override_settings(
+    AUTH_THROTTLE_ENABLED=True,
+    AUTH_THROTTLE_BUCKETS={'ip': (3, 1), 'username': (2, 1)},
+)
+class AuthThrottleMiddlewareTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        return super().setUp()
+
+    def post_login(self, username, ip='10.0.0.1'):
+        return self.client.post(
+            reverse('authors:login_create'),
+            {'username': username, 'password': 'wrong-pass'},
+            REMOTE_ADDR=ip,
+        )
+
+    def test_ip_is_rejected_before_authenticate_runs(self):
+        with patch('authors.views.all.authenticate',
+                   return_value=None) as authenticate:
+            statuses = [
+                self.post_login(f'user{number}').status_code
+                for number in range(5)
+            ]
+
+        self.assertEqual(statuses, [302, 302, 302, 429, 429])
+        self.assertEqual(authenticate.call_count, 3)
+
+    def test_throttled_ip_does_not_read_the_username(self):
+        for number in range(3):
+            self.post_login(f'user{number}')
+
+        with patch('utils.throttle.get_username') as get_username:
+            response = self.post_login('user3')
+
+        self.assertEqual(response.status_code, 429)
+        get_username.assert_not_called()
+
+    def test_username_is_rejected_from_any_ip(self):
+        statuses = [
+            self.post_login('Victim', ip=f'10.0.0.{number}').status_code
+            for number in range(3)
+        ]
+
+        self.assertEqual(statuses, [302, 302, 429])
+
+    def test_throttled_ip_does_not_spend_the_username_bucket(self):
+        for number in range(4):
+            self.post_login(f'user{number}', ip='10.6.6.6')
+
+        response = self.post_login('user3', ip='10.0.0.2')
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_rejected_response_has_retry_after(self):
+        for _ in range(2):
+            self.post_login('my_user')
+
+        response = self.post_login('my_user')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+
+    def test_rejections_are_counted_per_view_and_bucket(self):
+        for number in range(5):
+            self.post_login(f'user{number}')
+        for _ in range(3):
+            self.post_login('my_user', ip='10.0.0.2')
+
+        rejections = throttle.get_rejections()
+
+        self.assertEqual(rejections[('authors:login_create', 'ip')], 2)
+        self.assertEqual(rejections[('authors:login_create', 'username')], 1)
+
+    def test_token_api_answers_json(self):
+        User.objects.create_user(username='my_user', password='my_pass')
+        url = reverse('recipes:token_obtain_pair')
+
+        for _ in range(2):
+            response = self.client.post(
+                url, {'username': 'my_user', 'password': 'my_pass'},
+                content_type='application/json',
+            )
+            self.assertEqual(response.status_code, 200)
+
+        # Mesmo bucket com outra caixa
+        response = self.client.post(
+            url, {'username': 'My_User', 'password': 'my_pass'},
+            content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Too many attempts', response.json()['detail'])
+
+    def test_get_requests_are_not_throttled(self):
+        for _ in range(5):
+            response = self.client.get(reverse('authors:register_create'))
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(AUTH_THROTTLE_ENABLED=False)
+    def test_disabled_throttle_lets_everything_through(self):
+        statuses = {self.post_login('my_user').status_code for _ in range(5)}
+
+        self.assertEqual(statuses, {302})
+
+
+class ClientIPTest(TestCase):
+
+    def make_request(self, **meta):
+        meta.setdefault('REMOTE_ADDR', '127.0.0.1')
+        return RequestFactory().post('/', **meta)
+
+    @override_settings(AUTH_THROTTLE_NUM_PROXIES=0)
+    def test_without_proxies_uses_remote_addr(self):
+        request = self.make_request(HTTP_X_FORWARDED_FOR='1.1.1.1')
+
+        self.assertEqual(throttle.get_client_ip(request), '127.0.0.1')
+
+    @override_settings(AUTH_THROTTLE_NUM_PROXIES=1)
+    def test_behind_a_proxy_uses_the_address_it_appended(self):
+        request = self.make_request(
+            HTTP_X_FORWARDED_FOR='6.6.6.6, 203.0.113.7')
+
+        self.assertEqual(throttle.get_client_ip(request), '203.0.113.7')
+
+    @override_settings(AUTH_THROTTLE_NUM_PROXIES=1)
+    def test_behind_a_proxy_without_the_header_uses_remote_addr(self):
+        self.assertEqual(
+            throttle.get_client_ip(self.make_request()), '127.0.0.1')
+
+    def test_missing_client_ip_is_logged_as_an_error(self):
+        request = self.make_request(REMOTE_ADDR='')
+
+        with self.assertLogs('utils.throttle', 'ERROR') as logs:
+            client_ip = throttle.get_resolved_client_ip(
+                request, 'authors:login_create')
+
+        self.assertEqual(client_ip, '')
+        self.assertIn('per-IP throttle is off', logs.output[0])
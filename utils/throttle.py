@@ -0,0 +1,219 @@
+import hashlib
+import json
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_CACHE_PREFIX = 'auth_throttle'
+BUCKET_KINDS = ('ip', 'username')
+
+
+def get_throttle_enabled():
+    return getattr(settings, 'AUTH_THROTTLE_ENABLED', True)
+
+
+def get_throttle_views():
+    return getattr(settings, 'AUTH_THROTTLE_VIEWS', ())
+
+
+def get_throttle_buckets():
+    """{tipo: (capacidade, tokens repostos por minuto)}"""
+    return getattr(settings, 'AUTH_THROTTLE_BUCKETS', {})
+
+
+def get_throttle_cache():
+    return caches[getattr(settings, 'AUTH_THROTTLE_CACHE_ALIAS', 'default')]
+
+
+def get_num_proxies():
+    return getattr(settings, 'AUTH_THROTTLE_NUM_PROXIES', 0)
+
+
+def get_client_ip(request):
+    """
+    REMOTE_ADDR ou, atrás de AUTH_THROTTLE_NUM_PROXIES proxies, o
+    endereço que o primeiro deles anotou no X-Forwarded-For (os da
+    esquerda o cliente pode inventar).
+    """
+    num_proxies = get_num_proxies()
+    forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+
+    if num_proxies and forwarded_for:
+        addresses = [
+            address.strip() for address in forwarded_for.split(',')
+        ]
+        return addresses[-min(num_proxies, len(addresses))]
+
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def get_resolved_client_ip(request, view_name):
+    """
+    get_client_ip, com um erro no log quando não há endereço: o bucket
+    por IP fica desligado (ex.: gunicorn num socket unix com
+    AUTH_THROTTLE_NUM_PROXIES=0) e só o do username protege a view
+    """
+    client_ip = get_client_ip(request)
+
+    if not client_ip:
+        logger.error(
+            'No client IP for %s: the per-IP throttle is off. Behind a '
+            'proxy (nginx on a unix socket) set AUTH_THROTTLE_NUM_PROXIES '
+            'and send X-Forwarded-For.',
+            view_name,
+        )
+
+    return client_ip
+
+
+def get_username(request):
+    """username do formulário ou do JSON (POST /recipes/api/token/)"""
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return ''
+        username = data.get('username') if isinstance(data, dict) else ''
+    else:
+        username = request.POST.get('username')
+
+    return username.strip().lower() if isinstance(username, str) else ''
+
+
+def get_bucket_key(kind, value):
+    digest = hashlib.sha256(value.encode()).hexdigest()
+    return f'{THROTTLE_CACHE_PREFIX}:{kind}:{digest}'
+
+
+def take_token(cache, key, capacity, per_minute, now=None):
+    """
+    Token bucket: o bucket começa cheio (capacity) e recebe per_minute
+    tokens por minuto; cada request gasta um. Devolve 0 quando havia
+    token ou quantos segundos faltam para o próximo.
+
+    O estado (tokens, instante) fica no cache compartilhado. A leitura e
+    a escrita não são atômicas: requests simultâneas de workers
+    diferentes podem gastar o mesmo token, o que deixa passar algumas a
+    mais num pico, mas nunca bloqueia quem não deveria.
+
+    >>> from django.core.cache.backends.locmem import LocMemCache
+    >>> cache = LocMemCache('doctest', {})
+    >>> [take_token(cache, 'k', 2, 60, now=0) for _ in range(3)]
+    [0, 0, 1]
+    >>> take_token(cache, 'k', 2, 60, now=1)
+    0
+    """
+    now = time.time() if now is None else now
+    rate = per_minute / 60
+    tokens, updated_at = cache.get(key, (capacity, now))
+    tokens = min(capacity, tokens + (now - updated_at) * rate)
+    timeout = math.ceil(capacity / rate) + 1
+
+    if tokens < 1:
+        cache.set(key, (tokens, now), timeout)
+        return math.ceil((1 - tokens) / rate)
+
+    cache.set(key, (tokens - 1, now), timeout)
+    return 0
+
+
+def get_rejections_key(view_name, kind):
+    return f'{THROTTLE_CACHE_PREFIX}:rejected:{view_name}:{kind}'
+
+
+def count_rejection(view_name, kind):
+    cache = get_throttle_cache()
+    key = get_rejections_key(view_name, kind)
+
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:  # a chave saiu do cache entre o add e o incr
+        cache.set(key, 1, None)
+
+
+def get_rejections():
+    """{(view, tipo do bucket): rejeições}, somadas entre os workers"""
+    keys = {
+        get_rejections_key(view_name, kind): (view_name, kind)
+        for view_name in get_throttle_views()
+        for kind in BUCKET_KINDS
+    }
+    counts = get_throttle_cache().get_many(keys)
+    return {keys[key]: count for key, count in counts.items()}
+
+
+def make_throttled_response(request, view_func, retry_after):
+    message = f'Too many attempts, try again in {retry_after} seconds.'
+
+    # Views do DRF (as_view guarda a classe em .cls) respondem JSON
+    if hasattr(view_func, 'cls') or \
+            request.content_type == 'application/json':
+        response = JsonResponse({'detail': message}, status=429)
+    else:
+        response = HttpResponse(
+            message, status=429, content_type='text/plain; charset=utf-8')
+
+    response['Retry-After'] = retry_after
+    return response
+
+
+class AuthThrottleMiddleware(MiddlewareMixin):
+    """
+    Recusa (429) as tentativas em excesso nas views de AUTH_THROTTLE_VIEWS
+    (login, cadastro e token JWT) antes da view rodar, ou seja, antes do
+    PBKDF2: um ataque de credential stuffing gasta só uma ida ao cache por
+    tentativa em vez de um worker ocupado com o hash.
+
+    Um bucket por IP e outro por username. O username só é cobrado quando
+    o IP passou, para que um IP já bloqueado não esgote o bucket da
+    vítima. Com o LocMemCache padrão cada worker tem os seus buckets; em
+    produção use um CACHE_BACKEND compartilhado (Redis, Memcached).
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method != 'POST' or not get_throttle_enabled():
+            return None
+
+        view_name = request.resolver_match.view_name
+        if view_name not in get_throttle_views():
+            return None
+
+        cache = get_throttle_cache()
+        buckets = get_throttle_buckets()
+        # O username só é lido (parse do corpo) se o IP passou: a
+        # tentativa recusada fica barata
+        values = (
+            ('ip', lambda: get_resolved_client_ip(request, view_name)),
+            ('username', lambda: get_username(request)),
+        )
+
+        for kind, get_value in values:
+            if kind not in buckets:
+                continue
+
+            value = get_value()
+            if not value:
+                continue
+
+            capacity, per_minute = buckets[kind]
+            retry_after = take_token(
+                cache, get_bucket_key(kind, value), capacity, per_minute)
+
+            if retry_after:
+                count_rejection(view_name, kind)
+                logger.warning(
+                    'Throttled %s on %s (%s bucket), retry after %ss',
+                    request.method, view_name, kind, retry_after,
+                )
+                return make_throttled_response(
+                    request, view_func, retry_after)
+
+        return None